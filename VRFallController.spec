@@ -26,6 +26,7 @@ a = Analysis(
         'uvicorn.lifespan.on',
         'websockets',
         'fastapi',
+        'brotli',
     ],
     hookspath=[],
     hooksconfig={},
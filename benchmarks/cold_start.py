@@ -0,0 +1,81 @@
+"""
+콜드 스타트 벤치마크
+프로그램 실행부터 첫 페이지가 응답될 때까지의 시간 측정
+
+사용법:
+    python benchmarks/cold_start.py                       # 소스 실행 (테스트 모드)
+    python benchmarks/cold_start.py --exe dist/VRFallController/VRFallController.exe
+    python benchmarks/cold_start.py --runs 10 --port 8000
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def wait_for_first_page(url: str, timeout: float) -> bool:
+    """첫 페이지(/)가 200으로 응답할 때까지 대기"""
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=0.5) as response:
+                if response.status == 200:
+                    response.read()
+                    return True
+        except OSError:
+            pass
+        time.sleep(0.01)
+    return False
+
+
+def measure_once(command: list, url: str, timeout: float) -> float:
+    """한 번 실행하여 첫 페이지 응답까지의 시간(초) 반환"""
+    start = time.perf_counter()
+    process = subprocess.Popen(command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        if not wait_for_first_page(url, timeout):
+            raise RuntimeError(f"{timeout}초 안에 서버가 응답하지 않았습니다")
+        return time.perf_counter() - start
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="콜드 스타트 시간 측정")
+    parser.add_argument("--exe", help="측정할 실행 파일 (기본값: python main.py)")
+    parser.add_argument("--runs", type=int, default=5, help="반복 횟수")
+    parser.add_argument("--port", type=int, default=8000, help="서버 포트 (config.ini와 동일해야 함)")
+    parser.add_argument("--timeout", type=float, default=30.0, help="실행당 최대 대기 시간 (초)")
+    args = parser.parse_args()
+
+    if args.exe:
+        command = [args.exe, "--testmode", "--no-browser"]
+    else:
+        command = [sys.executable, str(ROOT / "main.py"), "--testmode", "--no-browser"]
+
+    url = f"http://127.0.0.1:{args.port}/"
+    samples = []
+
+    for run in range(1, args.runs + 1):
+        elapsed = measure_once(command, url, args.timeout)
+        samples.append(elapsed)
+        print(f"run {run}: {elapsed * 1000:.0f} ms")
+
+    print(f"\nlaunch -> first page served ({len(samples)} runs)")
+    print(f"  min    {min(samples) * 1000:.0f} ms")
+    print(f"  median {statistics.median(samples) * 1000:.0f} ms")
+    print(f"  max    {max(samples) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+운영 로그 분석 벤치마크
+여러 달치 vr_controller.log를 만들어 분석 시간과 최대 메모리 비교
+
+    lines:  파일을 줄 단위로 읽어 디코딩하고, 줄마다 패턴 목록을 차례로 검사해 이벤트를 dict로 보관
+    mmap:   utils.log_analysis (메모리 매핑 + 정규식 하나 + array 열)
+
+사용법:
+    python benchmarks/log_analysis.py                 # 60일, 하루 체험 120회
+    python benchmarks/log_analysis.py --days 180 --sessions 200
+    python benchmarks/log_analysis.py --log vr_controller.log   # 기존 로그 파일 측정
+"""
+import argparse
+import random
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from utils.log_analysis import analyze
+
+DEVICES = [f"192.168.0.{101 + i}" for i in range(6)]
+CUES = ["ELEVATOR_UP", "ELEVATOR_STOP", "WALK", "FALL", "RESET"]
+
+# 한 줄씩 검사하는 방식 (비교용)
+LINE_PATTERNS = [
+    ("start", re.compile(r"체험 시작 신호 전송 중")),
+    ("stop", re.compile(r"체험 종료 신호 전송 중")),
+    ("cue", re.compile(r"시뮬레이터 명령 전송: (\w+)")),
+    ("cue_failed", re.compile(r"명령 전송 실패: ")),
+    ("sim_connect_failed", re.compile(r"시뮬레이터 연결 실패: ")),
+    ("device_done", re.compile(r"([\w.:-]+) (완료|실패) \(\d+/\d+\)")),
+    ("send_failed", re.compile(r"디바이스 ([\w.:-]+) 전송 실패")),
+    ("batch", re.compile(r"(\d+)/(\d+) 디바이스(?:에서 성공|에 명령 전송 완료)")),
+]
+
+
+def write_log(path: Path, days: int, sessions: int, seed: int = 1):
+    """체험/명령/ADB 작업/스캔/HTTP 로그가 섞인 로그 파일 생성"""
+    rng = random.Random(seed)
+    start = datetime(2026, 3, 1, 9, 0, 0)
+    with open(path, "w", encoding="utf-8") as f:
+        for day in range(days):
+            now = start + timedelta(days=day)
+
+            def line(level: str, message: str):
+                nonlocal now
+                now += timedelta(milliseconds=rng.randint(1, 900))
+                f.write(f"{now:%Y-%m-%d %H:%M:%S},{now.microsecond // 1000:03d} - {level} - {message}\n")
+
+            line("INFO", "SUCCESS: 시뮬레이터 연결 성공: 192.168.0.200:9000")
+            for _ in range(sessions):
+                for _ in range(rng.randint(5, 15)):
+                    line("INFO", "HTTP Request: GET http://127.0.0.1:8000/api/status \"HTTP/1.1 200 OK\"")
+                    line("INFO", "피코 디바이스 스캔 중...")
+                    line("INFO", f"SUCCESS: {len(DEVICES)}개 디바이스 발견됨")
+                for ip in DEVICES:
+                    line("INFO", f"{ip} {'완료' if rng.random() > 0.02 else '실패'} ({DEVICES.index(ip) + 1}/{len(DEVICES)})")
+                line("INFO", f"{len(DEVICES)}/{len(DEVICES)} 디바이스에서 성공")
+                line("INFO", "체험 시작 신호 전송 중...")
+                for cue in CUES:
+                    if rng.random() < 0.01:
+                        line("ERROR", "명령 전송 실패: [Errno 32] Broken pipe")
+                    else:
+                        line("INFO", f"SUCCESS: 시뮬레이터 명령 전송: {cue}")
+                    for _ in range(rng.randint(10, 30)):
+                        line("INFO", "HTTP Request: POST http://127.0.0.1:8000/api/telemetry \"HTTP/1.1 200 OK\"")
+                if rng.random() < 0.05:
+                    line("WARNING", f"디바이스 {rng.choice(DEVICES)} 전송 실패: timed out")
+                line("INFO", "체험 종료 신호 전송 중...")
+                line("INFO", f"{len(DEVICES)}/{len(DEVICES)} 디바이스에 명령 전송 완료")
+
+
+def analyze_lines(path: Path) -> dict:
+    events = []
+    with open(path, encoding="utf-8") as f:
+        for raw in f:
+            stamp, _, rest = raw.partition(" - ")
+            message = rest.partition(" - ")[2]
+            for kind, pattern in LINE_PATTERNS:
+                match = pattern.search(message)
+                if match:
+                    events.append({
+                        "time": datetime.strptime(stamp, "%Y-%m-%d %H:%M:%S,%f"),
+                        "kind": kind,
+                        "groups": match.groups(),
+                    })
+                    break
+    days = {}
+    for event in events:
+        days.setdefault(event["time"].date(), []).append(event)
+    return {"events": len(events), "days": len(days)}
+
+
+def measure(func):
+    """처리 시간(추적 없이)과 최대 메모리(tracemalloc으로 한 번 더 실행)"""
+    started = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로그 분석 시간/메모리 비교")
+    parser.add_argument("--days", type=int, default=60, help="생성할 로그 일수")
+    parser.add_argument("--sessions", type=int, default=120, help="하루 체험 수")
+    parser.add_argument("--log", help="생성하지 않고 이 로그 파일 측정")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.log:
+            path = Path(args.log)
+        else:
+            path = Path(tmp) / "vr_controller.log"
+            write_log(path, args.days, args.sessions)
+        size = path.stat().st_size
+        print(f"{path.name}: {size / 1e6:.1f} MB")
+
+        for name, func in (("lines", lambda: analyze_lines(path)), ("mmap", lambda: analyze([path]))):
+            elapsed, peak = measure(func)
+            print(f"{name:<6} {elapsed:>7.2f}s {size / 1e6 / elapsed:>8.1f} MB/s  최대 메모리 {peak / 1e6:>7.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
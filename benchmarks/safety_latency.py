@@ -0,0 +1,106 @@
+"""
+안전 명령 지연 벤치마크
+헤드셋 대량 전송이 진행 중일 때 시뮬레이터 안전 명령(FALL)이 소켓에 쓰이기까지의 시간 측정
+
+    shared: 헤드셋 전송과 시뮬레이터 명령이 하나의 기본 스레드 풀을 공유 (기존 방식)
+    lanes:  CommandLanes 전용 레인 + 우선 실행 (현재 방식)
+
+사용법:
+    python benchmarks/safety_latency.py
+    python benchmarks/safety_latency.py --devices 30 --connect-ms 100 --rounds 20
+"""
+import argparse
+import asyncio
+import socket
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from utils.command_lanes import CommandLanes
+
+
+def start_sink() -> socket.socket:
+    """시뮬레이터 역할: 받은 데이터를 버리는 TCP 서버, 연결된 클라이언트 소켓 반환"""
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("127.0.0.1", 0))
+    server.listen(1)
+
+    def drain():
+        conn, _ = server.accept()
+        while conn.recv(65536):
+            pass
+
+    threading.Thread(target=drain, daemon=True).start()
+    client = socket.create_connection(server.getsockname())
+    return client
+
+
+async def run_shared(args, sim_socket) -> list:
+    """기존 방식: 모든 블로킹 작업이 기본 스레드 풀 하나를 공유"""
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor()
+    samples = []
+
+    for _ in range(args.rounds):
+        device_work = [loop.run_in_executor(executor, time.sleep, args.connect_ms / 1000)
+                       for _ in range(args.devices)]
+        await asyncio.sleep(0.005)
+
+        start = time.perf_counter()
+        await loop.run_in_executor(executor, sim_socket.sendall, b'{"command": "FALL"}\n')
+        samples.append(time.perf_counter() - start)
+        await asyncio.gather(*device_work)
+
+    executor.shutdown()
+    return samples
+
+
+async def run_lanes(args, sim_socket) -> list:
+    """현재 방식: 헤드셋은 devices 레인, 안전 명령은 simulator 레인에서 우선 실행"""
+    lanes = CommandLanes()
+    samples = []
+
+    for _ in range(args.rounds):
+        device_work = [lanes.run("devices", time.sleep, args.connect_ms / 1000)
+                       for _ in range(args.devices)]
+        device_tasks = [asyncio.ensure_future(work) for work in device_work]
+        await asyncio.sleep(0.005)
+
+        start = time.perf_counter()
+        await lanes.run("simulator", sim_socket.sendall, b'{"command": "FALL"}\n', priority=True)
+        samples.append(time.perf_counter() - start)
+        await asyncio.gather(*device_tasks)
+
+    lanes.shutdown()
+    return samples
+
+
+def print_summary(name: str, samples: list):
+    ordered = sorted(samples)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(f"{name:7s} p50 {statistics.median(ordered) * 1000:8.2f} ms   "
+          f"p99 {p99 * 1000:8.2f} ms   max {ordered[-1] * 1000:8.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="안전 명령 지연 측정")
+    parser.add_argument("--devices", type=int, default=30, help="라운드당 헤드셋 전송 수")
+    parser.add_argument("--connect-ms", type=float, default=100.0, help="헤드셋 전송 1건의 블로킹 시간 (ms)")
+    parser.add_argument("--rounds", type=int, default=20, help="반복 횟수")
+    args = parser.parse_args()
+
+    sim_socket = start_sink()
+    print(f"FALL latency while {args.devices} headset sends ({args.connect_ms:.0f} ms each) are in flight\n")
+    print_summary("shared", asyncio.run(run_shared(args, sim_socket)))
+    print_summary("lanes", asyncio.run(run_lanes(args, sim_socket)))
+    sim_socket.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+대시보드 전송량 벤치마크
+대시보드 한 번 로드(/ + 페이지가 참조하는 CSS/JS)에 전송되는 바이트 수와 요청 수 측정
+
+    첫 로드:   캐시가 비어 있는 브라우저 (Accept-Encoding별)
+    다시 로드: 첫 로드의 응답을 캐시한 브라우저 (Cache-Control이 immutable이면 요청하지 않고,
+               아니면 If-None-Match로 재검증)
+
+사용법:
+    python benchmarks/static_transfer.py                         # 서버 실행 후 측정 (테스트 모드)
+    python benchmarks/static_transfer.py --url http://127.0.0.1:8000   # 실행 중인 서버 측정
+"""
+import argparse
+import gzip
+import http.client
+import re
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+try:
+    import brotli
+except ImportError:  # 서버가 br로 응답하지 않으면 필요 없음
+    brotli = None
+
+ROOT = Path(__file__).resolve().parent.parent
+
+ASSET_PATTERN = re.compile(r'(?:href|src)="(/static/[^"]+)"')
+
+ENCODINGS = [
+    ("압축 없음", "identity"),
+    ("gzip", "gzip, deflate"),
+    ("br + gzip", "gzip, deflate, br"),
+]
+
+
+class Response:
+    def __init__(self, status: int, headers: Dict[str, str], body: bytes, wire_bytes: int):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.wire_bytes = wire_bytes
+
+
+def fetch(host: str, port: int, path: str, headers: Dict[str, str]) -> Response:
+    """요청 하나 (전송량 = 상태 줄 + 헤더 + 본문)"""
+    connection = http.client.HTTPConnection(host, port, timeout=10)
+    try:
+        connection.request("GET", path, headers=headers)
+        response = connection.getresponse()
+        body = response.read()
+        header_bytes = len(f"HTTP/1.1 {response.status} {response.reason}\r\n") + len(str(response.msg)) + 2
+        return Response(response.status, {k.lower(): v for k, v in response.getheaders()},
+                        body, header_bytes + len(body))
+    finally:
+        connection.close()
+
+
+def decoded_text(response: Response) -> str:
+    encoding = response.headers.get("content-encoding", "identity")
+    body = response.body
+    if encoding == "gzip":
+        body = gzip.decompress(body)
+    elif encoding == "br":
+        body = brotli.decompress(body)
+    return body.decode("utf-8")
+
+
+def load_dashboard(host: str, port: int, accept_encoding: str,
+                   cache: Optional[Dict[str, Response]] = None) -> Tuple[int, int, Dict[str, Response]]:
+    """대시보드 한 번 로드 (전송 바이트, 요청 수, 경로별 응답) - cache가 있으면 다시 로드"""
+    base_headers = {"Accept-Encoding": accept_encoding}
+    total_bytes = 0
+    requests = 0
+    responses: Dict[str, Response] = {}
+
+    def get(path: str) -> Optional[Response]:
+        nonlocal total_bytes, requests
+        headers = dict(base_headers)
+        cached = (cache or {}).get(path)
+        if cached is not None:
+            if "immutable" in cached.headers.get("cache-control", ""):
+                return cached  # 캐시에서 바로 사용 (요청 없음)
+            if "etag" in cached.headers:
+                headers["If-None-Match"] = cached.headers["etag"]
+        response = fetch(host, port, path, headers)
+        total_bytes += response.wire_bytes
+        requests += 1
+        return cached if response.status == 304 and cached is not None else response
+
+    page = get("/")
+    responses["/"] = page
+    for path in ASSET_PATTERN.findall(decoded_text(page)):
+        responses[path] = get(path)
+    return total_bytes, requests, responses
+
+
+def wait_for_server(url: str, timeout: float) -> bool:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=0.5) as response:
+                response.read()
+                return True
+        except OSError:
+            time.sleep(0.05)
+    return False
+
+
+def measure(host: str, port: int) -> List[Tuple[str, int, int, int, int]]:
+    # 서버의 백그라운드 brotli 압축이 끝난 상태에서 측정
+    load_dashboard(host, port, ENCODINGS[-1][1])
+    time.sleep(0.5)
+
+    rows = []
+    for label, accept_encoding in ENCODINGS:
+        first_bytes, first_requests, cache = load_dashboard(host, port, accept_encoding)
+        reload_bytes, reload_requests, _ = load_dashboard(host, port, accept_encoding, cache)
+        rows.append((label, first_bytes, first_requests, reload_bytes, reload_requests))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대시보드 로드당 전송량 측정")
+    parser.add_argument("--url", help="측정할 서버 주소 (지정하지 않으면 테스트 모드로 서버 실행)")
+    parser.add_argument("--port", type=int, default=8000, help="서버 포트 (config.ini와 동일해야 함)")
+    args = parser.parse_args()
+
+    process = None
+    url = args.url or f"http://127.0.0.1:{args.port}"
+    if args.url is None:
+        command = [sys.executable, str(ROOT / "main.py"), "--testmode", "--no-browser"]
+        process = subprocess.Popen(command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    try:
+        if not wait_for_server(url + "/api/test_mode", 30.0):
+            raise RuntimeError("서버가 응답하지 않았습니다")
+        parts = urlsplit(url)
+        rows = measure(parts.hostname, parts.port or 80)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=10)
+
+    print(f"{'Accept-Encoding':<12} {'첫 로드':>12} {'요청':>4}   {'다시 로드':>10} {'요청':>4}")
+    for label, first_bytes, first_requests, reload_bytes, reload_requests in rows:
+        print(f"{label:<12} {first_bytes:>10,} B {first_requests:>4}   {reload_bytes:>8,} B {reload_requests:>4}")
+
+
+if __name__ == "__main__":
+    main()
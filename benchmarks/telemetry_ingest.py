@@ -0,0 +1,98 @@
+"""
+텔레메트리 수신 벤치마크
+모션 플랫폼 프레임(20바이트)을 받아 최근 60초를 유지할 때의 처리 시간과 메모리 비교
+
+    objects: 프레임마다 struct.unpack으로 튜플을 만들어 deque에 보관 (샘플별 파이썬 객체)
+    ring:    데이터그램을 np.frombuffer로 변환해 미리 할당한 RingBuffer에 복사 (TelemetryController 방식)
+
+데이터그램당 프레임이 1개뿐이면 배열 변환 비용 때문에 ring이 더 느릴 수 있음 (메모리 차이는 그대로)
+
+사용법:
+    python benchmarks/telemetry_ingest.py
+    python benchmarks/telemetry_ingest.py --rate 1000 --seconds 120 --batch 1
+"""
+import argparse
+import gc
+import struct
+import sys
+import time
+import tracemalloc
+from collections import deque
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import numpy as np
+from utils.ring_buffer import RingBuffer
+from controllers.telemetry_controller import FRAME_DTYPE, SAMPLE_DTYPE, RING_SECONDS, MAX_RATE
+
+FRAME = struct.Struct("<IIffI")
+
+
+def make_datagrams(rate: int, seconds: int, batch: int) -> list:
+    """플랫폼이 보내는 데이터그램 (batch개 프레임씩)"""
+    total = rate * seconds
+    frames = np.zeros(total, dtype=FRAME_DTYPE)
+    frames["seq"] = np.arange(total)
+    frames["time_ms"] = np.arange(total) * 1000 // rate
+    frames["position"] = np.sin(np.arange(total) / rate)
+    frames["velocity"] = np.cos(np.arange(total) / rate)
+    frames["status"] = 1
+    raw = frames.tobytes()
+    size = FRAME_DTYPE.itemsize * batch
+    return [raw[i:i + size] for i in range(0, len(raw), size)]
+
+
+def ingest_objects(datagrams: list, capacity: int):
+    samples = deque(maxlen=capacity)
+    for data in datagrams:
+        received_at = time.time()
+        for seq, time_ms, position, velocity, status in FRAME.iter_unpack(data):
+            samples.append((seq, time_ms, position, velocity, status, received_at))
+    return samples
+
+
+def ingest_ring(datagrams: list, capacity: int):
+    ring = RingBuffer(SAMPLE_DTYPE, capacity)
+    for data in datagrams:
+        frames = np.frombuffer(data, dtype=FRAME_DTYPE)
+        rows = np.empty(len(frames), dtype=SAMPLE_DTYPE)
+        for name in FRAME_DTYPE.names:
+            rows[name] = frames[name]
+        rows["recv"] = time.time()
+        ring.extend(rows)
+    return ring
+
+
+def measure(name: str, func, datagrams: list, capacity: int, frames: int):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    kept = func(datagrams, capacity)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    print(f"{name:<8} {elapsed * 1e6 / frames:>8.2f} us/프레임 {frames / elapsed:>12,.0f} 프레임/s"
+          f" {current / 1e6:>8.1f} MB 유지 {peak / 1e6:>8.1f} MB 최대")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="텔레메트리 수신 처리 시간/메모리 비교")
+    parser.add_argument("--rate", type=int, default=500, help="프레임 수신율 (Hz)")
+    parser.add_argument("--seconds", type=int, default=120, help="수신 시간 (초)")
+    parser.add_argument("--batch", type=int, default=10, help="데이터그램당 프레임 수")
+    args = parser.parse_args()
+
+    datagrams = make_datagrams(args.rate, args.seconds, args.batch)
+    frames = args.rate * args.seconds
+    capacity = RING_SECONDS * MAX_RATE
+    print(f"{frames:,}개 프레임, 데이터그램 {len(datagrams):,}개, 최근 {capacity:,}개 유지")
+    measure("objects", ingest_objects, datagrams, capacity, frames)
+    measure("ring", ingest_ring, datagrams, capacity, frames)
+
+
+if __name__ == "__main__":
+    main()
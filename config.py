@@ -3,8 +3,14 @@ VR 추락 시뮬레이터 컨트롤러 설정
 """
 import os
 import sys
+import io
+import asyncio
+import logging
+import tempfile
+import threading
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List
+from typing import Callable, Dict, List, Optional, Tuple
 import configparser
 
 
@@ -35,16 +41,20 @@ def create_default_config() -> configparser.ConfigParser:
     }
     
     config['Devices'] = {
-        'pico_ips': '192.168.0.101,192.168.0.102,192.168.0.103'
+        'pico_ips': '192.168.0.101,192.168.0.102,192.168.0.103',
+        'scan_cache_ttl': '3',
+        'device_cache_days': '14'
     }
     
     config['Simulator'] = {
         'host': '192.168.0.200',
-        'port': '9000'
+        'port': '9000',
+        'telemetry_port': '9001'
     }
     
     config['APK'] = {
-        'package_name': 'com.mc.gintotal.vrfall'
+        'package_name': 'com.mc.gintotal.vrfall',
+        'standby_mode': 'cold'
     }
     
     config['ADB'] = {
@@ -74,13 +84,34 @@ def load_config() -> configparser.ConfigParser:
     return config
 
 
+def _write_config_text(text: str):
+    """설정 파일 원자적 저장 (임시 파일에 쓴 뒤 교체하여 중간에 끊겨도 파일이 깨지지 않음)"""
+    fd, tmp_path = tempfile.mkstemp(dir=str(CONFIG_FILE_PATH.parent), prefix=".config-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, CONFIG_FILE_PATH)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _config_to_text(config: configparser.ConfigParser) -> str:
+    """설정을 ini 문자열로 변환"""
+    buffer = io.StringIO()
+    config.write(buffer)
+    return buffer.getvalue()
+
+
 def save_config(config: configparser.ConfigParser = None):
-    """설정 파일 저장"""
+    """설정 파일 저장 (동기)"""
     if config is None:
-        config = _config
+        config = settings.config
     
-    with open(CONFIG_FILE_PATH, 'w', encoding='utf-8') as f:
-        config.write(f)
+    _write_config_text(_config_to_text(config))
 
 
 # 설정 로드
@@ -98,34 +129,20 @@ def is_test_mode() -> bool:
 
 TEST_MODE = is_test_mode()
 
-# 네트워크 설정
-SERVER_HOST = _config.get('Server', 'host', fallback='0.0.0.0')
-SERVER_PORT = _config.getint('Server', 'port', fallback=8000)
-WEBSOCKET_PORT = _config.getint('Server', 'websocket_port', fallback=8001)
-UNITY_SERVER_PORT = _config.getint('Server', 'unity_server_port', fallback=9100)
-
-# 피코 디바이스 IP 리스트 (테스트 모드에서만 사용)
-if TEST_MODE:
-    pico_ips_str = _config.get('Devices', 'pico_ips', fallback='192.168.1.101,192.168.1.102,192.168.1.103')
-    DEFAULT_PICO_IPS: List[str] = [ip.strip() for ip in pico_ips_str.split(',') if ip.strip()]
-else:
-    # 일반 모드에서는 config에서 IP를 읽지 않음 (스캔을 통해서만 디바이스 검색)
-    DEFAULT_PICO_IPS: List[str] = []
-
-# 시뮬레이터 설정
-SIMULATOR_HOST = _config.get('Simulator', 'host', fallback='192.168.1.200')
-SIMULATOR_PORT = _config.getint('Simulator', 'port', fallback=9000)
 
 # ADB 설정
-def get_adb_path() -> str:
+def get_adb_path(config: configparser.ConfigParser = None) -> str:
     """ADB 경로 반환 (프로젝트 내부 우선)"""
+    if config is None:
+        config = settings.config
+    
     # 1순위: 프로젝트 내부 platform-tools
     local_adb = EXE_DIR / "platform-tools" / "adb.exe"
     if local_adb.exists():
         return str(local_adb)
     
     # 2순위: config.ini 설정값
-    config_adb = _config.get('ADB', 'path', fallback='')
+    config_adb = config.get('ADB', 'path', fallback='')
     if config_adb and Path(config_adb).exists():
         return config_adb
     
@@ -133,14 +150,300 @@ def get_adb_path() -> str:
     # (ADB가 PATH에 있으면 'adb.exe'만으로 실행 가능)
     return 'adb.exe'
 
-ADB_PATH = get_adb_path()
 
-# 기본 APK 패키지 이름
-DEFAULT_PACKAGE_NAME = _config.get('APK', 'package_name', fallback='com.safety.vrfall')
+# ==================== 설정 객체 ====================
+
+@dataclass(frozen=True)
+class Settings:
+    """현재 설정 값 (변경 시 새 객체로 교체됨)"""
+    server_host: str
+    server_port: int
+    websocket_port: int
+    unity_server_port: int
+    pico_ips: Tuple[str, ...]
+    scan_cache_ttl: float
+    device_cache_days: float
+    simulator_host: str
+    simulator_port: int
+    telemetry_port: int  # 모션 플랫폼 텔레메트리 수신 UDP 포트
+    adb_path: str
+    package_name: str
+    standby_mode: str  # 세션 사이 앱 처리: cold(강제 종료 후 재실행) / warm(앱 유지, 장면만 초기화)
+    log_file: str
+    max_log_lines: int
+
+    @property
+    def default_pico_ips(self) -> List[str]:
+        """기본 피코 IP 리스트 (테스트 모드에서만 사용, 일반 모드에서는 스캔을 통해서만 검색)"""
+        return list(self.pico_ips) if TEST_MODE else []
+
+
+STANDBY_MODES = ("cold", "warm")
+
+# 설정 키 -> config.ini (섹션, 항목)
+SETTING_OPTIONS: Dict[str, Tuple[str, str]] = {
+    "server_host": ("Server", "host"),
+    "server_port": ("Server", "port"),
+    "websocket_port": ("Server", "websocket_port"),
+    "unity_server_port": ("Server", "unity_server_port"),
+    "pico_ips": ("Devices", "pico_ips"),
+    "scan_cache_ttl": ("Devices", "scan_cache_ttl"),
+    "device_cache_days": ("Devices", "device_cache_days"),
+    "simulator_host": ("Simulator", "host"),
+    "simulator_port": ("Simulator", "port"),
+    "telemetry_port": ("Simulator", "telemetry_port"),
+    "adb_path": ("ADB", "path"),
+    "package_name": ("APK", "package_name"),
+    "standby_mode": ("APK", "standby_mode"),
+    "log_file": ("Logging", "log_file"),
+    "max_log_lines": ("Logging", "max_log_lines"),
+}
+
+
+def read_settings(config: configparser.ConfigParser, strict: bool = True) -> Settings:
+    """ConfigParser에서 설정 객체 생성 (잘못된 값이면 ValueError)
+
+    strict가 False이면 (시작 시 config.ini 로드) 잘못된 standby_mode는 경고 후 기본값 사용
+    """
+    pico_ips_str = config.get('Devices', 'pico_ips', fallback='192.168.1.101,192.168.1.102,192.168.1.103')
+    standby_mode = config.get('APK', 'standby_mode', fallback='cold').strip().lower()
+    if standby_mode not in STANDBY_MODES:
+        message = f"standby_mode는 {' 또는 '.join(STANDBY_MODES)}이어야 합니다: {standby_mode}"
+        if strict:
+            raise ValueError(message)
+        logging.getLogger(__name__).warning(f"{message} (기본값 cold 사용)")
+        standby_mode = 'cold'
+        # 이후 update()가 같은 값 때문에 계속 실패하지 않도록 읽은 설정도 교정 (다음 저장 시 파일에 반영)
+        config.set('APK', 'standby_mode', standby_mode)
+    
+    return Settings(
+        server_host=config.get('Server', 'host', fallback='0.0.0.0'),
+        server_port=config.getint('Server', 'port', fallback=8000),
+        websocket_port=config.getint('Server', 'websocket_port', fallback=8001),
+        unity_server_port=config.getint('Server', 'unity_server_port', fallback=9100),
+        pico_ips=tuple(ip.strip() for ip in pico_ips_str.split(',') if ip.strip()),
+        scan_cache_ttl=config.getfloat('Devices', 'scan_cache_ttl', fallback=3.0),
+        device_cache_days=config.getfloat('Devices', 'device_cache_days', fallback=14.0),
+        simulator_host=config.get('Simulator', 'host', fallback='192.168.1.200'),
+        simulator_port=config.getint('Simulator', 'port', fallback=9000),
+        telemetry_port=config.getint('Simulator', 'telemetry_port', fallback=9001),
+        adb_path=get_adb_path(config),
+        package_name=config.get('APK', 'package_name', fallback='com.safety.vrfall'),
+        standby_mode=standby_mode,
+        log_file=config.get('Logging', 'log_file', fallback='vr_controller.log'),
+        max_log_lines=config.getint('Logging', 'max_log_lines', fallback=1000),
+    )
+
+
+SettingsListener = Callable[[Settings, Settings], None]
+
+
+class SettingsStore:
+    """설정 저장소
+    
+    - update(): 값 변경 후 구독자에게 알리고, 파일 저장은 디바운스하여 이벤트 루프 밖에서 원자적으로 기록
+    - watch(): config.ini가 외부에서 수정되면 다시 읽어서 구독자에게 알림
+    - subscribe(): (이전 설정, 새 설정)을 받는 콜백 등록
+    """
+    
+    SAVE_DEBOUNCE = 0.5  # 연속 변경을 모아서 저장 (초)
+    SAVE_RETRY = 5.0     # 저장 실패 시 다시 시도 (초)
+
+    def __init__(self, config: configparser.ConfigParser, path: Path):
+        self.config = config
+        self.path = path
+        # 시작 시에는 오타 하나로 창 없는 exe가 실행되지 않는 일이 없도록 기본값으로 대체
+        self.current = read_settings(config, strict=False)
+        self._listeners: List[SettingsListener] = []
+        self._save_handle: Optional[asyncio.TimerHandle] = None
+        self._dirty = False
+        self._write_lock = threading.Lock()
+        self._file_mtime = self._stat_mtime()
+
+    def _stat_mtime(self) -> Optional[int]:
+        try:
+            return self.path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def subscribe(self, listener: SettingsListener) -> SettingsListener:
+        """설정 변경 구독"""
+        self._listeners.append(listener)
+        return listener
+
+    def unsubscribe(self, listener: SettingsListener):
+        """설정 변경 구독 해제"""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _apply(self, config: configparser.ConfigParser, new: Settings):
+        """새 설정 적용 및 구독자 알림"""
+        old = self.current
+        self.config = config
+        self.current = new
+
+        if old == new:
+            return
+
+        for listener in list(self._listeners):
+            try:
+                listener(old, new)
+            except Exception as e:
+                logging.getLogger(__name__).error(f"설정 변경 알림 오류: {str(e)}")
+
+    def update(self, **changes) -> Settings:
+        """설정 값 변경 (잘못된 값이면 ValueError, 변경 사항은 적용되지 않음)"""
+        config = configparser.ConfigParser()
+        config.read_dict(self.config)
 
-# 로그 설정
-LOG_FILE = _config.get('Logging', 'log_file', fallback='vr_controller.log')
-MAX_LOG_LINES = _config.getint('Logging', 'max_log_lines', fallback=1000)
+        for key, value in changes.items():
+            if key not in SETTING_OPTIONS:
+                raise ValueError(f"알 수 없는 설정: {key}")
+            section, option = SETTING_OPTIONS[key]
+            if isinstance(value, (list, tuple)):
+                value = ','.join(str(v).strip() for v in value)
+            if not config.has_section(section):
+                config.add_section(section)
+            config.set(section, option, str(value))
+
+        new = read_settings(config)
+        self._apply(config, new)
+        self._schedule_save()
+        return new
+
+    def _schedule_save(self):
+        """디바운스 저장 예약 (이벤트 루프가 없으면 즉시 저장)"""
+        self._dirty = True
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write(_config_to_text(self.config))
+            self._dirty = False
+            return
+
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+        self._save_handle = loop.call_later(
+            self.SAVE_DEBOUNCE, lambda: asyncio.ensure_future(self.flush())
+        )
+
+    def _write(self, text: str):
+        """설정 파일 기록 (자기 자신이 쓴 변경은 watch에서 다시 읽지 않음)"""
+        with self._write_lock:
+            _write_config_text(text)
+            self._file_mtime = self._stat_mtime()
+    
+    async def flush(self):
+        """예약된 저장을 즉시 실행 (파일 쓰기는 실행기 스레드에서)"""
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+            self._save_handle = None
+
+        if not self._dirty:
+            return
+
+        loop = asyncio.get_running_loop()
+        config = self.config
+        text = _config_to_text(config)
+        try:
+            await loop.run_in_executor(None, self._write, text)
+        except OSError as e:
+            # 변경 사항을 잃지 않도록 저장 대기 상태를 유지하고 다시 시도
+            logging.getLogger(__name__).error(f"설정 저장 실패 ({self.SAVE_RETRY:g}초 후 다시 시도): {str(e)}")
+            self._save_handle = loop.call_later(self.SAVE_RETRY, lambda: asyncio.ensure_future(self.flush()))
+            return
+
+        # 저장하는 동안 다시 변경되었으면 (설정 객체가 바뀜) 다음 저장에서 기록
+        if self.config is config:
+            self._dirty = False
+
+    def _read_changed(self):
+        """파일이 외부에서 수정되었으면 다시 읽어 (config, Settings) 반환, 아니면 None"""
+        mtime = self._stat_mtime()
+        if mtime is None or mtime == self._file_mtime:
+            return None
+
+        self._file_mtime = mtime
+        config = configparser.ConfigParser()
+        try:
+            config.read(self.path, encoding='utf-8')
+            new = read_settings(config)
+        except (configparser.Error, ValueError) as e:
+            logging.getLogger(__name__).error(f"설정 파일 오류 (이전 설정 유지): {str(e)}")
+            return None
+
+        return config, new
+
+    def reload(self) -> bool:
+        """파일이 외부에서 수정되었으면 다시 읽기 (변경되었으면 True)"""
+        result = self._read_changed()
+        if result is None:
+            return False
+
+        self._apply(*result)
+        return True
+    
+    async def watch(self, interval: float = 1.0):
+        """config.ini 변경 감시 (취소될 때까지 실행)
+
+        파일 읽기/파싱만 실행기 스레드에서 하고, 적용(구독자 호출)은
+        이벤트 루프 스레드에서 하므로 구독자는 루프에서 실행된다고 가정할 수 있다.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(interval)
+            # 저장 대기 중인 변경이 있으면 파일보다 메모리 값이 최신이므로 건너뜀
+            if self._dirty:
+                continue
+            result = await loop.run_in_executor(None, self._read_changed)
+            # 읽는 동안 API로 변경되었으면 메모리 값을 우선
+            if result is None or self._dirty:
+                continue
+            self._apply(*result)
+
+
+settings = SettingsStore(_config, CONFIG_FILE_PATH)
+
+
+# ==================== 모듈 전역 값 (하위 호환) ====================
+# 새 코드는 settings.current를 읽거나 settings.subscribe()로 변경을 구독할 것
+
+def _apply_globals(old: Optional[Settings], new: Settings):
+    """설정 변경 시 모듈 전역 값 갱신"""
+    global SERVER_HOST, SERVER_PORT, WEBSOCKET_PORT, UNITY_SERVER_PORT
+    global DEFAULT_PICO_IPS, SCAN_CACHE_TTL, SIMULATOR_HOST, SIMULATOR_PORT
+    global ADB_PATH, DEFAULT_PACKAGE_NAME, LOG_FILE, MAX_LOG_LINES
+    
+    # 네트워크 설정
+    SERVER_HOST = new.server_host
+    SERVER_PORT = new.server_port
+    WEBSOCKET_PORT = new.websocket_port
+    UNITY_SERVER_PORT = new.unity_server_port
+    
+    # 피코 디바이스 IP 리스트 (테스트 모드에서만 사용)
+    DEFAULT_PICO_IPS = new.default_pico_ips
+    
+    # 스캔 결과 캐시 시간 (초, 동시에 여러 태블릿에서 스캔해도 한 번만 실행)
+    SCAN_CACHE_TTL = new.scan_cache_ttl
+    
+    # 시뮬레이터 설정
+    SIMULATOR_HOST = new.simulator_host
+    SIMULATOR_PORT = new.simulator_port
+    
+    # ADB 설정
+    ADB_PATH = new.adb_path
+    
+    # 기본 APK 패키지 이름
+    DEFAULT_PACKAGE_NAME = new.package_name
+    
+    # 로그 설정
+    LOG_FILE = new.log_file
+    MAX_LOG_LINES = new.max_log_lines
+
+
+_apply_globals(None, settings.current)
+settings.subscribe(_apply_globals)
 
 # UI 테마 색상
 THEME = {
@@ -160,25 +463,15 @@ def update_pico_ips(ips: List[str]):
     # 일반 모드에서는 IP를 config에 저장하지 않음
     # 테스트 모드에서만 저장된 IP를 사용
     if TEST_MODE:
-        _config.set('Devices', 'pico_ips', ','.join(ips))
-        save_config()
-        global DEFAULT_PICO_IPS
-        DEFAULT_PICO_IPS = ips
+        settings.update(pico_ips=ips)
     # 일반 모드에서는 스캔된 디바이스만 사용하므로 저장하지 않음
 
 
 def update_simulator_host(host: str):
     """시뮬레이터 호스트 업데이트 및 저장"""
-    _config.set('Simulator', 'host', host)
-    save_config()
-    global SIMULATOR_HOST
-    SIMULATOR_HOST = host
+    settings.update(simulator_host=host)
 
 
 def update_package_name(package_name: str):
     """APK 패키지 이름 업데이트 및 저장"""
-    _config.set('APK', 'package_name', package_name)
-    save_config()
-    global DEFAULT_PACKAGE_NAME
-    DEFAULT_PACKAGE_NAME = package_name
-
+    settings.update(package_name=package_name)
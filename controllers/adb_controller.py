@@ -1,31 +1,65 @@
 """
 ADB 컨트롤러
 피코 디바이스 관리 및 ADB 명령 실행
+(ADB 하위 프로세스 실행/출력 처리는 별도 작업 프로세스에서 수행, controllers/adb_worker.py)
 """
 import asyncio
-import subprocess
+import random
+import shlex
 import shutil
 from pathlib import Path
-from typing import List, Dict, Union
+from typing import Any, AsyncIterator, Callable, List, Dict, Optional, Tuple, Union
+import numpy as np
 from utils.logger import Logger
-from config import ADB_PATH, DEFAULT_PICO_IPS, TEST_MODE, EXE_DIR
+from utils.launch_timing import launch_timings, parse_am_start
+from controllers.adb_worker_client import ADBWorkerClient, ADBWorkerError
+from controllers.device_cache import DeviceCache
+from config import settings, Settings, TEST_MODE, EXE_DIR
+
+APP_LAUNCH_TIMEOUT = 60.0  # am start -W 응답 대기 (Unity 콜드 시작은 셸 세션 기본 10초를 넘을 수 있음)
 
 
 class ADBController:
     def __init__(self, logger: Logger):
         self.logger = logger
         self.devices: List[Dict[str, str]] = []
-        self.default_ips = DEFAULT_PICO_IPS.copy()
+        self.default_ips = settings.current.default_pico_ips
         self.first_scan_done = False  # 첫 스캔 여부 추적
+        self.worker = ADBWorkerClient(logger)  # 처음 ADB 명령을 실행할 때 시작
+        
+        # 이전 실행에서 연결된 디바이스 (재연결 확인 전까지 "cached" 상태로 표시)
+        self.cache = DeviceCache(EXE_DIR / "device_cache.json", logger)
+        self._validating: Dict[str, asyncio.Task] = {}
+        self._validated = set()  # 이번 실행에서 정보를 확인한 디바이스
+        # 앱을 의도적으로 종료/설치/삭제/재부팅한 디바이스 (앱을 다시 실행할 때까지 앱 감시에서 제외)
+        self.expected_down: set = set()
         
         # 일반 모드에서 배치 파일 복사
         if not TEST_MODE:
             self.copy_batch_file_to_exe()
+            self.cache.load(settings.current.device_cache_days)
+            self.devices = [self._device_info(ip, "cached") for ip in self.cache.known_ips()]
+        
+        settings.subscribe(self._on_settings_changed)
     
-    async def run_adb_command(self, command: List[str], device_ip: str = None) -> tuple[bool, str]:
-        """ADB 명령 실행"""
+    def _on_settings_changed(self, old: Settings, new: Settings):
+        """설정 변경 반영 (기본 IP, ADB 경로)"""
+        self.default_ips = new.default_pico_ips
+        if old.adb_path != new.adb_path:
+            # 이전 ADB로 실행된 셸 세션은 작업 프로세스에서 다음 명령 때 새 경로로 다시 시작
+            self.logger.info(f"ADB 경로 변경: {new.adb_path}")
+    
+    async def run_adb_command(self, command: List[str], device_ip: str = None,
+                              use_session: bool = True,
+                              on_progress: Callable[[str], None] = None,
+                              timeout: float = None) -> tuple[bool, str]:
+        """ADB 명령 실행 (디바이스 셸 명령은 지속 셸 세션으로 실행, on_progress: 진행 중 출력 줄 콜백,
+        timeout: 응답 대기 초, 지정하지 않으면 셸 세션 기본 시간)"""
+        if use_session and device_ip and not TEST_MODE and len(command) > 1 and command[0] == "shell":
+            return await self.run_shell(device_ip, " ".join(command[1:]), timeout)
+        
         try:
-            cmd = [ADB_PATH]
+            cmd = [settings.current.adb_path]
             
             if device_ip:
                 cmd.extend(["-s", device_ip])
@@ -42,32 +76,94 @@ class ADBController:
                 elif "install" in cmd_str:
                     await asyncio.sleep(0.5)
                     return True, "Success"
+                elif "am start -W" in cmd_str:
+                    # Unity 앱 콜드 시작과 비슷한 가상 시작 시간
+                    total = random.randint(2500, 4000)
+                    await asyncio.sleep(total / 10000)
+                    return True, f"Status: ok\nLaunchState: COLD\nTotalTime: {total}\nWaitTime: {total + 40}\nComplete"
                 else:
                     return True, "OK"
             
-            # 실제 ADB 명령 실행 (CMD 창 숨김)
-            creationflags = subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0
-            
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                creationflags=creationflags
+            # 실제 ADB 명령 실행 (작업 프로세스에서 실행 후 디코딩된 출력만 받음)
+            result = await self.worker.request(
+                "run", {"args": cmd, "progress": on_progress is not None, "timeout": timeout}, on_progress
             )
             
-            stdout, stderr = await process.communicate()
-            
-            if process.returncode == 0:
-                return True, stdout.decode('utf-8', errors='ignore')
+            if result["success"]:
+                return True, result["output"]
             else:
-                error = stderr.decode('utf-8', errors='ignore')
-                self.logger.error(f"ADB 명령 실패: {error}")
-                return False, error
+                self.logger.error(f"ADB 명령 실패: {result['output']}")
+                return False, result["output"]
                 
         except Exception as e:
             self.logger.error(f"ADB 명령 실행 오류: {str(e)}")
             return False, str(e)
     
+    def stream_lines(self, command: List[str], device_ip: str) -> AsyncIterator[List[str]]:
+        """출력을 계속 읽는 ADB 명령 실행 (logcat 등, 줄 묶음 단위로 반환하며 반복을 멈추거나 닫으면 프로세스 종료)"""
+        return self.worker.stream("stream", {"args": [settings.current.adb_path, "-s", device_ip, *command]})
+    
+    async def exec_out(self, command: List[str], device_ip: str, timeout: float = 10.0) -> bytes:
+        """adb exec-out 실행 후 바이너리 출력 반환 (screencap 등, 임시 파일 없이 표준 출력으로 받음)"""
+        try:
+            return await self.worker.request("exec_out", {
+                "args": [settings.current.adb_path, "-s", device_ip, "exec-out", *command],
+                "timeout": timeout,
+            })
+        except ADBWorkerError as e:
+            if e.timeout:
+                raise asyncio.TimeoutError() from e
+            raise
+    
+    async def screencap_thumbnail(self, device_ip: str, width: int,
+                                  timeout: float = 10.0) -> Optional[Tuple[np.ndarray, str]]:
+        """화면 캡처 후 작업 프로세스에서 width 너비로 축소 (RGB 배열, 변경 확인용 해시, 형식을 알 수 없으면 None)
+
+        원본(헤드셋 화면 한 장에 수 MB)은 작업 프로세스 안에서만 다루고 썸네일 크기 배열만 받음
+        """
+        try:
+            result = await self.worker.request("thumbnail", {
+                "args": [settings.current.adb_path, "-s", device_ip, "exec-out", "screencap"],
+                "width": width,
+                "timeout": timeout,
+            })
+        except ADBWorkerError as e:
+            if e.timeout:
+                raise asyncio.TimeoutError() from e
+            raise
+        if result is None:
+            return None
+        meta, data = result
+        return np.frombuffer(data, dtype=np.uint8).reshape(meta["shape"]), meta["digest"]
+    
+    async def run_shell(self, device_ip: str, command: str, timeout: float = None) -> tuple[bool, str]:
+        """지속 셸 세션에서 명령 실행
+
+        세션은 작업 프로세스에서 디바이스별로 유지하며, 명령을 보내기 전에 끊어졌으면 한 번 다시 연결해 재시도하고
+        그래도 실패하면 일회성 adb shell 명령으로 실행 (명령을 보낸 뒤 시간 초과되면 재시도하지 않음)
+        """
+        try:
+            result = await self.worker.request("shell", {
+                "adb": settings.current.adb_path, "device": device_ip, "command": command, "timeout": timeout,
+            })
+            return result["success"], result["output"]
+        except ADBWorkerError as e:
+            self.logger.error(f"셸 명령 실행 오류 ({device_ip}): {str(e)}")
+            return False, str(e)
+    
+    async def close_shell_sessions(self, device_ips: List[str] = None, keep: List[str] = None):
+        """셸 세션 종료 (지정하지 않으면 keep에 없는 전체, 작업 프로세스가 없으면 할 일 없음)"""
+        if not self.worker.alive:
+            return
+        try:
+            await self.worker.request("close_sessions", {"devices": device_ips, "keep": keep or []})
+        except ADBWorkerError:
+            pass  # 작업 프로세스가 종료되면 셸 세션도 함께 종료됨
+    
+    async def close(self):
+        """작업 프로세스 종료 (셸 세션과 실행 중인 스트림 포함)"""
+        await self.worker.close()
+    
     def copy_batch_file_to_exe(self):
         """배치 파일들을 exe 디렉토리에 복사"""
         try:
@@ -102,22 +198,15 @@ class ADBController:
             
             self.logger.info("ADB 연결 배치 파일 실행 중...")
             
-            # 배치 파일 실행 (백그라운드에서)
-            process = await asyncio.create_subprocess_exec(
-                str(bat_path),
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                creationflags=subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0
-            )
+            # 배치 파일 실행 (작업 프로세스에서, 완료 대기는 최대 10초)
+            result = await self.worker.request("batch", {"path": str(bat_path), "timeout": 10.0})
             
-            # 배치 파일 완료 대기 (최대 10초)
-            try:
-                await asyncio.wait_for(process.communicate(), timeout=10.0)
+            if result["completed"]:
                 self.logger.success("ADB 연결 배치 파일 실행 완료")
                 # 연결 안정화를 위해 잠시 대기
                 await asyncio.sleep(1.0)
                 return True
-            except asyncio.TimeoutError:
+            else:
                 self.logger.warning("배치 파일 실행 시간 초과 (백그라운드 계속 실행 중)")
                 return True  # 백그라운드로 계속 실행되므로 성공으로 간주
                 
@@ -165,6 +254,18 @@ class ADBController:
             
             # 일반 모드에서는 스캔된 디바이스만 표시 (기본 IP 추가 안함)
             
+            # 사라졌거나 오프라인인 디바이스의 셸 세션 정리
+            online = {d["ip"] for d in devices if d["status"] == "device"}
+            await self.close_shell_sessions(keep=list(online))
+            
+            if not TEST_MODE:
+                # 온라인 디바이스를 캐시에 기록하고, 정보(시리얼/모델/앱 버전)는 백그라운드에서 확인
+                for ip in online:
+                    self.cache.seen(ip)
+                    self._schedule_validation(ip)
+                devices = [self._device_info(d["ip"], d["status"]) for d in devices]
+                await self.save_cache()
+            
             self.devices = devices
             self.logger.success(f"{len(devices)}개 디바이스 발견됨")
             return devices
@@ -173,26 +274,96 @@ class ADBController:
             self.logger.error(f"디바이스 스캔 오류: {str(e)}")
             return []
     
-    async def _execute_on_devices(self, devices: Union[str, List[str]], command: List[str]) -> bool:
-        """선택된 디바이스에서 명령 실행"""
-        target_devices = []
+    def _device_info(self, ip: str, status: str) -> Dict[str, str]:
+        """디바이스 목록 항목 (캐시에 저장된 정보 포함)"""
+        info = {"ip": ip, "status": status}
+        entry = self.cache.get(ip)
+        if entry:
+            for key in ("serial", "model", "app_version", "last_seen"):
+                if entry.get(key) is not None:
+                    info[key] = entry[key]
+        return info
+    
+    async def save_cache(self):
+        """오래된 항목을 정리하고 디바이스 캐시 저장"""
+        self.cache.prune(settings.current.device_cache_days)
+        await self.cache.save()
+    
+    async def reconnect_cached(self) -> List[Dict[str, str]]:
+        """캐시된 네트워크 디바이스에 동시에 재연결한 뒤 스캔 (시작 시 백그라운드에서 실행)"""
+        targets = [ip for ip in self.cache.known_ips() if ":" in ip]
+        if TEST_MODE or not targets:
+            return self.devices
         
+        self.logger.info(f"캐시된 디바이스 {len(targets)}개 재연결 중...")
+        await asyncio.gather(
+            *(asyncio.wait_for(self.run_adb_command(["connect", ip]), timeout=10.0) for ip in targets),
+            return_exceptions=True
+        )
+        return await self.scan_devices()
+    
+    def _schedule_validation(self, ip: str):
+        """이번 실행에서 아직 확인하지 않은 디바이스 정보 확인 예약"""
+        if ip in self._validated or ip in self._validating:
+            return
+        task = asyncio.ensure_future(self._validate_device(ip))
+        self._validating[ip] = task
+        task.add_done_callback(lambda _: self._validating.pop(ip, None))
+    
+    async def _validate_device(self, ip: str):
+        """디바이스 시리얼/모델/앱 버전 확인 후 캐시 갱신 (셸 명령 한 번)"""
+        package_name = shlex.quote(settings.current.package_name)
+        success, output = await self.run_shell(
+            ip, f"getprop ro.serialno; getprop ro.product.model; dumpsys package {package_name} | grep -m1 versionName"
+        )
+        if not success:
+            return
+        
+        lines = [line.strip() for line in output.splitlines()]
+        lines += [""] * (3 - len(lines))
+        if not lines[0]:
+            return
+        app_version = lines[2].split("=", 1)[1] if lines[2].startswith("versionName=") else None
+        
+        self.cache.update_identity(ip, lines[0], lines[1], app_version)
+        self._validated.add(ip)
+        self.devices = [self._device_info(d["ip"], d["status"]) for d in self.devices]
+        await self.save_cache()
+    
+    def resolve_devices(self, devices: Union[str, List[str]]) -> List[str]:
+        """대상 디바이스 지정("all", 단일 IP, IP 목록)을 IP 목록으로 변환"""
         if devices == "all":
-            target_devices = [d["ip"] for d in self.devices]
-        else:
-            target_devices = devices if isinstance(devices, list) else [devices]
+            # 재연결이 확인되지 않은 캐시 항목은 제외
+            return [d["ip"] for d in self.devices if d["status"] != "cached"]
+        return devices if isinstance(devices, list) else [devices]
+    
+    @staticmethod
+    def get_launch_activity(package_name: str) -> str:
+        """Unity VR 앱의 실행 액티비티 이름"""
+        return f"{package_name}/com.unity3d.player.UnityPlayerActivity"
+    
+    async def _execute_on_devices(self, devices: Union[str, List[str]], command: List[str],
+                                  progress: bool = False) -> bool:
+        """선택된 디바이스에서 명령 실행 (progress: 디바이스별 진행 출력과 완료 수를 로그로 표시)"""
+        target_devices = self.resolve_devices(devices)
         
         if not target_devices:
             self.logger.warning("대상 디바이스가 없습니다")
             return False
         
-        # 동시 실행 (오차 최소화)
-        tasks = []
-        for device_ip in target_devices:
-            task = self.run_adb_command(command, device_ip)
-            tasks.append(task)
+        done = 0
+        
+        async def run(device_ip: str) -> tuple[bool, str]:
+            nonlocal done
+            on_progress = (lambda line: self.logger.info(f"[{device_ip}] {line}")) if progress else None
+            result = await self.run_adb_command(command, device_ip, on_progress=on_progress)
+            done += 1
+            if progress:
+                self.logger.info(f"{device_ip} {'완료' if result[0] else '실패'} ({done}/{len(target_devices)})")
+            return result
         
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        # 동시 실행 (오차 최소화)
+        results = await asyncio.gather(*(run(ip) for ip in target_devices), return_exceptions=True)
         
         success_count = sum(1 for r in results if isinstance(r, tuple) and r[0])
         self.logger.info(f"{success_count}/{len(target_devices)} 디바이스에서 성공")
@@ -202,30 +373,66 @@ class ADBController:
     async def install_apk(self, apk_path: str, devices: Union[str, List[str]] = "all") -> bool:
         """APK 설치"""
         self.logger.info(f"APK 설치 중: {apk_path}")
-        return await self._execute_on_devices(devices, ["install", "-r", apk_path])
+        self.expected_down.update(self.resolve_devices(devices))
+        return await self._execute_on_devices(devices, ["install", "-r", apk_path], progress=True)
     
     async def uninstall_apk(self, package_name: str, devices: Union[str, List[str]] = "all") -> bool:
         """APK 삭제"""
         self.logger.info(f"APK 삭제 중: {package_name}")
+        self.expected_down.update(self.resolve_devices(devices))
         return await self._execute_on_devices(devices, ["uninstall", package_name])
     
+    async def push_file(self, local_path: str, remote_path: str, devices: Union[str, List[str]] = "all") -> bool:
+        """파일 전송 (OBB, 에셋 등)"""
+        self.logger.info(f"파일 전송 중: {local_path} -> {remote_path}")
+        return await self._execute_on_devices(devices, ["push", local_path, remote_path], progress=True)
+    
     async def launch_app(self, package_name: str, devices: Union[str, List[str]] = "all") -> bool:
-        """앱 실행"""
-        self.logger.info(f"앱 실행 중: {package_name}")
+        """앱 실행 (실행 완료까지 대기하고 디바이스별 시작 시간 기록)"""
+        timings = await self.launch_app_timed(package_name, devices)
+        return any(timing is not None for timing in timings.values())
+    
+    async def launch_app_timed(self, package_name: str,
+                               devices: Union[str, List[str]] = "all") -> Dict[str, Optional[Dict[str, Any]]]:
+        """앱 실행 후 디바이스별 시작 시간 반환 (am start -W의 TotalTime/WaitTime, 실패하면 None)"""
+        target_devices = self.resolve_devices(devices)
+        if not target_devices:
+            self.logger.warning("대상 디바이스가 없습니다")
+            return {}
         
-        # Unity VR 앱의 일반적인 액티비티 이름
-        activity = f"{package_name}/com.unity3d.player.UnityPlayerActivity"
+        self.logger.info(f"앱 실행 중: {package_name}")
+        results = await asyncio.gather(*(self.launch_app_on(package_name, ip) for ip in target_devices))
+        timings = {ip: timing for ip, (timing, _) in zip(target_devices, results)}
         
-        command = ["shell", "am", "start", "-n", activity]
-        return await self._execute_on_devices(devices, command)
+        success_count = sum(1 for t in timings.values() if t is not None)
+        measured = [t["total_ms"] for t in timings.values() if t is not None and t["total_ms"] is not None]
+        suffix = f" (시작 시간 최대 {max(measured)}ms)" if measured else ""
+        self.logger.info(f"{success_count}/{len(target_devices)} 디바이스에서 성공{suffix}")
+        return timings
+    
+    async def launch_app_on(self, package_name: str, device_ip: str) -> tuple[Optional[Dict[str, Any]], str]:
+        """디바이스 하나에서 앱 실행 후 시작 시간 기록 (am start -W 결과, 실패하면 None과 출력)"""
+        # Unity VR 앱의 일반적인 액티비티 이름, -W: 첫 화면이 그려질 때까지 대기
+        command = ["shell", "am", "start", "-W", "-n", self.get_launch_activity(package_name)]
+        success, output = await self.run_adb_command(command, device_ip, timeout=APP_LAUNCH_TIMEOUT)
+        timing = parse_am_start(output) if success else None
+        if timing is None:
+            self.logger.warning(f"{device_ip} 앱 실행 실패: {output.strip()[:200]}")
+            return None, output
+        if timing["total_ms"] is not None:
+            launch_timings.record(device_ip, "cold", timing["total_ms"], timing["wait_ms"], timing["launch_state"])
+        self.expected_down.discard(device_ip)
+        return timing, output
     
     async def stop_app(self, package_name: str, devices: Union[str, List[str]] = "all") -> bool:
         """앱 종료"""
         self.logger.info(f"앱 종료 중: {package_name}")
+        self.expected_down.update(self.resolve_devices(devices))
         command = ["shell", "am", "force-stop", package_name]
         return await self._execute_on_devices(devices, command)
     
     async def reboot_devices(self, devices: Union[str, List[str]] = "all") -> bool:
         """디바이스 재부팅"""
         self.logger.warning("디바이스 재부팅 중...")
+        self.expected_down.update(self.resolve_devices(devices))
         return await self._execute_on_devices(devices, ["reboot"])
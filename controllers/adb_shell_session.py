@@ -0,0 +1,112 @@
+"""
+ADB 셸 세션
+디바이스별로 유지되는 대화형 adb shell 프로세스에서 명령 실행
+"""
+import asyncio
+import subprocess
+import uuid
+from typing import Optional
+from utils.logger import Logger
+
+
+class ADBShellSession:
+    """디바이스 하나에 대한 지속 셸 세션
+
+    명령마다 프로세스를 새로 만들지 않고, 명령 뒤에 종료 표식(sentinel)을 출력시켜
+    한 번의 왕복으로 결과를 구분한다. 한 번에 하나의 명령만 실행되도록 잠금을 사용한다.
+    """
+
+    def __init__(self, adb_path: str, device_ip: str, logger: Logger):
+        self.adb_path = adb_path
+        self.device_ip = device_ip
+        self.logger = logger
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self._lock = asyncio.Lock()
+        self._marker = f"__VRFALL_DONE_{uuid.uuid4().hex}__"
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.returncode is None
+
+    async def start(self):
+        """셸 프로세스 시작"""
+        creationflags = subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0
+
+        self.process = await asyncio.create_subprocess_exec(
+            self.adb_path, "-s", self.device_ip, "shell", "-T",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            creationflags=creationflags
+        )
+        self.logger.info(f"셸 세션 시작: {self.device_ip}")
+
+    async def execute(self, command: str, timeout: float = 10.0) -> tuple[bool, str]:
+        """셸 명령 실행 (종료 코드 0이면 성공)
+
+        명령을 보내기 전에 세션이 종료된 경우에만 ConnectionError를 발생시킨다 (호출자가 새 세션으로 재시도).
+        명령을 보낸 뒤 응답이 없거나 출력이 닫히면 명령이 이미 실행됐을 수 있으므로
+        세션만 닫고 실패를 반환한다 (같은 명령이 다시 실행되지 않도록).
+        """
+        async with self._lock:
+            if not self.alive:
+                raise ConnectionError(f"셸 세션이 종료됨: {self.device_ip}")
+
+            # 표준 입력을 막아 명령이 세션 입력을 소비하지 않도록 하고, 종료 코드를 표식과 함께 출력
+            # (여러 명령/파이프가 섞인 경우에도 리다이렉션이 전체에 적용되도록 중괄호로 묶음,
+            #  출력이 개행으로 끝나지 않아도 표식이 줄 처음에 오도록 표식 앞에 개행 출력)
+            line = f"{{ {command}; }} </dev/null 2>&1; printf '\\n%s %d\\n' \"{self._marker}\" $?\n"
+
+            try:
+                self.process.stdin.write(line.encode('utf-8'))
+                await self.process.stdin.drain()
+            except (BrokenPipeError, ConnectionResetError) as e:
+                await self.close()
+                raise ConnectionError(f"셸 세션 오류 ({self.device_ip}): {str(e)}")
+
+            try:
+                return await asyncio.wait_for(self._read_until_marker(), timeout=timeout)
+            except (asyncio.TimeoutError, ConnectionError) as e:
+                # 출력 순서가 어긋났을 수 있으므로 세션을 재사용하지 않음
+                await self.close()
+                message = str(e) or f"응답 시간 초과 ({timeout:g}초)"
+                self.logger.warning(f"셸 명령 실패 ({self.device_ip}): {message}")
+                return False, message
+
+    async def _read_until_marker(self) -> tuple[bool, str]:
+        """종료 표식이 나올 때까지 출력 읽기"""
+        output_lines = []
+
+        while True:
+            raw = await self.process.stdout.readline()
+            if not raw:
+                raise ConnectionError("셸 출력이 닫힘")
+
+            text = raw.decode('utf-8', errors='ignore').rstrip('\r\n')
+            if text.startswith(self._marker):
+                # 표식 앞에 출력한 개행 (명령 출력이 개행으로 끝났으면 빈 줄 하나가 추가됨)
+                if output_lines and output_lines[-1] == "":
+                    output_lines.pop()
+                exit_code = text[len(self._marker):].strip()
+                return exit_code == "0", "\n".join(output_lines)
+
+            output_lines.append(text)
+
+    async def close(self):
+        """셸 프로세스 종료"""
+        process = self.process
+        self.process = None
+
+        if process is None or process.returncode is not None:
+            return
+
+        try:
+            process.stdin.close()
+            await asyncio.wait_for(process.wait(), timeout=1.0)
+        except (asyncio.TimeoutError, OSError):
+            try:
+                process.kill()
+                await process.wait()
+            except ProcessLookupError:
+                pass
+        self.logger.info(f"셸 세션 종료: {self.device_ip}")
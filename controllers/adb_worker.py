@@ -0,0 +1,309 @@
+"""
+ADB 작업 프로세스
+서버 프로세스 대신 ADB 하위 프로세스 실행, 출력 디코딩, 지속 셸 세션, 배치 파일 실행을 담당
+
+표준 입력으로 요청을 한 줄씩(JSON) 받고, 표준 출력으로 이벤트를 한 줄씩 보냄
+- 요청: {"id": 1, "op": "run", ...} / 취소: {"id": 1, "op": "cancel"}
+- 이벤트: {"id": 1, "event": "progress" | "data" | "result" | "error", ...}
+  (id가 없는 {"event": "log"}는 작업 프로세스 로그, "size"가 있으면 그 크기의 바이너리가 바로 이어짐,
+   바이너리 결과에 "result"가 함께 있으면 바이너리를 설명하는 값)
+표준 입력이 닫히면 실행 중인 작업과 셸 세션을 정리하고 종료
+"""
+import asyncio
+import json
+import signal
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from controllers.adb_shell_session import ADBShellSession
+from utils.thumbnail import shrink_screencap
+
+WORKER_FLAG = "--adb-worker"   # 빌드된 exe를 작업 프로세스로 실행할 때의 인수
+PROGRESS_INTERVAL = 0.5        # 요청별 진행 이벤트 최소 간격 (초)
+STREAM_CHUNK = 64 * 1024
+SHELL_TIMEOUT = 10.0           # 셸 세션 명령 기본 응답 대기 (초)
+
+CREATIONFLAGS = subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0
+
+
+class WorkerLogger:
+    """셸 세션 등의 로그를 서버 로거로 전달"""
+
+    def __init__(self, worker: "ADBWorker"):
+        self.worker = worker
+
+    def _log(self, level: str, message: str):
+        self.worker.send({"event": "log", "level": level, "message": message})
+
+    def info(self, message: str):
+        self._log("info", message)
+
+    def warning(self, message: str):
+        self._log("warning", message)
+
+    def error(self, message: str):
+        self._log("error", message)
+
+
+class ADBWorker:
+    def __init__(self, output):
+        self.output = output
+        self.logger = WorkerLogger(self)
+        self.tasks: Dict[int, asyncio.Task] = {}
+        self.sessions: Dict[str, ADBShellSession] = {}
+        self._session_locks: Dict[str, asyncio.Lock] = {}  # 같은 디바이스 세션을 동시에 두 번 만들지 않도록
+        self.ops = {
+            "run": self.op_run,
+            "shell": self.op_shell,
+            "exec_out": self.op_exec_out,
+            "thumbnail": self.op_thumbnail,
+            "stream": self.op_stream,
+            "batch": self.op_batch,
+            "close_sessions": self.op_close_sessions,
+        }
+
+    def send(self, message: Dict[str, Any], data: bytes = None):
+        """이벤트 전송 (바이너리는 JSON 줄 뒤에 그대로 이어서 전송)"""
+        if data is not None:
+            message["size"] = len(data)
+        self.output.write(json.dumps(message, ensure_ascii=False).encode('utf-8') + b"\n")
+        if data is not None:
+            self.output.write(data)
+        self.output.flush()
+
+    async def serve(self):
+        """표준 입력이 닫힐 때까지 요청 처리"""
+        loop = asyncio.get_running_loop()
+        closed = asyncio.Event()
+
+        def read_requests():
+            # Windows에서는 표준 입력 파이프를 이벤트 루프에 연결할 수 없으므로 전용 스레드에서 읽음
+            for line in sys.stdin.buffer:
+                loop.call_soon_threadsafe(self._dispatch, line)
+            loop.call_soon_threadsafe(closed.set)
+
+        threading.Thread(target=read_requests, name="adb-worker-stdin", daemon=True).start()
+        await closed.wait()
+
+        for task in self.tasks.values():
+            task.cancel()
+        await asyncio.gather(*self.tasks.values(), return_exceptions=True)
+        await self.op_close_sessions(0, {})
+
+    def _dispatch(self, line: bytes):
+        try:
+            request = json.loads(line)
+        except ValueError:
+            self.logger.error(f"잘못된 요청: {line[:200]!r}")
+            return
+
+        request_id = request.get("id")
+        op = request.get("op")
+        if op == "cancel":
+            task = self.tasks.get(request_id)
+            if task is not None:
+                task.cancel()
+            return
+        if op not in self.ops:
+            self.send({"id": request_id, "event": "error", "error": f"알 수 없는 작업: {op}"})
+            return
+        self.tasks[request_id] = asyncio.ensure_future(self._handle(request_id, op, request))
+
+    async def _handle(self, request_id: int, op: str, request: Dict[str, Any]):
+        try:
+            result = await self.ops[op](request_id, request)
+            if isinstance(result, bytes):
+                self.send({"id": request_id, "event": "result"}, result)
+            elif isinstance(result, tuple):
+                meta, data = result
+                self.send({"id": request_id, "event": "result", "result": meta}, data)
+            else:
+                self.send({"id": request_id, "event": "result", "result": result})
+        except asyncio.CancelledError:
+            self.send({"id": request_id, "event": "error", "error": "취소됨"})
+        except asyncio.TimeoutError:
+            self.send({"id": request_id, "event": "error", "error": "시간 초과", "timeout": True})
+        except Exception as e:
+            self.send({"id": request_id, "event": "error", "error": str(e) or type(e).__name__})
+        finally:
+            self.tasks.pop(request_id, None)
+
+    @staticmethod
+    async def _kill(process: asyncio.subprocess.Process):
+        if process.returncode is None:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+            await process.wait()
+
+    async def _read_progress(self, request_id: int, stream: asyncio.StreamReader) -> bytes:
+        """출력을 모으면서 마지막 줄을 진행 이벤트로 전송 (PROGRESS_INTERVAL마다 최대 한 번)"""
+        chunks = []
+        last_sent = 0.0
+        while True:
+            line = await stream.readline()
+            if not line:
+                return b"".join(chunks)
+            chunks.append(line)
+            text = line.decode('utf-8', errors='ignore').strip()
+            if text and time.monotonic() - last_sent >= PROGRESS_INTERVAL:
+                last_sent = time.monotonic()
+                self.send({"id": request_id, "event": "progress", "line": text})
+
+    async def _run(self, request_id: int, args: List[str], timeout: float = None,
+                   progress: bool = False) -> Dict[str, Any]:
+        """명령 실행 (종료 코드 0이면 표준 출력, 아니면 표준 오류 반환)"""
+        process = await asyncio.create_subprocess_exec(
+            *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            creationflags=CREATIONFLAGS
+        )
+        try:
+            if progress:
+                stdout, stderr = await asyncio.wait_for(
+                    asyncio.gather(self._read_progress(request_id, process.stdout), process.stderr.read()),
+                    timeout=timeout
+                )
+                await process.wait()
+            else:
+                stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+        except BaseException:
+            await self._kill(process)
+            raise
+
+        if process.returncode == 0:
+            return {"success": True, "output": stdout.decode('utf-8', errors='ignore')}
+        return {"success": False, "output": stderr.decode('utf-8', errors='ignore')}
+
+    async def op_run(self, request_id: int, request: Dict[str, Any]) -> Dict[str, Any]:
+        """ADB 명령 실행 (args: 실행 파일 포함 전체 인수)"""
+        return await self._run(request_id, request["args"], request.get("timeout"), request.get("progress", False))
+
+    async def op_shell(self, request_id: int, request: Dict[str, Any]) -> Dict[str, Any]:
+        """지속 셸 세션에서 명령 실행
+
+        명령을 보내기 전에 세션이 끊어진 경우에만 한 번 다시 연결해 재시도하고, 그래도 실패하면 일회성 adb shell로 실행
+        (명령을 보낸 뒤의 시간 초과는 명령이 이미 실행됐을 수 있으므로 재시도하지 않고 실패 반환)
+        """
+        adb_path, device_ip, command = request["adb"], request["device"], request["command"]
+        timeout = request.get("timeout")  # 지정하지 않으면 세션은 기본 시간, 일회성 실행은 제한 없음
+        for _ in range(2):
+            session = None
+            try:
+                session = await self._get_session(adb_path, device_ip)
+                success, output = await session.execute(command, timeout or SHELL_TIMEOUT)
+                return {"success": success, "output": output}
+            except (ConnectionError, OSError) as e:
+                self.logger.warning(f"셸 세션 재연결 중: {str(e)}")
+                self.sessions.pop(device_ip, None)
+            except asyncio.CancelledError:
+                # 실행 중이던 명령의 출력이 다음 명령에 섞이지 않도록 세션을 버림
+                if session is not None and self.sessions.get(device_ip) is session:
+                    del self.sessions[device_ip]
+                    asyncio.ensure_future(session.close())
+                raise
+
+        return await self._run(request_id, [adb_path, "-s", device_ip, "shell", command], timeout)
+
+    async def _get_session(self, adb_path: str, device_ip: str) -> ADBShellSession:
+        """디바이스 셸 세션 반환 (없거나 종료됐거나 ADB 경로가 바뀐 경우 새로 시작)"""
+        async with self._session_locks.setdefault(device_ip, asyncio.Lock()):
+            session = self.sessions.get(device_ip)
+            if session is None or not session.alive or session.adb_path != adb_path:
+                if session is not None:
+                    await session.close()
+                session = ADBShellSession(adb_path, device_ip, self.logger)
+                await session.start()
+                self.sessions[device_ip] = session
+            return session
+
+    async def op_exec_out(self, request_id: int, request: Dict[str, Any]) -> bytes:
+        """바이너리 출력 명령 (screencap 등, 결과를 그대로 전송)"""
+        process = await asyncio.create_subprocess_exec(
+            *request["args"],
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            creationflags=CREATIONFLAGS
+        )
+        try:
+            stdout, _ = await asyncio.wait_for(process.communicate(), timeout=request.get("timeout"))
+        except BaseException:
+            await self._kill(process)
+            raise
+        return stdout
+
+    async def op_thumbnail(self, request_id: int, request: Dict[str, Any]) -> Optional[Tuple[Dict[str, Any], bytes]]:
+        """화면 캡처 후 축소해 썸네일 크기 RGB 배열만 전송 (수 MB 원본은 서버로 보내지 않음, 형식을 알 수 없으면 None)"""
+        raw = await self.op_exec_out(request_id, request)
+        # 축소/해시는 다른 요청 처리를 막지 않도록 실행기 스레드에서
+        shrunk = await asyncio.get_running_loop().run_in_executor(None, shrink_screencap, raw, request["width"])
+        if shrunk is None:
+            return None
+        pixels, digest = shrunk
+        return {"shape": list(pixels.shape), "digest": digest}, pixels.tobytes()
+
+    async def op_stream(self, request_id: int, request: Dict[str, Any]) -> Dict[str, Any]:
+        """출력을 계속 읽어 줄 단위로 묶어 전송 (logcat 등, 취소되면 프로세스 종료)"""
+        process = await asyncio.create_subprocess_exec(
+            *request["args"],
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            creationflags=CREATIONFLAGS
+        )
+        remainder = b""
+        try:
+            while True:
+                chunk = await process.stdout.read(STREAM_CHUNK)
+                if not chunk:
+                    break
+                *complete, remainder = (remainder + chunk).split(b"\n")
+                if complete:
+                    lines = [line.decode('utf-8', errors='replace').rstrip('\r') for line in complete]
+                    self.send({"id": request_id, "event": "data", "lines": lines})
+            await process.wait()
+        finally:
+            await self._kill(process)
+        return {"returncode": process.returncode}
+
+    async def op_batch(self, request_id: int, request: Dict[str, Any]) -> Dict[str, Any]:
+        """배치 파일 실행 (시간 초과 시 종료하지 않고 백그라운드에서 계속 실행)"""
+        process = await asyncio.create_subprocess_exec(
+            request["path"],
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            creationflags=CREATIONFLAGS
+        )
+        try:
+            await asyncio.wait_for(process.communicate(), timeout=request.get("timeout"))
+            return {"completed": True}
+        except asyncio.TimeoutError:
+            return {"completed": False}
+
+    async def op_close_sessions(self, request_id: int, request: Dict[str, Any]) -> Dict[str, Any]:
+        """셸 세션 종료 (devices를 지정하지 않으면 keep에 없는 전체)"""
+        devices: Optional[List[str]] = request.get("devices")
+        keep = set(request.get("keep") or [])
+        targets = [ip for ip in (self.sessions if devices is None else devices) if ip not in keep]
+        sessions = [self.sessions.pop(ip) for ip in targets if ip in self.sessions]
+        await asyncio.gather(*(session.close() for session in sessions), return_exceptions=True)
+        return {"closed": [session.device_ip for session in sessions]}
+
+
+def main() -> int:
+    """작업 프로세스 진입점 (표준 출력은 이벤트 전용, 그 외 출력은 표준 오류로)
+
+    Ctrl+C는 서버가 처리하고, 작업 프로세스는 서버가 표준 입력을 닫으면 종료
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    output = sys.stdout.buffer
+    sys.stdout = sys.stderr
+    asyncio.run(ADBWorker(output).serve())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,262 @@
+"""
+ADB 작업 프로세스 클라이언트
+작업 프로세스(controllers/adb_worker.py)를 실행/감시하고 요청 ID로 이벤트를 요청에 연결
+
+서버 이벤트 루프는 작업 프로세스와 연결된 파이프 하나만 읽으므로, 디바이스 수십 대의
+ADB 출력이 몰려도 시뮬레이터 명령 처리가 늦어지지 않음.
+작업 프로세스가 종료되면 진행 중인 요청을 실패 처리하고 잠시 후 다시 시작 (서버/시뮬레이터 연결은 유지)
+"""
+import asyncio
+import itertools
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+from utils.logger import Logger
+from controllers.adb_worker import WORKER_FLAG
+
+READ_LIMIT = 16 * 1024 * 1024   # 이벤트 한 줄 최대 크기 (큰 셸 출력 대비)
+RESTART_DELAY = 1.0             # 비정상 종료 후 재시작 대기 (초)
+CLOSE_TIMEOUT = 1.0             # 종료 요청 후 강제 종료까지 대기 (초)
+
+
+class ADBWorkerError(RuntimeError):
+    """작업 프로세스 요청 실패 (timeout: 작업 프로세스에서 시간 초과로 실패)"""
+
+    def __init__(self, message: str, timeout: bool = False):
+        super().__init__(message)
+        self.timeout = timeout
+
+
+class WorkerRequest:
+    """응답을 기다리는 요청 하나"""
+
+    def __init__(self, on_progress: Optional[Callable[[str], None]] = None, stream: bool = False):
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.on_progress = on_progress
+        self.queue: Optional[asyncio.Queue] = asyncio.Queue() if stream else None
+
+    def finish(self, result: Any = None, error: Exception = None):
+        if self.future.done():
+            return
+        if error is not None:
+            self.future.set_exception(error)
+        else:
+            self.future.set_result(result)
+        if self.queue is not None:
+            self.queue.put_nowait(None)
+
+
+def worker_command() -> List[str]:
+    """작업 프로세스 실행 명령 (빌드된 exe는 자기 자신을 작업 프로세스 인수로 실행)"""
+    if getattr(sys, 'frozen', False):
+        return [sys.executable, WORKER_FLAG]
+    return [sys.executable, "-m", "controllers.adb_worker"]
+
+
+class ADBWorkerClient:
+    def __init__(self, logger: Logger):
+        self.logger = logger
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self._pending: Dict[int, WorkerRequest] = {}
+        self._ids = itertools.count(1)
+        self._start_lock = asyncio.Lock()
+        self._reader: Optional[asyncio.Task] = None
+        self._closed = asyncio.Event()
+        self.started_at: Optional[float] = None
+        self.restarts = 0
+        self.completed = 0
+        self.failed = 0
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.returncode is None
+
+    async def _ensure_started(self):
+        """작업 프로세스가 없으면 시작"""
+        if self.alive:
+            return
+        async with self._start_lock:
+            if self.alive:
+                return
+            if self._closed.is_set():
+                raise ADBWorkerError("ADB 작업 프로세스가 종료됨")
+
+            env = dict(os.environ)
+            if not getattr(sys, 'frozen', False):
+                # 소스 실행 시 작업 디렉토리와 관계없이 controllers 패키지를 찾도록
+                root = str(Path(__file__).resolve().parent.parent)
+                env["PYTHONPATH"] = os.pathsep.join(filter(None, [root, env.get("PYTHONPATH")]))
+
+            self.process = await asyncio.create_subprocess_exec(
+                *worker_command(),
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                env=env,
+                limit=READ_LIMIT,
+                creationflags=subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0
+            )
+            self._pending = {}
+            self.started_at = time.time()
+            self._reader = asyncio.create_task(self._read_events(self.process, self._pending))
+            self.logger.info(f"ADB 작업 프로세스 시작 (PID {self.process.pid})")
+
+    async def _read_events(self, process: asyncio.subprocess.Process, pending: Dict[int, WorkerRequest]):
+        """작업 프로세스 이벤트 읽기 (종료되면 대기 중인 요청 실패 처리 후 재시작)"""
+        try:
+            while True:
+                line = await process.stdout.readline()
+                if not line:
+                    break
+                message = json.loads(line)
+                data = await process.stdout.readexactly(message["size"]) if "size" in message else None
+                self._dispatch(pending, message, data)
+        except (ValueError, asyncio.IncompleteReadError) as e:
+            # 이벤트 순서가 어긋났으므로 프로세스를 재사용하지 않음
+            self.logger.error(f"ADB 작업 프로세스 응답 오류: {str(e)}")
+            process.kill()
+
+        await process.wait()
+        error = ADBWorkerError(f"ADB 작업 프로세스 종료 (코드 {process.returncode})")
+        for request in pending.values():
+            request.finish(error=error)
+        pending.clear()
+
+        if self._closed.is_set() or process is not self.process:
+            return
+        self.restarts += 1
+        self.logger.warning(f"ADB 작업 프로세스가 종료되어 {RESTART_DELAY:.0f}초 후 다시 시작합니다 (코드 {process.returncode})")
+        try:
+            await asyncio.wait_for(self._closed.wait(), timeout=RESTART_DELAY)
+            return  # 대기 중에 종료 요청
+        except asyncio.TimeoutError:
+            pass
+        try:
+            await self._ensure_started()
+        except Exception as e:
+            self.logger.error(f"ADB 작업 프로세스 재시작 실패: {str(e)}")
+
+    def _dispatch(self, pending: Dict[int, WorkerRequest], message: Dict[str, Any], data: Optional[bytes]):
+        request_id = message.get("id")
+        event = message.get("event")
+
+        if request_id is None:
+            if event == "log":
+                self.logger.log(message.get("level", "info"), message.get("message", ""))
+            return
+
+        request = pending.get(request_id)
+        if request is None:
+            return  # 이미 취소된 요청
+        if event == "progress":
+            if request.on_progress is not None:
+                request.on_progress(message["line"])
+        elif event == "data":
+            request.queue.put_nowait(message["lines"])
+        elif event == "result":
+            pending.pop(request_id)
+            self.completed += 1
+            if data is None:
+                request.finish(message.get("result"))
+            elif "result" in message:
+                request.finish((message["result"], data))  # 설명 값과 바이너리
+            else:
+                request.finish(data)
+        elif event == "error":
+            pending.pop(request_id)
+            self.failed += 1
+            request.finish(error=ADBWorkerError(message.get("error", ""), message.get("timeout", False)))
+
+    async def _send(self, op: str, params: Dict[str, Any], on_progress: Callable[[str], None] = None,
+                    stream: bool = False) -> Tuple[int, WorkerRequest]:
+        """요청 전송 (요청 ID와 응답 대기 객체 반환)"""
+        await self._ensure_started()
+        request_id = next(self._ids)
+        request = WorkerRequest(on_progress, stream)
+        self._pending[request_id] = request
+
+        line = json.dumps({"id": request_id, "op": op, **params}, ensure_ascii=False).encode('utf-8') + b"\n"
+        try:
+            self.process.stdin.write(line)
+            await self.process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError) as e:
+            self._pending.pop(request_id, None)
+            raise ADBWorkerError(f"ADB 작업 프로세스에 요청을 보낼 수 없음: {str(e)}")
+        return request_id, request
+
+    def _cancel(self, request_id: int):
+        """요청 취소 (작업 프로세스에서 실행 중인 하위 프로세스도 종료)"""
+        request = self._pending.pop(request_id, None)
+        if request is not None:
+            request.future.cancel()
+        if self.alive:
+            try:
+                self.process.stdin.write(json.dumps({"id": request_id, "op": "cancel"}).encode('utf-8') + b"\n")
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+    async def request(self, op: str, params: Dict[str, Any] = None,
+                      on_progress: Callable[[str], None] = None) -> Any:
+        """요청 후 결과 반환 (on_progress: 진행 중 출력 줄을 받는 콜백)"""
+        request_id, request = await self._send(op, params or {}, on_progress)
+        try:
+            return await request.future
+        except asyncio.CancelledError:
+            self._cancel(request_id)
+            raise
+
+    async def stream(self, op: str, params: Dict[str, Any] = None) -> AsyncIterator[List[str]]:
+        """출력 줄 묶음을 받는 요청 (반복을 멈추면 작업 프로세스에서도 중지)"""
+        request_id, request = await self._send(op, params or {}, stream=True)
+        try:
+            while True:
+                lines = await request.queue.get()
+                if lines is None:
+                    break
+                yield lines
+            await request.future
+        finally:
+            if not request.future.done():
+                self._cancel(request_id)
+
+    async def restart(self):
+        """작업 프로세스 재시작 (진행 중인 요청은 실패 처리)"""
+        process, self.process = self.process, None
+        if process is not None and process.returncode is None:
+            process.kill()
+            await process.wait()
+        self.restarts += 1
+        await self._ensure_started()
+
+    async def close(self):
+        """작업 프로세스 종료 (표준 입력을 닫으면 셸 세션을 정리하고 종료)"""
+        self._closed.set()
+        process = self.process
+        if process is None:
+            return
+
+        if process.returncode is None:
+            process.stdin.close()
+            try:
+                await asyncio.wait_for(process.wait(), timeout=CLOSE_TIMEOUT)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+        if self._reader is not None:
+            await asyncio.gather(self._reader, return_exceptions=True)
+        self.logger.info("ADB 작업 프로세스 종료")
+
+    def status(self) -> Dict[str, Any]:
+        """작업 프로세스 상태 (PID, 가동 시간, 재시작/처리/실패 수, 대기 중인 요청 수)"""
+        return {
+            "running": self.alive,
+            "pid": self.process.pid if self.alive else None,
+            "uptime": round(time.time() - self.started_at, 1) if self.alive else 0.0,
+            "restarts": self.restarts,
+            "pending": len(self._pending),
+            "completed": self.completed,
+            "failed": self.failed,
+        }
@@ -0,0 +1,204 @@
+"""
+배치 작업 컨트롤러
+여러 APK/패키지 작업을 디바이스별 DAG로 구성하여 파이프라인 실행
+"""
+import asyncio
+import time
+from typing import List, Dict, Union, Any, Optional
+from utils.logger import Logger
+from controllers.adb_controller import ADBController
+
+
+# 지원하는 단계 종류와 필수 필드
+STEP_FIELDS: Dict[str, List[str]] = {
+    "install": ["apk_path"],
+    "uninstall": ["package_name"],
+    "push": ["local_path", "remote_path"],
+    "launch": ["package_name"],
+    "stop": ["package_name"],
+}
+
+# 네트워크 대역폭을 많이 사용하는 단계 (동시 실행 수 제한 대상)
+TRANSFER_ACTIONS = {"install", "push"}
+APP_STOPPING_ACTIONS = {"install", "uninstall", "stop"}  # 앱 감시에서 크래시로 보지 않는 단계
+
+
+class BatchController:
+    def __init__(self, logger: Logger, adb_ctrl: ADBController):
+        self.logger = logger
+        self.adb_ctrl = adb_ctrl
+
+    def build_graph(self, steps: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+        """단계 목록을 검증하고 의존성 그래프(단계 ID -> 선행 단계 ID 목록) 생성
+
+        "after"가 없으면 바로 앞 단계에 의존 (목록 순서대로 실행)
+        "after": [] 로 지정하면 다른 단계와 독립적으로 실행
+        각 단계에 "id"를 기록하므로 run()은 복사본을 넘김
+        """
+        if not steps:
+            raise ValueError("실행할 단계가 없습니다")
+
+        graph: Dict[str, List[str]] = {}
+        previous_id: Optional[str] = None
+
+        for index, step in enumerate(steps):
+            action = step.get("action")
+            if action not in STEP_FIELDS:
+                raise ValueError(f"알 수 없는 단계: {action}")
+
+            for field in STEP_FIELDS[action]:
+                if not step.get(field):
+                    raise ValueError(f"{action} 단계에 '{field}' 값이 필요합니다")
+
+            step_id = str(step.get("id", index))
+            if step_id in graph:
+                raise ValueError(f"중복된 단계 ID: {step_id}")
+            step["id"] = step_id
+
+            if "after" in step:
+                after = step["after"]
+                deps = [str(d) for d in (after if isinstance(after, list) else [after])]
+            else:
+                deps = [previous_id] if previous_id is not None else []
+
+            graph[step_id] = deps
+            previous_id = step_id
+
+        # 알 수 없는 선행 단계 확인
+        for step_id, deps in graph.items():
+            for dep in deps:
+                if dep not in graph:
+                    raise ValueError(f"단계 {step_id}의 선행 단계를 찾을 수 없습니다: {dep}")
+
+        # 순환 의존성 확인 (위상 정렬)
+        remaining = {step_id: set(deps) for step_id, deps in graph.items()}
+        while remaining:
+            ready = [step_id for step_id, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"순환 의존성이 있습니다: {', '.join(remaining)}")
+            for step_id in ready:
+                del remaining[step_id]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+        return graph
+
+    def _build_command(self, step: Dict[str, Any]) -> List[str]:
+        """단계를 ADB 명령으로 변환 (launch는 ADBController.launch_app_on으로 실행)"""
+        action = step["action"]
+
+        if action == "install":
+            return ["install", "-r", step["apk_path"]]
+        elif action == "uninstall":
+            return ["uninstall", step["package_name"]]
+        elif action == "push":
+            return ["push", step["local_path"], step["remote_path"]]
+        else:  # stop
+            return ["shell", "am", "force-stop", step["package_name"]]
+
+    async def _run_device(self, device_ip: str, steps: List[Dict[str, Any]],
+                          graph: Dict[str, List[str]], transfer_limit: asyncio.Semaphore,
+                          started_at: float) -> Dict[str, Any]:
+        """한 디바이스에서 DAG 실행 (선행 단계가 끝나는 즉시 다음 단계 시작)"""
+        done: Dict[str, asyncio.Future] = {
+            step["id"]: asyncio.get_running_loop().create_future() for step in steps
+        }
+        results: Dict[str, Dict[str, Any]] = {}
+
+        async def run_step(step: Dict[str, Any]):
+            step_id = step["id"]
+            success = False
+            try:
+                dep_ok = [await done[dep] for dep in graph[step_id]]
+
+                if not all(dep_ok):
+                    results[step_id] = {"action": step["action"], "status": "skipped"}
+                    return
+
+                if step["action"] in APP_STOPPING_ACTIONS:
+                    self.adb_ctrl.expected_down.add(device_ip)
+                start = time.perf_counter()
+                timing = None
+                if step["action"] == "launch":
+                    # 다른 실행 경로와 같이 am start -W로 시작 시간을 측정/기록 (expected_down도 해제)
+                    timing, output = await self.adb_ctrl.launch_app_on(step["package_name"], device_ip)
+                    success = timing is not None
+                elif step["action"] in TRANSFER_ACTIONS:
+                    async with transfer_limit:
+                        success, output = await self.adb_ctrl.run_adb_command(self._build_command(step), device_ip)
+                else:
+                    success, output = await self.adb_ctrl.run_adb_command(self._build_command(step), device_ip)
+                end = time.perf_counter()
+
+                results[step_id] = {
+                    "action": step["action"],
+                    "status": "success" if success else "failed",
+                    "start": round(start - started_at, 3),
+                    "duration": round(end - start, 3),
+                }
+                if timing is not None:
+                    results[step_id]["launch"] = timing
+                if not success:
+                    results[step_id]["error"] = output.strip()
+            except Exception as e:
+                results[step_id] = {"action": step["action"], "status": "failed", "error": str(e)}
+            finally:
+                # 예외로 끝나도 이 단계를 기다리는 후속 단계가 바로 건너뛰도록 항상 완료 처리
+                if not done[step_id].done():
+                    done[step_id].set_result(success)
+
+        await asyncio.gather(*(run_step(step) for step in steps))
+
+        finished = time.perf_counter() - started_at
+        success_count = sum(1 for r in results.values() if r["status"] == "success")
+        return {
+            "success": success_count == len(steps),
+            "completed_at": round(finished, 3),
+            "steps": [dict(results[step["id"]], id=step["id"]) for step in steps],
+        }
+
+    async def run(self, steps: List[Dict[str, Any]], devices: Union[str, List[str]] = "all",
+                  max_transfers: int = 4) -> Dict[str, Any]:
+        """배치 작업 실행
+
+        디바이스 간에는 대기 없이 파이프라인으로 진행되며,
+        설치/푸시 단계만 max_transfers 개수로 동시 실행을 제한
+        """
+        # build_graph가 단계 ID를 기록하므로 호출자의 단계 목록은 건드리지 않도록 복사
+        steps = [dict(step) for step in steps]
+        graph = self.build_graph(steps)
+        target_devices = self.adb_ctrl.resolve_devices(devices)
+
+        if not target_devices:
+            self.logger.warning("대상 디바이스가 없습니다")
+            return {"success": False, "makespan": 0.0, "devices": {}}
+
+        self.logger.info(f"배치 작업 시작: {len(steps)}단계 -> {len(target_devices)}개 디바이스")
+
+        transfer_limit = asyncio.Semaphore(max(1, int(max_transfers)))
+        started_at = time.perf_counter()
+
+        reports = await asyncio.gather(
+            *(self._run_device(ip, steps, graph, transfer_limit, started_at) for ip in target_devices),
+            return_exceptions=True
+        )
+
+        makespan = time.perf_counter() - started_at
+
+        device_results: Dict[str, Any] = {}
+        for device_ip, report in zip(target_devices, reports):
+            if isinstance(report, Exception):
+                device_results[device_ip] = {"success": False, "error": str(report), "steps": []}
+            else:
+                device_results[device_ip] = report
+
+        success_count = sum(1 for r in device_results.values() if r["success"])
+        self.logger.info(
+            f"배치 작업 완료: {success_count}/{len(target_devices)} 디바이스 성공 (총 {makespan:.1f}초)"
+        )
+
+        return {
+            "success": success_count > 0,
+            "makespan": round(makespan, 3),
+            "devices": device_results,
+        }
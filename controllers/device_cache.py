@@ -0,0 +1,97 @@
+"""
+디바이스 캐시
+한 번이라도 연결된 헤드셋의 정보(시리얼, 마지막 IP, 모델, 앱 버전, 마지막 확인 시각)를 디스크에 저장하여
+재시작 직후 바로 재연결하고 화면에 표시
+"""
+import asyncio
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from utils.logger import Logger
+
+CACHE_VERSION = 1
+
+
+class DeviceCache:
+    def __init__(self, path: Path, logger: Logger):
+        self.path = path
+        self.logger = logger
+        self.entries: Dict[str, Dict[str, Any]] = {}  # 디바이스 ID(IP:포트 또는 USB 시리얼) -> 정보
+
+    def load(self, max_age_days: float):
+        """캐시 파일 읽기 (오래된 항목은 제외)"""
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"디바이스 캐시를 읽을 수 없습니다: {str(e)}")
+            return
+
+        if data.get("version") != CACHE_VERSION:
+            return
+        self.entries = {entry["ip"]: entry for entry in data.get("devices", []) if entry.get("ip")}
+        self.prune(max_age_days)
+
+    def prune(self, max_age_days: float) -> int:
+        """max_age_days 동안 확인되지 않은 항목 제거 (제거한 수 반환)"""
+        cutoff = time.time() - max_age_days * 86400
+        expired = [ip for ip, entry in self.entries.items() if entry.get("last_seen", 0) < cutoff]
+        for ip in expired:
+            del self.entries[ip]
+        return len(expired)
+
+    def known_ips(self) -> List[str]:
+        """최근 확인된 순서의 디바이스 ID"""
+        ordered = sorted(self.entries.values(), key=lambda e: e.get("last_seen", 0), reverse=True)
+        return [entry["ip"] for entry in ordered]
+
+    def get(self, ip: str) -> Optional[Dict[str, Any]]:
+        return self.entries.get(ip)
+
+    def seen(self, ip: str):
+        """스캔에서 온라인으로 확인됨"""
+        entry = self.entries.setdefault(ip, {"ip": ip, "serial": None, "model": None, "app_version": None})
+        entry["last_seen"] = time.time()
+
+    def update_identity(self, ip: str, serial: str, model: str, app_version: Optional[str]):
+        """디바이스 정보 갱신 (같은 시리얼이 다른 IP로 저장되어 있으면 이전 항목 제거)"""
+        for other_ip, entry in list(self.entries.items()):
+            if other_ip != ip and serial and entry.get("serial") == serial:
+                del self.entries[other_ip]
+
+        entry = self.entries.setdefault(ip, {"ip": ip, "last_seen": time.time()})
+        entry.update({
+            "serial": serial or None,
+            "model": model or None,
+            "app_version": app_version,
+            "validated_at": time.time(),
+        })
+
+    def _write(self, text: str):
+        """캐시 파일 원자적 저장"""
+        fd, tmp_path = tempfile.mkstemp(dir=str(self.path.parent), prefix=".device-cache-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    async def save(self):
+        """캐시 파일 저장 (파일 쓰기는 실행기 스레드에서)"""
+        text = json.dumps({
+            "version": CACHE_VERSION,
+            "devices": sorted(self.entries.values(), key=lambda e: e["ip"]),
+        }, ensure_ascii=False, indent=2)
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, self._write, text)
+        except OSError as e:
+            self.logger.warning(f"디바이스 캐시 저장 실패: {str(e)}")
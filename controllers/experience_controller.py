@@ -5,12 +5,19 @@
 import asyncio
 import socket
 import json
-from typing import Literal
+import random
+import time
+from typing import Callable, Dict, List, Literal, Optional, Tuple
 from utils.logger import Logger
+from utils.command_lanes import command_lanes
+from utils.launch_timing import launch_timings
 from controllers.simulator_controller import SimulatorController
-from config import UNITY_SERVER_PORT, DEFAULT_PICO_IPS, TEST_MODE
+from config import settings, Settings, TEST_MODE
 
 ControlMode = Literal["auto", "manual"]
+TimelineListener = Callable[[float, str], None]
+
+SCENE_RESET_TIMEOUT = 10.0  # 장면 초기화 후 준비 완료 응답 대기 (초)
 
 
 class ExperienceController:
@@ -19,15 +26,56 @@ class ExperienceController:
         self.simulator_ctrl = simulator_ctrl
         self.mode: ControlMode = "auto"
         self.unity_server = None
-        self.devices = DEFAULT_PICO_IPS.copy()
+        self.devices = settings.current.default_pico_ips
+        self.active_devices: Optional[List[str]] = None  # 현재 체험 중인 디바이스 (None이면 전체)
+        self.timeline: List[Tuple[float, str]] = []  # 현재 체험의 (시각, 이벤트) - PLAY부터 시작
+        self.running = False
+        self._finished = asyncio.Event()
+        self._listeners: List[TimelineListener] = []
+        settings.subscribe(self._on_settings_changed)
+    
+    def _on_settings_changed(self, old: Settings, new: Settings):
+        """설정 변경 반영 (기본 피코 IP 리스트)"""
+        if old.default_pico_ips != new.default_pico_ips:
+            self.devices = new.default_pico_ips
+            self.logger.info(f"디바이스 목록 변경: {len(self.devices)}개")
+    
+    def mark(self, event: str):
+        """체험 타임라인에 이벤트 기록 (PLAY, PAUSE, RESUME, ELEVATOR_UP, FALL, STOP 등)"""
+        now = time.time()
+        self.timeline.append((now, event))
+        for listener in list(self._listeners):
+            try:
+                listener(now, event)
+            except Exception as e:
+                self.logger.error(f"타임라인 알림 오류: {str(e)}")
+    
+    def subscribe(self, listener: TimelineListener) -> TimelineListener:
+        """타임라인 이벤트 구독 (체험 시작/종료에 맞춰 기록하는 컨트롤러용)"""
+        self._listeners.append(listener)
+        return listener
+    
+    def unsubscribe(self, listener: TimelineListener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
     
     def set_mode(self, mode: ControlMode):
         """제어 모드 설정"""
         self.mode = mode
         self.logger.info(f"제어 모드 변경: {mode}")
     
-    async def send_to_devices(self, command: str, data: dict = None) -> bool:
-        """모든 피코 디바이스에 명령 전송"""
+    async def wait_finished(self, timeout: Optional[float] = None) -> bool:
+        """체험이 종료될 때까지 대기 (시간 안에 종료되면 True)"""
+        try:
+            await asyncio.wait_for(self._finished.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+    
+    async def send_to_devices(self, command: str, data: dict = None, devices: List[str] = None) -> bool:
+        """피코 디바이스에 명령 전송 (devices를 지정하지 않으면 현재 체험 중인 디바이스)"""
+        if devices is None:
+            devices = self.devices if self.active_devices is None else self.active_devices
         try:
             message = {
                 "command": command,
@@ -35,19 +83,19 @@ class ExperienceController:
             }
             
             if TEST_MODE:
-                self.logger.info(f"[테스트] 디바이스 명령 전송: {command} -> {len(self.devices)}개 디바이스")
+                self.logger.info(f"[테스트] 디바이스 명령 전송: {command} -> {len(devices)}개 디바이스")
                 return True
             
             # 실제 구현: 각 디바이스로 TCP 연결하여 메시지 전송
             tasks = []
-            for device_ip in self.devices:
+            for device_ip in devices:
                 task = self._send_to_device(device_ip, message)
                 tasks.append(task)
             
             results = await asyncio.gather(*tasks, return_exceptions=True)
             
             success_count = sum(1 for r in results if r is True)
-            self.logger.info(f"{success_count}/{len(self.devices)} 디바이스에 명령 전송 완료")
+            self.logger.info(f"{success_count}/{len(devices)} 디바이스에 명령 전송 완료")
             
             return success_count > 0
             
@@ -61,14 +109,11 @@ class ExperienceController:
             sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             sock.settimeout(3)
             
-            await asyncio.get_event_loop().run_in_executor(
-                None, sock.connect, (device_ip, UNITY_SERVER_PORT)
-            )
+            # 헤드셋 전송 레인 (시뮬레이터 안전 명령이 실행 중이면 투입 대기)
+            await command_lanes.run("devices", sock.connect, (device_ip, settings.current.unity_server_port))
             
             message_str = json.dumps(message) + "\n"
-            await asyncio.get_event_loop().run_in_executor(
-                None, sock.sendall, message_str.encode('utf-8')
-            )
+            await command_lanes.run("devices", sock.sendall, message_str.encode('utf-8'))
             
             sock.close()
             return True
@@ -77,9 +122,63 @@ class ExperienceController:
             self.logger.warning(f"디바이스 {device_ip} 전송 실패: {str(e)}")
             return False
     
-    async def start(self) -> bool:
-        """체험 시작"""
+    async def reset_scene(self, devices: List[str]) -> Dict[str, Optional[float]]:
+        """웜 대기 리셋 - 앱을 종료하지 않고 장면만 처음 상태로 초기화
+
+        헤드셋 채널로 RESET_SCENE을 보내고, 앱이 초기화를 마친 뒤 같은 연결로 보내는
+        {"status": "READY"} 응답까지의 시간(ms)을 디바이스별로 반환 (응답이 없으면 None)
+        """
+        self.logger.info(f"장면 초기화 중: {len(devices)}개 디바이스")
+        results = await asyncio.gather(*(self._reset_device_scene(ip) for ip in devices))
+        return dict(zip(devices, results))
+    
+    async def _reset_device_scene(self, device_ip: str) -> Optional[float]:
+        if TEST_MODE:
+            elapsed = random.uniform(0.2, 0.6)
+            await asyncio.sleep(elapsed)
+            return launch_timings.record(device_ip, "warm", elapsed * 1000)["total_ms"]
+        
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.settimeout(3)
+        try:
+            await command_lanes.run("devices", sock.connect, (device_ip, settings.current.unity_server_port))
+            message = json.dumps({"command": "RESET_SCENE", "data": {}}) + "\n"
+            started = time.perf_counter()
+            await command_lanes.run("devices", sock.sendall, message.encode('utf-8'))
+            
+            # 응답 대기는 레인 스레드를 점유하지 않도록 이벤트 루프에서
+            sock.setblocking(False)
+            reply = await asyncio.wait_for(self._read_line(sock), SCENE_RESET_TIMEOUT)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            if json.loads(reply).get("status") != "READY":
+                self.logger.warning(f"디바이스 {device_ip} 장면 초기화 실패: {reply[:200]}")
+                return None
+            return launch_timings.record(device_ip, "warm", elapsed_ms)["total_ms"]
+        except (OSError, ValueError, asyncio.TimeoutError) as e:
+            self.logger.warning(f"디바이스 {device_ip} 장면 초기화 응답 없음: {str(e) or type(e).__name__}")
+            return None
+        finally:
+            sock.close()
+    
+    @staticmethod
+    async def _read_line(sock: socket.socket) -> str:
+        loop = asyncio.get_running_loop()
+        data = b""
+        while b"\n" not in data:
+            chunk = await loop.sock_recv(sock, 1024)
+            if not chunk:
+                raise ConnectionError("응답 전에 연결 종료")
+            data += chunk
+        return data.split(b"\n", 1)[0].decode('utf-8', errors='replace')
+    
+    async def start(self, devices: List[str] = None) -> bool:
+        """체험 시작 (devices: 체험할 헤드셋, 지정하지 않으면 전체)"""
         self.logger.info("체험 시작 신호 전송 중...")
+        self.active_devices = devices
+        self.timeline = []
+        self.mark("PLAY")
+        self.running = True
+        self._finished.clear()
         
         # 모든 디바이스에 PLAY 신호 전송
         success = await self.send_to_devices("PLAY")
@@ -94,17 +193,22 @@ class ExperienceController:
     async def pause(self) -> bool:
         """체험 일시정지"""
         self.logger.info("체험 일시정지 신호 전송 중...")
+        self.mark("PAUSE")
         return await self.send_to_devices("PAUSE")
     
     async def resume(self) -> bool:
         """체험 재개"""
         self.logger.info("체험 재개 신호 전송 중...")
+        self.mark("RESUME")
         return await self.send_to_devices("RESUME")
     
     async def stop(self) -> bool:
         """체험 종료"""
         self.logger.info("체험 종료 신호 전송 중...")
+        self.mark("STOP")
         success = await self.send_to_devices("STOP")
+        self.running = False
+        self._finished.set()
         
         # 시뮬레이터도 리셋
         if self.simulator_ctrl.connected:
@@ -118,6 +222,7 @@ class ExperienceController:
             return
         
         self.logger.info(f"Unity 신호 수신: {signal}")
+        self.mark(signal)
         
         # 시뮬레이터로 신호 전달
         if signal == "ELEVATOR_UP":
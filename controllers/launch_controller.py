@@ -0,0 +1,64 @@
+"""
+앱 대기 컨트롤러
+세션 사이에 헤드셋 앱을 다음 체험 시작 상태로 준비
+
+- cold: 앱 강제 종료 후 재실행 (am start -W로 시작 시간 측정)
+- warm: 앱을 종료하지 않고 헤드셋 채널로 장면만 초기화 (Unity 콜드 시작 생략)
+  응답하지 않는 헤드셋(앱이 실행 중이 아니거나 이전 버전 앱)만 cold로 준비
+"""
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from utils.logger import Logger
+from utils.launch_timing import launch_timings
+from controllers.adb_controller import ADBController
+from controllers.experience_controller import ExperienceController
+from config import settings, STANDBY_MODES
+
+
+class LaunchController:
+    def __init__(self, logger: Logger, adb_ctrl: ADBController, experience_ctrl: ExperienceController,
+                 notify: Callable[[Dict[str, Any]], Awaitable[None]]):
+        self.logger = logger
+        self.adb_ctrl = adb_ctrl
+        self.experience_ctrl = experience_ctrl
+        self.notify = notify
+
+    async def prepare(self, devices: List[str], mode: Optional[str] = None,
+                      package: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """헤드셋 앱 준비 후 디바이스별 결과 반환 ({"kind": cold/warm, "total_ms": ..., 실패하면 "success": False})
+
+        mode, package를 지정하지 않으면 설정 값(standby_mode, package_name) 사용
+        """
+        mode = mode or settings.current.standby_mode
+        if mode not in STANDBY_MODES:
+            raise ValueError(f"알 수 없는 대기 모드: {mode}")
+        package = package or settings.current.package_name
+        results: Dict[str, Dict[str, Any]] = {}
+
+        cold_targets = list(devices)
+        if mode == "warm" and devices:
+            reset = await self.experience_ctrl.reset_scene(devices)
+            for device_ip, elapsed_ms in reset.items():
+                if elapsed_ms is not None:
+                    results[device_ip] = {"success": True, "kind": "warm", "total_ms": elapsed_ms}
+            cold_targets = [ip for ip in devices if reset.get(ip) is None]
+            if cold_targets:
+                self.logger.info(f"장면 초기화에 응답하지 않은 {len(cold_targets)}개 디바이스는 앱 재실행")
+
+        if cold_targets:
+            await self.adb_ctrl.stop_app(package, cold_targets)
+            timings = await self.adb_ctrl.launch_app_timed(package, cold_targets)
+            for device_ip in cold_targets:
+                timing = timings.get(device_ip)
+                results[device_ip] = {
+                    "success": timing is not None,
+                    "kind": "cold",
+                    "total_ms": timing["total_ms"] if timing else None,
+                    "wait_ms": timing["wait_ms"] if timing else None,
+                }
+
+        await self.notify_timings()
+        return results
+
+    async def notify_timings(self):
+        """콜드/웜 시작 시간 요약을 대시보드에 전송"""
+        await self.notify({"type": "launch_timings", "summary": launch_timings.report()["summary"]})
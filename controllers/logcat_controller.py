@@ -0,0 +1,203 @@
+"""
+로그캣 컨트롤러
+디바이스별 logcat 스트림을 유지하며 태그/우선순위 필터는 디바이스에서 적용하고,
+한 줄씩 파싱해 디바이스별 링 버퍼에 보관한 뒤 구독 중인 대시보드에 묶어서 전송
+"""
+import asyncio
+import re
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Union
+from utils.logger import Logger
+from utils.pubsub import PubSubHub
+from controllers.adb_controller import ADBController
+from config import TEST_MODE
+
+PRIORITIES = "VDIWEF"
+TAG_PATTERN = re.compile(r'^[\w.\-]+$')
+
+# logcat -v threadtime: "MM-DD HH:MM:SS.mmm  PID  TID P TAG     : 메시지"
+LINE_PATTERN = re.compile(
+    r'^(\d\d-\d\d \d\d:\d\d:\d\d\.\d+)\s+(\d+)\s+(\d+)\s+([VDIWEF])\s+(.*?)\s*: (.*)$'
+)
+
+BUFFER_LINES = 2000         # 디바이스별 링 버퍼 크기
+FLUSH_INTERVAL = 0.2        # 대시보드 전송 주기 (초)
+MAX_LINES_PER_FLUSH = 200   # 주기당 디바이스별 최대 전송 줄 수 (초과분은 버퍼에만 보관)
+RESTART_DELAY = 3.0         # 스트림이 끊어졌을 때 재시작 대기 (초)
+
+
+def build_filter_specs(filters: List[str] = None, priority: str = "I") -> List[str]:
+    """logcat 필터 인수 생성 (디바이스에서 필터링)
+
+    filters: ["Unity:W", "ActivityManager"] 형식 (우선순위 생략 시 priority 사용)
+    태그를 지정하면 나머지 태그는 모두 제외(*:S), 지정하지 않으면 전체 태그에 priority 적용
+    """
+    priority = (priority or "I").upper()
+    if priority not in PRIORITIES:
+        raise ValueError(f"잘못된 로그 우선순위: {priority}")
+
+    if not filters:
+        return [f"*:{priority}"]
+
+    specs = []
+    for item in filters:
+        tag, _, tag_priority = item.partition(":")
+        tag_priority = (tag_priority or priority).upper()
+        if not TAG_PATTERN.match(tag) or tag_priority not in PRIORITIES:
+            raise ValueError(f"잘못된 로그캣 필터: {item}")
+        specs.append(f"{tag}:{tag_priority}")
+    return specs + ["*:S"]
+
+
+class LogcatStream:
+    """디바이스 하나의 logcat 스트림 상태"""
+
+    def __init__(self, device_ip: str, specs: List[str]):
+        self.device_ip = device_ip
+        self.specs = specs
+        self.buffer: Deque[Dict[str, Any]] = deque(maxlen=BUFFER_LINES)
+        self.pending: List[Dict[str, Any]] = []
+        self.dropped = 0
+        self.total = 0
+        self.connected = False
+        self.task: Optional[asyncio.Task] = None
+
+
+class LogcatController:
+    def __init__(self, logger: Logger, adb_ctrl: ADBController, hub: PubSubHub):
+        self.logger = logger
+        self.adb_ctrl = adb_ctrl
+        self.hub = hub
+        self.streams: Dict[str, LogcatStream] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def _read_lines(self, stream: LogcatStream) -> AsyncIterator[str]:
+        """logcat 출력 한 줄씩 (-T 1: 시작 전에 쌓인 로그는 건너뜀)"""
+        if TEST_MODE:
+            async for line in self._fake_lines():
+                yield line
+            return
+
+        lines = self.adb_ctrl.stream_lines(
+            ["logcat", "-v", "threadtime", "-T", "1", *stream.specs], stream.device_ip
+        )
+        try:
+            async for batch in lines:
+                for line in batch:
+                    yield line
+        finally:
+            await lines.aclose()
+
+    async def _fake_lines(self) -> AsyncIterator[str]:
+        """테스트 모드용 가상 로그"""
+        count = 0
+        while True:
+            await asyncio.sleep(0.5)
+            count += 1
+            stamp = time.strftime("%m-%d %H:%M:%S") + ".000"
+            yield f"{stamp}  1234  1250 I Unity   : [테스트] frame {count}"
+
+    @staticmethod
+    async def _parse(lines: AsyncIterator[str]) -> AsyncIterator[Dict[str, Any]]:
+        """logcat 줄 파싱 (구분선 등 형식이 다른 줄은 건너뜀)"""
+        async for line in lines:
+            match = LINE_PATTERN.match(line)
+            if match is None:
+                continue
+            timestamp, pid, _, level, tag, message = match.groups()
+            yield {"time": timestamp, "pid": int(pid), "level": level, "tag": tag, "message": message}
+
+    async def _run(self, stream: LogcatStream):
+        """스트림 유지 (끊어지면 잠시 후 다시 연결)"""
+        while True:
+            try:
+                stream.connected = True
+                async for entry in self._parse(self._read_lines(stream)):
+                    stream.total += 1
+                    stream.buffer.append(entry)
+                    if len(stream.pending) < MAX_LINES_PER_FLUSH:
+                        stream.pending.append(entry)
+                    else:
+                        stream.dropped += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.warning(f"로그캣 스트림 오류 ({stream.device_ip}): {str(e)}")
+            finally:
+                stream.connected = False
+
+            await asyncio.sleep(RESTART_DELAY)
+
+    async def _flush_loop(self):
+        """구독 중인 대시보드에 디바이스별로 모아서 전송"""
+        while self.streams:
+            await asyncio.sleep(FLUSH_INTERVAL)
+            has_subscribers = self.hub.subscriber_count("logcat") > 0
+
+            for stream in list(self.streams.values()):
+                if not stream.pending:
+                    continue
+                lines, stream.pending = stream.pending, []
+                dropped, stream.dropped = stream.dropped, 0
+                if has_subscribers:
+                    await self.hub.publish({
+                        "type": "logcat",
+                        "device": stream.device_ip,
+                        "lines": lines,
+                        "dropped": dropped,
+                    }, "logcat")
+        self._flush_task = None
+
+    def start(self, devices: List[str], filters: List[str] = None, priority: str = "I") -> List[str]:
+        """디바이스별 logcat 스트림 시작 (이미 실행 중이면 새 필터로 다시 시작)"""
+        specs = build_filter_specs(filters, priority)
+        started = []
+
+        for device_ip in devices:
+            previous = self.streams.get(device_ip)
+            if previous is not None and previous.task is not None:
+                previous.task.cancel()
+
+            stream = LogcatStream(device_ip, specs)
+            if previous is not None:
+                stream.buffer = previous.buffer
+            stream.task = asyncio.create_task(self._run(stream))
+            self.streams[device_ip] = stream
+            started.append(device_ip)
+
+        if started:
+            self.logger.info(f"로그캣 시작: {len(started)}개 디바이스 ({' '.join(specs)})")
+        if self.streams and self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+        return started
+
+    async def stop(self, devices: Union[str, List[str]] = "all") -> List[str]:
+        """logcat 스트림 중지 (링 버퍼도 삭제)"""
+        targets = list(self.streams) if devices == "all" else devices
+        stopped = [self.streams.pop(ip) for ip in targets if ip in self.streams]
+        for stream in stopped:
+            stream.task.cancel()
+        await asyncio.gather(*(stream.task for stream in stopped), return_exceptions=True)
+
+        if stopped:
+            self.logger.info(f"로그캣 중지: {len(stopped)}개 디바이스")
+        return [stream.device_ip for stream in stopped]
+
+    def recent(self, device_ip: str, limit: int = 200) -> List[Dict[str, Any]]:
+        """링 버퍼의 최근 로그"""
+        stream = self.streams.get(device_ip)
+        if stream is None:
+            return []
+        lines = list(stream.buffer)
+        return lines[-limit:] if limit > 0 else lines
+
+    def status(self) -> List[Dict[str, Any]]:
+        """실행 중인 스트림 목록"""
+        return [{
+            "device": stream.device_ip,
+            "filters": stream.specs,
+            "connected": stream.connected,
+            "buffered": len(stream.buffer),
+            "total": stream.total,
+        } for stream in self.streams.values()]
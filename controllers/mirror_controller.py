@@ -0,0 +1,142 @@
+"""
+화면 미러링 컨트롤러
+헤드셋 화면을 주기적으로 캡처(adb exec-out screencap)해 썸네일로 만들어 대시보드에 전송
+
+- 원본은 ADB 작업 프로세스에서 표준 출력으로 받아 간격 샘플링으로 축소하고, 서버에는 썸네일 크기 배열만 전달
+- 이전 썸네일과 같으면 인코딩/전송 생략
+- PNG 인코딩은 전용 스레드 풀에서 실행 (zlib 압축은 GIL을 놓으므로 이벤트 루프를 막지 않음)
+- mirror 토픽 구독자가 없으면 캡처하지 않고, 클라이언트별 전송 한도는 PubSubHub에서 적용
+"""
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, Union
+import numpy as np
+from utils.logger import Logger
+from utils.pubsub import PubSubHub
+from utils.thumbnail import downscale, frame_digest, encode_thumbnail
+from controllers.adb_controller import ADBController
+from config import TEST_MODE
+
+THUMBNAIL_WIDTH = 320
+MAX_CONCURRENT_CAPTURES = 4   # 동시에 진행하는 캡처 수 (헤드셋 20대를 봐도 adb/네트워크 부하 제한)
+REPEAT_INTERVAL = 10.0        # 화면이 그대로여도 이 시간마다 마지막 썸네일을 다시 전송 (새로 구독한 클라이언트용)
+
+
+class MirrorController:
+    def __init__(self, logger: Logger, adb_ctrl: ADBController, hub: PubSubHub):
+        self.logger = logger
+        self.adb_ctrl = adb_ctrl
+        self.hub = hub
+        self.tasks: Dict[str, asyncio.Task] = {}
+        self.stats: Dict[str, Dict[str, Any]] = {}
+        self._digests: Dict[str, str] = {}
+        self._latest: Dict[str, Dict[str, Any]] = {}  # 디바이스별 마지막 썸네일 메시지
+        self._capture_slots = asyncio.Semaphore(MAX_CONCURRENT_CAPTURES)
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        """인코딩 스레드 풀 (처음 사용할 때 생성, 기본 실행기의 파일/설정 작업과 섞이지 않도록 분리)"""
+        if self._pool is None:
+            workers = max(1, min(4, (os.cpu_count() or 2) - 1))
+            self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mirror-encode")
+        return self._pool
+
+    async def _capture(self, device_ip: str) -> Optional[Tuple[np.ndarray, str]]:
+        """화면 캡처 후 축소 (썸네일 RGB 배열, 변경 확인용 해시, 원본은 이벤트 루프에서 다루지 않음)"""
+        if TEST_MODE:
+            return await asyncio.get_running_loop().run_in_executor(self._get_pool(), self._fake_thumbnail, device_ip)
+        return await self.adb_ctrl.screencap_thumbnail(device_ip, THUMBNAIL_WIDTH)
+
+    @staticmethod
+    def _fake_thumbnail(device_ip: str) -> Tuple[np.ndarray, str]:
+        """테스트 모드용 가상 화면 (2초마다 바뀌는 그라데이션)"""
+        phase = int(time.time() / 2) % 8
+        shade = (sum(map(ord, device_ip)) * 37 + phase * 32) % 256
+        frame = np.zeros((720, 1440, 4), dtype=np.uint8)
+        frame[:, :, 0] = np.linspace(0, 255, 1440, dtype=np.uint8)
+        frame[:, :, 1] = shade
+        frame[:, :, 2] = np.linspace(255, 0, 720, dtype=np.uint8)[:, None]
+        pixels = downscale(frame, THUMBNAIL_WIDTH)
+        return pixels, frame_digest(pixels)
+
+    async def _mirror_device(self, device_ip: str, interval: float):
+        """디바이스 하나의 캡처 루프"""
+        stats = self.stats[device_ip]
+        loop = asyncio.get_running_loop()
+
+        while True:
+            started = time.perf_counter()
+            try:
+                if self.hub.subscriber_count("mirror") > 0:
+                    async with self._capture_slots:
+                        thumbnail = await self._capture(device_ip)
+                    if thumbnail is None:
+                        stats["errors"] += 1
+                    else:
+                        pixels, digest = thumbnail
+                        latest = self._latest.get(device_ip)
+                        if digest == self._digests.get(device_ip) and latest is not None:
+                            stats["skipped"] += 1
+                            if time.time() - latest["time"] >= REPEAT_INTERVAL:
+                                latest["time"] = time.time()
+                                await self.hub.publish(latest, "mirror")
+                        else:
+                            self._digests[device_ip] = digest
+                            image, width, height = await loop.run_in_executor(self._get_pool(), encode_thumbnail, pixels)
+                            stats["sent"] += 1
+                            stats["bytes"] += len(image)
+                            latest = self._latest[device_ip] = {
+                                "type": "mirror",
+                                "device": device_ip,
+                                "image": image,
+                                "width": width,
+                                "height": height,
+                                "time": time.time(),
+                            }
+                            await self.hub.publish(latest, "mirror")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                stats["errors"] += 1
+                self.logger.warning(f"화면 캡처 실패 ({device_ip}): {str(e)}")
+
+            await asyncio.sleep(max(0.0, interval - (time.perf_counter() - started)))
+
+    def start(self, devices: List[str], interval: float = 2.0) -> List[str]:
+        """미러링 시작 (interval: 디바이스별 캡처 주기 초)"""
+        interval = max(0.5, interval)
+        started = []
+        for device_ip in devices:
+            if device_ip in self.tasks:
+                continue
+            self.stats[device_ip] = {"sent": 0, "skipped": 0, "errors": 0, "bytes": 0}
+            self._digests.pop(device_ip, None)
+            self._latest.pop(device_ip, None)
+            self.tasks[device_ip] = asyncio.create_task(self._mirror_device(device_ip, interval))
+            started.append(device_ip)
+
+        if started:
+            self.logger.info(f"화면 미러링 시작: {len(started)}개 디바이스")
+        return started
+
+    async def stop(self, devices: Union[str, List[str]] = "all") -> List[str]:
+        """미러링 중지 (모두 중지되면 인코딩 스레드 풀도 종료)"""
+        targets = list(self.tasks) if devices == "all" else devices
+        stopped = [ip for ip in targets if ip in self.tasks]
+        tasks = [self.tasks.pop(ip) for ip in stopped]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        if not self.tasks and self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        if stopped:
+            self.logger.info(f"화면 미러링 중지: {len(stopped)}개 디바이스")
+        return stopped
+
+    def status(self) -> Dict[str, Any]:
+        """디바이스별 전송/생략/오류 수"""
+        return {"devices": {ip: self.stats[ip] for ip in self.tasks}}
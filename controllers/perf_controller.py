@@ -0,0 +1,320 @@
+"""
+렌더링 성능 수집 컨트롤러
+체험 중 헤드셋별 프레임 통계와 CPU/GPU 사용률을 수집하고,
+체험 타임라인(PLAY/FALL 등) 구간별로 드롭 프레임과 백분위를 계산하여 세션별로 저장
+
+- 프레임: Unity 앱은 HWUI로 그리지 않아 dumpsys gfxinfo에 프레임이 남지 않으므로,
+  VR 런타임이 초당 한 줄 출력하는 성능 로그(VrApi 태그, "FPS=72/72,...,Stale=0,...")를 logcat 스트림으로 받음
+- 시각: 기기 시계(절전 중 멈추거나 계속 가는 시계)를 변환하지 않고 서버가 받은 시각을 사용
+"""
+import asyncio
+import json
+import random
+import re
+import time
+from array import array
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+import numpy as np
+from utils.logger import Logger
+from utils.session_id import new_session_id
+from controllers.adb_controller import ADBController
+from controllers.experience_controller import ExperienceController
+from controllers.logcat_controller import LINE_PATTERN, RESTART_DELAY, build_filter_specs
+from config import TEST_MODE
+
+# 목표 주사율 (Pico 4 기본 72Hz, 런타임 로그에 목표값이 있으면 그 값 사용)
+TARGET_FPS = 72
+
+# 런타임 성능 로그: FPS=<앱 프레임>/<목표>, Stale=<이전 프레임을 다시 쓴 횟수 (드롭)>
+PERF_LOG_FILTERS = ["VrApi:I"]
+FPS_FIELD = re.compile(r'\bFPS=(\d+)/(\d+)')
+STALE_FIELD = re.compile(r'\bStale=(\d+)')
+
+# CPU/GPU 샘플 주기 범위 (초, 0이면 쉬지 않고 셸 명령을 보내게 됨)
+MIN_INTERVAL = 0.5
+MAX_INTERVAL = 10.0
+
+PERCENTILES = (50, 90, 99)
+SAFE_NAME = re.compile(r'[^\w.-]')
+
+
+class DeviceCapture:
+    """헤드셋 하나의 수집 데이터 (추가가 잦으므로 array에 모은 뒤 요약할 때 NumPy로 변환)"""
+
+    def __init__(self):
+        self.report_time = array('d')  # 런타임 성능 로그 수신 시각 (서버 시각, 초)
+        self.fps = array('f')          # 초당 앱 프레임 수
+        self.target_fps = array('f')   # 초당 목표 프레임 수
+        self.stale = array('f')        # 초당 드롭 프레임 수 (Stale)
+        self.load_time = array('d')    # 사용률 샘플 시각
+        self.cpu = array('f')          # CPU 사용률 (%)
+        self.gpu = array('f')          # GPU 사용률 (%, 알 수 없으면 NaN)
+        self.last_cpu: Optional[Tuple[int, int]] = None  # /proc/stat (idle, total)
+        self.errors = 0
+
+
+class PerfController:
+    def __init__(self, logger: Logger, adb_ctrl: ADBController, experience_ctrl: ExperienceController,
+                 storage_dir: Path):
+        self.logger = logger
+        self.adb_ctrl = adb_ctrl
+        self.experience_ctrl = experience_ctrl
+        self.storage_dir = storage_dir
+        self.session_id: Optional[str] = None
+        self.started_at = 0.0
+        self.captures: Dict[str, DeviceCapture] = {}
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        return self.session_id is not None
+
+    @staticmethod
+    def _sample_command() -> str:
+        """샘플 1회에 실행할 셸 명령 (CPU, GPU를 한 번에)"""
+        return (
+            "head -1 /proc/stat; "
+            "echo ---GPU---; cat /sys/class/kgsl/kgsl-3d0/gpu_busy_percentage 2>/dev/null"
+        )
+
+    @staticmethod
+    def _parse_sample(capture: DeviceCapture, output: str, sampled_at: float):
+        """CPU/GPU 샘플 출력 파싱 후 capture에 추가"""
+        section = "cpu"
+        for line in output.splitlines():
+            line = line.strip()
+            if line == "---GPU---":
+                section = "gpu"
+            elif section == "cpu" and line.startswith("cpu "):
+                values = [int(v) for v in line.split()[1:]]
+                idle, total = values[3] + values[4], sum(values[:8])
+                if capture.last_cpu is not None and total > capture.last_cpu[1]:
+                    busy = 1.0 - (idle - capture.last_cpu[0]) / (total - capture.last_cpu[1])
+                    capture.load_time.append(sampled_at)
+                    capture.cpu.append(round(busy * 100, 1))
+                    capture.gpu.append(float("nan"))
+                capture.last_cpu = (idle, total)
+            elif section == "gpu" and line and capture.load_time and capture.load_time[-1] == sampled_at:
+                capture.gpu[-1] = float(line.split()[0].rstrip("%"))
+
+    @staticmethod
+    def _add_report(capture: DeviceCapture, line: str, received_at: float):
+        """런타임 성능 로그 한 줄 추가 (FPS 필드가 없는 줄은 무시)"""
+        match = LINE_PATTERN.match(line)
+        if match is None:
+            return
+        message = match.group(6)
+        fps = FPS_FIELD.search(message)
+        if fps is None:
+            return
+        stale = STALE_FIELD.search(message)
+        capture.report_time.append(received_at)
+        capture.fps.append(float(fps.group(1)))
+        capture.target_fps.append(float(fps.group(2)) or TARGET_FPS)
+        capture.stale.append(float(stale.group(1)) if stale else 0.0)
+
+    async def _fake_reports(self) -> AsyncIterator[List[str]]:
+        """테스트 모드용 가상 런타임 성능 로그 (FALL 직후 드롭 증가)"""
+        while True:
+            await asyncio.sleep(1.0)
+            now = time.time()
+            spike = any(0 <= now - t < 2.0 for t, event in self.experience_ctrl.timeline if event == "FALL")
+            stale = random.randint(10, 25) if spike else random.randint(0, 1)
+            stamp = time.strftime("%m-%d %H:%M:%S") + ".000"
+            yield [f"{stamp}  1234  1260 I VrApi   : FPS={TARGET_FPS - stale}/{TARGET_FPS},Prd=45ms,"
+                   f"Tear=0,Early=0,Stale={stale},VSnc=1"]
+
+    async def _frame_loop(self, device_ip: str, capture: DeviceCapture):
+        """런타임 성능 로그 수신 (로그캣 스트림, 끊어지면 잠시 후 다시 연결)"""
+        command = ["logcat", "-v", "threadtime", "-T", "1", *build_filter_specs(PERF_LOG_FILTERS)]
+        while True:
+            lines = self._fake_reports() if TEST_MODE else self.adb_ctrl.stream_lines(command, device_ip)
+            try:
+                async for batch in lines:
+                    received_at = time.time()
+                    for line in batch:
+                        self._add_report(capture, line, received_at)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                capture.errors += 1
+                self.logger.warning(f"성능 로그 스트림 오류 ({device_ip}): {str(e)}")
+            finally:
+                await lines.aclose()
+            await asyncio.sleep(RESTART_DELAY)
+
+    @staticmethod
+    def _fake_sample(capture: DeviceCapture, sampled_at: float):
+        """테스트 모드용 가상 CPU/GPU 사용률"""
+        capture.load_time.append(sampled_at)
+        capture.cpu.append(random.uniform(40, 70))
+        capture.gpu.append(random.uniform(50, 90))
+
+    async def _sample_loop(self, device_ip: str, capture: DeviceCapture, interval: float):
+        """디바이스 CPU/GPU 주기적 샘플링 (지속 셸 세션 사용)"""
+        command = self._sample_command()
+        while True:
+            sampled_at = time.time()
+            if TEST_MODE:
+                self._fake_sample(capture, sampled_at)
+            else:
+                success, output = await self.adb_ctrl.run_shell(device_ip, command)
+                if success or output:
+                    try:
+                        self._parse_sample(capture, output, sampled_at)
+                    except (ValueError, IndexError):
+                        capture.errors += 1
+                else:
+                    capture.errors += 1
+            await asyncio.sleep(max(0.0, interval - (time.time() - sampled_at)))
+
+    def start(self, devices: List[str], interval: float = 1.0) -> str:
+        """수집 시작 (세션 ID 반환, interval은 CPU/GPU 샘플 주기)"""
+        if self.running:
+            raise RuntimeError(f"이미 수집 중입니다: {self.session_id}")
+        if not devices:
+            raise ValueError("대상 디바이스가 없습니다")
+
+        interval = min(max(interval, MIN_INTERVAL), MAX_INTERVAL)
+        self.session_id = new_session_id(self.storage_dir)
+        self.started_at = time.time()
+        self.captures = {ip: DeviceCapture() for ip in devices}
+        self._tasks = []
+        for ip, capture in self.captures.items():
+            self._tasks.append(asyncio.create_task(self._frame_loop(ip, capture)))
+            self._tasks.append(asyncio.create_task(self._sample_loop(ip, capture, interval)))
+        self.logger.info(f"성능 수집 시작: {self.session_id} ({len(devices)}개 디바이스)")
+        return self.session_id
+
+    async def stop(self) -> Dict[str, Any]:
+        """수집 종료 후 요약 계산 및 저장"""
+        if not self.running:
+            raise RuntimeError("수집 중이 아닙니다")
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        ended_at = time.time()
+        timeline = [(t, event) for t, event in self.experience_ctrl.timeline if self.started_at <= t <= ended_at]
+        summary = {
+            "session_id": self.session_id,
+            "started_at": self.started_at,
+            "ended_at": ended_at,
+            "target_fps": TARGET_FPS,
+            "timeline": [{"time": t, "event": event} for t, event in timeline],
+            "devices": {ip: summarize(capture, timeline, self.started_at, ended_at)
+                        for ip, capture in self.captures.items()},
+        }
+
+        await asyncio.get_running_loop().run_in_executor(None, self._save, summary, self.captures)
+        self.logger.info(f"성능 수집 종료: {self.session_id}")
+        self.session_id = None
+        self.captures = {}
+        return summary
+
+    def _save(self, summary: Dict[str, Any], captures: Dict[str, DeviceCapture]):
+        """세션 요약(JSON)과 원본 샘플(NPZ) 저장"""
+        self.storage_dir.mkdir(parents=True, exist_ok=True)
+        base = self.storage_dir / summary["session_id"]
+
+        arrays = {}
+        for ip, capture in captures.items():
+            key = SAFE_NAME.sub("_", ip)
+            arrays[f"{key}__report_time"] = np.frombuffer(capture.report_time, dtype=np.float64)
+            arrays[f"{key}__fps"] = np.frombuffer(capture.fps, dtype=np.float32)
+            arrays[f"{key}__target_fps"] = np.frombuffer(capture.target_fps, dtype=np.float32)
+            arrays[f"{key}__stale"] = np.frombuffer(capture.stale, dtype=np.float32)
+            arrays[f"{key}__load_time"] = np.frombuffer(capture.load_time, dtype=np.float64)
+            arrays[f"{key}__cpu"] = np.frombuffer(capture.cpu, dtype=np.float32)
+            arrays[f"{key}__gpu"] = np.frombuffer(capture.gpu, dtype=np.float32)
+        np.savez_compressed(base.with_suffix(".npz"), **arrays)
+        base.with_suffix(".json").write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding='utf-8')
+
+    def list_sessions(self) -> List[str]:
+        """저장된 세션 ID (최신순)"""
+        if not self.storage_dir.exists():
+            return []
+        return sorted((p.stem for p in self.storage_dir.glob("*.json")), reverse=True)
+
+    def load_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """저장된 세션 요약"""
+        path = self.storage_dir / f"{SAFE_NAME.sub('_', session_id)}.json"
+        if not path.exists():
+            return None
+        return json.loads(path.read_text(encoding='utf-8'))
+
+
+def _frame_stats(fps: np.ndarray, target_fps: np.ndarray, stale: np.ndarray) -> Dict[str, Any]:
+    """초당 성능 보고 요약 (드롭 프레임, 초당 평균 프레임 시간의 백분위)"""
+    if fps.size == 0:
+        return {"frames": 0}
+    frames = int(fps.sum())
+    dropped = int(stale.sum())
+    expected = float(target_fps.sum())
+    # 초당 평균 프레임 시간 (프레임이 없는 초는 1초 전체를 한 프레임으로 계산)
+    frame_ms = 1000.0 / np.maximum(fps, 1.0)
+    percentiles = np.percentile(frame_ms, PERCENTILES)
+    return {
+        "frames": frames,
+        "dropped": dropped,
+        "dropped_pct": round(dropped / expected * 100, 2) if expected else 0.0,
+        "fps_avg": round(float(fps.mean()), 1),
+        "fps_min": round(float(fps.min()), 1),
+        **{f"p{p}_ms": round(float(v), 2) for p, v in zip(PERCENTILES, percentiles)},
+        "max_ms": round(float(frame_ms.max()), 2),
+    }
+
+
+def _load_stats(values: np.ndarray) -> Dict[str, Optional[float]]:
+    values = values[~np.isnan(values)]
+    if values.size == 0:
+        return {"avg": None, "max": None}
+    return {"avg": round(float(values.mean()), 1), "max": round(float(values.max()), 1)}
+
+
+def summarize(capture: DeviceCapture, timeline: List[Tuple[float, str]],
+              started_at: float, ended_at: float) -> Dict[str, Any]:
+    """헤드셋 하나의 전체/구간별 요약
+
+    구간은 타임라인 이벤트 사이 (수집 시작 ~ 첫 이벤트는 "BEFORE", 각 이벤트부터 다음 이벤트까지는 이벤트 이름)
+    """
+    report_time = np.frombuffer(capture.report_time, dtype=np.float64)
+    fps = np.frombuffer(capture.fps, dtype=np.float32)
+    target_fps = np.frombuffer(capture.target_fps, dtype=np.float32)
+    stale = np.frombuffer(capture.stale, dtype=np.float32)
+    load_time = np.frombuffer(capture.load_time, dtype=np.float64)
+    cpu = np.frombuffer(capture.cpu, dtype=np.float32)
+    gpu = np.frombuffer(capture.gpu, dtype=np.float32)
+
+    # 각 성능 보고/샘플이 속한 구간 번호 (0: 첫 이벤트 이전)
+    boundaries = np.array([t for t, _ in timeline], dtype=np.float64)
+    names = ["BEFORE"] + [event for _, event in timeline]
+    report_phase = np.searchsorted(boundaries, report_time, side="right")
+    load_phase = np.searchsorted(boundaries, load_time, side="right")
+
+    phases = []
+    for index, name in enumerate(names):
+        start = started_at if index == 0 else boundaries[index - 1]
+        end = boundaries[index] if index < len(boundaries) else ended_at
+        in_phase = report_phase == index
+        if not in_phase.any() and index == 0:
+            continue
+        phases.append({
+            "phase": name,
+            "start": float(start),
+            "duration": round(float(end - start), 2),
+            **_frame_stats(fps[in_phase], target_fps[in_phase], stale[in_phase]),
+            "cpu": _load_stats(cpu[load_phase == index]),
+            "gpu": _load_stats(gpu[load_phase == index]),
+        })
+
+    return {
+        **_frame_stats(fps, target_fps, stale),
+        "cpu": _load_stats(cpu),
+        "gpu": _load_stats(gpu),
+        "sample_errors": capture.errors,
+        "phases": phases,
+    }
@@ -0,0 +1,370 @@
+"""
+교육 세션 스케줄러
+교육생 대기열과 헤드셋 세트를 관리하고, 다음 세션 준비를 현재 세션과 겹쳐 실행하여 장비 유휴 시간 단축
+
+세션 단계 (시각 기록 후 단계별 소요 시간 계산)
+    대기(wait):     대기열 등록 -> 준비 시작
+    준비(prep):     앱 준비(cold 재실행 또는 warm 장면 초기화) + 헤드셋 준비 확인 (앱 실행 여부, 배터리)
+    탑승(standby):  준비 완료 -> 체험 시작 (이전 세션 종료/장비 정리 대기 + 교육생 탑승)
+    체험(run):      체험 시작 -> 체험 종료
+    정리(turnover): 체험 종료 -> 장비 정리 완료 (시뮬레이터 원위치, 교육생 하차)
+
+- 헤드셋 세트가 둘 이상이면 다음 교육생의 세트를 현재 체험 중에 미리 준비
+- 세트가 하나면 체험이 끝나는 즉시(정리 중에) 같은 세트를 다시 준비
+- 자동 시작이 아니면 운영자가 탑승 확인(begin) 후 시작 (정리 중에 미리 눌러도 정리가 끝나면 바로 시작)
+"""
+import asyncio
+import itertools
+import statistics
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+from utils.logger import Logger
+from controllers.adb_controller import ADBController
+from controllers.experience_controller import ExperienceController
+from controllers.launch_controller import LaunchController
+from config import settings, TEST_MODE
+
+PHASES = ("wait", "prep", "standby", "run", "turnover")
+MIN_BATTERY = 20              # 이보다 배터리가 낮은 헤드셋은 준비 미완료로 표시
+READY_RETRIES = 1             # 준비 확인 실패 시 앱을 다시 준비(cold)한 뒤 확인하는 횟수
+HISTORY_SIZE = 500
+
+
+class Session:
+    """교육생 한 명의 체험 세션"""
+
+    def __init__(self, session_id: int, trainee: Dict[str, Any], headset_set: str, devices: List[str]):
+        self.id = session_id
+        self.trainee = trainee
+        self.headset_set = headset_set
+        self.devices = devices
+        self.status = "prep"  # prep -> ready -> running -> turnover -> done
+        self.marks: Dict[str, float] = {"queued": trainee["queued_at"], "prep_start": time.time()}
+        self.not_ready: List[str] = []
+        self.begin_requested = False
+        self.timed_out = False
+
+    def mark(self, name: str):
+        self.marks[name] = time.time()
+
+    def phases(self) -> Dict[str, float]:
+        """단계별 소요 시간 (초, 끝나지 않은 단계는 제외)"""
+        bounds = {
+            "wait": ("queued", "prep_start"),
+            "prep": ("prep_start", "ready"),
+            "standby": ("ready", "started"),
+            "run": ("started", "stopped"),
+            "turnover": ("stopped", "done"),
+        }
+        return {
+            phase: round(self.marks[end] - self.marks[start], 2)
+            for phase, (start, end) in bounds.items()
+            if start in self.marks and end in self.marks
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "trainee": self.trainee["name"],
+            "headset_set": self.headset_set,
+            "devices": self.devices,
+            "status": self.status,
+            "not_ready": self.not_ready,
+            "begin_requested": self.begin_requested,
+            "timed_out": self.timed_out,
+            "marks": self.marks,
+            "phases": self.phases(),
+        }
+
+
+class SessionScheduler:
+    def __init__(self, logger: Logger, adb_ctrl: ADBController, experience_ctrl: ExperienceController,
+                 launch_ctrl: LaunchController, notify: Callable[[Dict[str, Any]], Awaitable[None]]):
+        self.logger = logger
+        self.adb_ctrl = adb_ctrl
+        self.experience_ctrl = experience_ctrl
+        self.launch_ctrl = launch_ctrl
+        self.notify = notify
+        self.queue: Deque[Dict[str, Any]] = deque()
+        self.headset_sets: Dict[str, List[str]] = {}  # 비어 있으면 기본 피코 IP 전체를 세트 하나로 사용
+        self.sessions: List[Session] = []             # 준비/대기/체험/정리 중인 세션
+        self.history: Deque[Session] = deque(maxlen=HISTORY_SIZE)
+        self.auto_start = False
+        self.max_duration: Optional[float] = None      # 체험 최대 시간 (초과하면 종료)
+        self.turnover_time = 10.0                      # 체험 종료 후 장비 정리 시간 (초)
+        self.active = False
+        self.started_at: Optional[float] = None
+        self._ids = itertools.count(1)
+        self._session_ids = itertools.count(1)
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._prep_tasks: Dict[int, asyncio.Task] = {}  # 세션 ID -> 준비 작업
+        self._run_tasks: Dict[int, asyncio.Task] = {}   # 세션 ID -> 체험 진행 작업
+        self._tasks: set = set()                         # 상태 전송 (완료 전 가비지 컬렉션 방지)
+
+    # ---------- 대기열 / 세트 ----------
+
+    def enqueue(self, name: str) -> Dict[str, Any]:
+        """교육생 대기열 추가"""
+        trainee = {"id": next(self._ids), "name": name, "queued_at": time.time()}
+        self.queue.append(trainee)
+        self.logger.info(f"대기열 추가: {name} (대기 {len(self.queue)}명)")
+        self._changed()
+        return trainee
+
+    def remove(self, trainee_id: int) -> bool:
+        """대기열에서 제거 (이미 준비를 시작한 교육생은 제외)"""
+        for trainee in self.queue:
+            if trainee["id"] == trainee_id:
+                self.queue.remove(trainee)
+                self._changed()
+                return True
+        return False
+
+    def set_headset_sets(self, headset_sets: Dict[str, List[str]]):
+        """헤드셋 세트 지정 (세트 이름 -> 디바이스 IP 목록, 세트끼리 겹치면 안 됨)"""
+        seen = set()
+        for name, devices in headset_sets.items():
+            if not devices:
+                raise ValueError(f"빈 헤드셋 세트: {name}")
+            overlap = seen.intersection(devices)
+            if overlap:
+                raise ValueError(f"여러 세트에 포함된 헤드셋: {', '.join(sorted(overlap))}")
+            seen.update(devices)
+        self.headset_sets = {name: list(devices) for name, devices in headset_sets.items()}
+        self.logger.info(f"헤드셋 세트 변경: {len(self.headset_sets)}개")
+        self._changed()
+
+    def _sets(self) -> Dict[str, List[str]]:
+        return self.headset_sets or {"기본": list(self.experience_ctrl.devices)}
+
+    # ---------- 실행 ----------
+
+    def start(self, auto_start: bool = False, max_duration: Optional[float] = None,
+              turnover_time: float = None):
+        """스케줄링 시작 (auto_start: 준비되면 탑승 확인 없이 바로 시작)"""
+        self.auto_start = auto_start
+        self.max_duration = max_duration
+        if turnover_time is not None:
+            self.turnover_time = max(0.0, turnover_time)
+        if self._task is None or self._task.done():
+            self.active = True
+            self.started_at = time.time()
+            self._task = asyncio.create_task(self._run())
+            self.logger.info(f"세션 스케줄러 시작 ({'자동 시작' if auto_start else '탑승 확인 후 시작'})")
+        self._changed()
+
+    async def stop(self):
+        """스케줄링 중지
+
+        준비/체험 진행 작업을 모두 취소하고, 준비만 한 세션은 교육생을 대기열 앞으로 되돌림
+        (진행 중인 체험 자체는 종료하지 않으며 체험 종료 버튼으로 종료, 해당 세션은 기록에서 제외)
+        """
+        self.active = False
+        tasks = list(self._prep_tasks.values()) + list(self._run_tasks.values())
+        if self._task is not None:
+            tasks.append(self._task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._prep_tasks.clear()
+        self._run_tasks.clear()
+
+        for session in reversed([s for s in self.sessions if s.status in ("prep", "ready")]):
+            self.sessions.remove(session)
+            self.queue.appendleft(session.trainee)
+        for session in [s for s in self.sessions if s.status in ("running", "turnover")]:
+            self.sessions.remove(session)
+            self.logger.warning(f"세션 {session.id} 추적 중단 (스케줄러 중지): {session.trainee['name']}")
+        self.logger.info("세션 스케줄러 중지")
+        self._changed()
+
+    def begin(self) -> bool:
+        """운영자 탑승 확인 (다음 세션을 장비가 비는 즉시 시작)"""
+        session = self._next_ready() or next((s for s in self.sessions if s.status == "prep"), None)
+        if session is None:
+            return False
+        session.begin_requested = True
+        self._changed()
+        return True
+
+    async def finish(self) -> bool:
+        """진행 중인 체험 종료 (체험 종료 버튼과 같음)"""
+        if not any(s.status == "running" for s in self.sessions):
+            return False
+        return await self.experience_ctrl.stop()
+
+    def _running(self) -> Optional[Session]:
+        return next((s for s in self.sessions if s.status in ("running", "turnover")), None)
+
+    def _next_ready(self) -> Optional[Session]:
+        return next((s for s in self.sessions if s.status == "ready"), None)
+
+    def _spawn(self, coroutine: Awaitable):
+        task = asyncio.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self):
+        """대기열 -> 준비 -> 체험 -> 정리 순환 (상태가 바뀔 때마다 다시 판단)"""
+        while self.active:
+            self._fill_pipeline()
+
+            session = self._next_ready()
+            if session is not None and self._running() is None and (self.auto_start or session.begin_requested):
+                session.status = "running"
+                task = self._run_tasks[session.id] = asyncio.create_task(self._run_session(session))
+                task.add_done_callback(lambda _, session_id=session.id: self._run_tasks.pop(session_id, None))
+
+            self._wake.clear()
+            await self._wake.wait()
+
+    def _fill_pipeline(self):
+        """사용 중이지 않은 헤드셋 세트마다 다음 교육생 준비 시작 (정리 중인 세트는 사용 가능)"""
+        busy = {s.headset_set for s in self.sessions if s.status in ("prep", "ready", "running")}
+        for name, devices in self._sets().items():
+            if not self.queue:
+                return
+            if name in busy:
+                continue
+            session = Session(next(self._session_ids), self.queue.popleft(), name, devices)
+            self.sessions.append(session)
+            task = self._prep_tasks[session.id] = asyncio.create_task(self._prepare(session))
+            task.add_done_callback(lambda _, session_id=session.id: self._prep_tasks.pop(session_id, None))
+            self._changed()
+
+    async def _prepare(self, session: Session):
+        """헤드셋 세트 준비 (앱 준비 후 앱 실행 여부와 배터리 확인, 실패한 헤드셋만 cold로 다시 시도)
+
+        앱 실행은 첫 화면이 그려질 때까지 기다리므로(am start -W) 바로 확인
+        """
+        self.logger.info(f"세션 {session.id} 준비: {session.trainee['name']} ({session.headset_set})")
+        package = settings.current.package_name
+        targets = session.devices
+        try:
+            for attempt in range(READY_RETRIES + 1):
+                await self.launch_ctrl.prepare(targets, None if attempt == 0 else "cold")
+                checks = await asyncio.gather(*(self._check_ready(ip, package) for ip in targets))
+                targets = [ip for ip, ready in zip(targets, checks) if not ready]
+                if not targets:
+                    break
+        except Exception as e:
+            # 준비 중 오류가 나도 세션이 "prep"에 남아 헤드셋 세트를 계속 점유하지 않도록 미완료로 표시
+            self.logger.error(f"세션 {session.id} 준비 오류: {str(e)}")
+            targets = list(session.devices)
+
+        session.not_ready = targets
+        if targets:
+            self.logger.warning(f"세션 {session.id} 준비 미완료 헤드셋: {', '.join(targets)}")
+        session.status = "ready"
+        session.mark("ready")
+        self._changed()
+
+    async def _check_ready(self, device_ip: str, package: str) -> bool:
+        """앱이 실행 중이고 배터리가 충분한지 확인 (셸 명령 한 번)"""
+        if TEST_MODE:
+            return True
+        success, output = await self.adb_ctrl.run_shell(
+            device_ip, f"pidof {package}; dumpsys battery | grep -m1 level"
+        )
+        if not success:
+            return False
+        lines = [line.strip() for line in output.splitlines() if line.strip()]
+        running = any(line.split()[0].isdigit() for line in lines if not line.startswith("level"))
+        level = next((int(line.split(":")[1]) for line in lines
+                      if line.startswith("level:") and line.split(":")[1].strip().isdigit()), 0)
+        return running and level >= MIN_BATTERY
+
+    async def _run_session(self, session: Session):
+        """체험 진행 후 장비 정리 (정리 시작과 동시에 같은 세트의 다음 교육생 준비 가능)"""
+        session.mark("started")
+        self.logger.info(f"세션 {session.id} 시작: {session.trainee['name']}")
+        self._changed()
+        if not await self.experience_ctrl.start(session.devices):
+            # PLAY가 어느 헤드셋에도 전달되지 않음 - 체험 상태를 되돌리고 교육생은 대기열 앞으로
+            # (같은 실패가 반복되지 않도록 자동 시작은 해제하고 운영자 탑승 확인을 기다림)
+            await self.experience_ctrl.stop()
+            self.sessions.remove(session)
+            self.queue.appendleft(session.trainee)
+            self.auto_start = False
+            self.logger.error(f"세션 {session.id} 시작 실패 (체험 시작 신호 전달 실패): {session.trainee['name']} - 대기열로 되돌림")
+            self._changed()
+            return
+
+        if not await self.experience_ctrl.wait_finished(self.max_duration):
+            session.timed_out = True
+            self.logger.warning(f"세션 {session.id} 최대 시간 초과로 종료")
+            await self.experience_ctrl.stop()
+
+        session.mark("stopped")
+        session.status = "turnover"
+        self._changed()
+
+        # 체험 종료 시 시뮬레이터 RESET은 이미 전송됨 - 원위치 복귀와 하차 시간만 대기
+        await asyncio.sleep(self.turnover_time)
+        session.mark("done")
+        session.status = "done"
+        self.sessions.remove(session)
+        self.history.append(session)
+        self.logger.info(f"세션 {session.id} 완료: {session.trainee['name']}")
+        self._changed()
+
+    def _changed(self):
+        """상태 변경 알림 (스케줄 루프를 깨우고 대시보드에 전송)"""
+        self._wake.set()
+        self._spawn(self.notify({"type": "scheduler", "scheduler": self.status()}))
+
+    # ---------- 상태 / 보고 ----------
+
+    def status(self) -> Dict[str, Any]:
+        """대기열, 진행 중인 세션, 헤드셋 세트, 요약 통계"""
+        report = self.report()
+        return {
+            "active": self.active,
+            "auto_start": self.auto_start,
+            "queue": [{"id": t["id"], "name": t["name"], "queued_at": t["queued_at"]} for t in self.queue],
+            "sessions": [s.to_dict() for s in self.sessions],
+            "headset_sets": self._sets(),
+            "completed": report["completed"],
+            "sessions_per_hour": report["sessions_per_hour"],
+            "rig_idle_mean": report["rig_idle"]["mean"],
+        }
+
+    def report(self) -> Dict[str, Any]:
+        """처리량 보고 (시간당 세션 수, 단계별 소요 시간, 세션 사이 장비 유휴 시간)"""
+        done = list(self.history)
+        elapsed = time.time() - self.started_at if self.started_at else 0.0
+        phases = {phase: _summary([s.phases()[phase] for s in done if phase in s.phases()]) for phase in PHASES}
+
+        # 장비 유휴: 이전 교육생 체험 종료 -> 다음 교육생 체험 시작
+        ordered = sorted(done + [s for s in self.sessions if "started" in s.marks], key=lambda s: s.marks["started"])
+        gaps = [b.marks["started"] - a.marks["stopped"]
+                for a, b in zip(ordered, ordered[1:]) if "stopped" in a.marks]
+
+        run_mean = phases["run"]["mean"]
+        idle_mean = _summary(gaps)["mean"]
+        return {
+            "completed": len(done),
+            "elapsed": round(elapsed, 1),
+            "sessions_per_hour": round(len(done) * 3600 / elapsed, 2) if elapsed > 0 else 0.0,
+            # 현재 체험/유휴 시간이 유지될 때의 최대 처리량
+            "capacity_per_hour": round(3600 / (run_mean + idle_mean), 2) if run_mean + idle_mean > 0 else 0.0,
+            "phases": phases,
+            "rig_idle": _summary(gaps),
+            "timed_out": sum(1 for s in done if s.timed_out),
+            "sessions": [s.to_dict() for s in done],
+        }
+
+
+def _summary(values: List[float]) -> Dict[str, float]:
+    """평균/중앙값/최대 (초)"""
+    if not values:
+        return {"count": 0, "mean": 0.0, "p50": 0.0, "max": 0.0}
+    return {
+        "count": len(values),
+        "mean": round(statistics.fmean(values), 2),
+        "p50": round(statistics.median(values), 2),
+        "max": round(max(values), 2),
+    }
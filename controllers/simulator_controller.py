@@ -4,10 +4,16 @@
 import asyncio
 import socket
 import json
-from typing import Optional, Dict, Any
+import time
+from collections import deque
+from typing import Optional, Dict, Any, Deque, Tuple
 from utils.logger import Logger
+from utils.command_lanes import command_lanes
 from config import TEST_MODE
 
+# 안전 명령 (전용 레인에서 우선 실행, 실행 중에는 헤드셋 대량 전송 투입을 멈춤)
+SAFETY_COMMANDS = {"FALL", "ELEVATOR_STOP", "RESET"}
+
 
 class SimulatorController:
     def __init__(self, logger: Logger):
@@ -16,6 +22,7 @@ class SimulatorController:
         self.host: Optional[str] = None
         self.port: Optional[int] = None
         self.socket: Optional[socket.socket] = None
+        self.cues: Deque[Tuple[float, str]] = deque(maxlen=1000)  # 전송한 명령 (시각, 명령) - 텔레메트리와 비교용
     
     async def connect(self, host: str, port: int) -> bool:
         """시뮬레이터 연결"""
@@ -103,13 +110,16 @@ class SimulatorController:
             
             if TEST_MODE:
                 self.logger.info(f"[테스트] 시뮬레이터 명령 전송: {command}")
+                self.cues.append((time.time(), command))
                 return True
             
-            # 실제 전송
+            # 실제 전송 (시뮬레이터 전용 레인, 헤드셋 전송과 스레드 풀을 공유하지 않음)
             message_str = json.dumps(message) + "\n"
-            await asyncio.get_event_loop().run_in_executor(
-                None, self.socket.sendall, message_str.encode('utf-8')
+            await command_lanes.run(
+                "simulator", self.socket.sendall, message_str.encode('utf-8'),
+                priority=command in SAFETY_COMMANDS
             )
+            self.cues.append((time.time(), command))
             
             self.logger.success(f"시뮬레이터 명령 전송: {command}")
             return True
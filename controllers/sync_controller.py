@@ -0,0 +1,220 @@
+"""
+파일 동기화 컨트롤러
+로컬 디렉토리의 콘텐츠 해시 매니페스트를 디바이스에 저장된 매니페스트와 비교하여
+변경된 파일만 전송
+"""
+import asyncio
+import hashlib
+import json
+import os
+import posixpath
+import shlex
+import tempfile
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Dict, Union, Any, Tuple
+from utils.logger import Logger
+from controllers.adb_controller import ADBController
+
+
+# 디바이스에 저장되는 매니페스트 파일 이름
+MANIFEST_NAME = ".vrfall_manifest.json"
+
+# 해시 계산 시 한 번에 읽는 크기 (멀티 GB 파일도 메모리 사용량 일정)
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# 해시 캐시를 유지하는 동기화 루트 수 (가장 오래 사용하지 않은 루트부터 제거)
+MAX_CACHED_ROOTS = 8
+
+FileHashes = Dict[str, Tuple[int, int, str]]  # 상대 경로 -> (크기, 수정 시각, 해시)
+
+
+def is_safe_rel_path(rel_path: Any) -> bool:
+    """디바이스 매니페스트의 상대 경로 검사 (절대 경로나 ".."로 동기화 디렉토리를 벗어나는 경로 거부)"""
+    if not isinstance(rel_path, str) or not rel_path or "\0" in rel_path:
+        return False
+    if posixpath.isabs(rel_path):
+        return False
+    return ".." not in rel_path.split("/")
+
+
+class SyncController:
+    def __init__(self, logger: Logger, adb_ctrl: ADBController):
+        self.logger = logger
+        self.adb_ctrl = adb_ctrl
+        # 로컬 해시 캐시: 동기화 루트 -> 루트의 파일별 해시 (매니페스트를 만들 때마다 현재 파일만 남김)
+        self._hash_cache: "OrderedDict[str, FileHashes]" = OrderedDict()
+
+    @staticmethod
+    def _hash_file(path: Path, stat: os.stat_result, previous: FileHashes, rel_path: str) -> Tuple[int, int, str]:
+        """파일 해시 계산 (청크 단위 읽기, 크기/수정 시각이 같으면 이전 결과 사용)"""
+        cached = previous.get(rel_path)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached
+
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            while True:
+                chunk = f.read(HASH_CHUNK_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+
+        return stat.st_size, stat.st_mtime_ns, digest.hexdigest()
+
+    def _build_manifest(self, local_dir: Path) -> Dict[str, Dict[str, Any]]:
+        """로컬 디렉토리 매니페스트 생성 (상대 경로 -> 해시/크기)"""
+        root_key = str(local_dir.resolve())
+        previous = self._hash_cache.get(root_key, {})
+        hashes: FileHashes = {}
+        manifest: Dict[str, Dict[str, Any]] = {}
+        for root, _, files in os.walk(local_dir):
+            for name in files:
+                path = Path(root) / name
+                rel_path = path.relative_to(local_dir).as_posix()
+                size, mtime_ns, file_hash = hashes[rel_path] = self._hash_file(path, path.stat(), previous, rel_path)
+                manifest[rel_path] = {"sha256": file_hash, "size": size}
+
+        # 삭제된 파일은 빠지도록 루트의 캐시를 통째로 교체하고, 오래된 루트는 제거
+        self._hash_cache[root_key] = hashes
+        self._hash_cache.move_to_end(root_key)
+        while len(self._hash_cache) > MAX_CACHED_ROOTS:
+            self._hash_cache.popitem(last=False)
+        return manifest
+
+    async def compute_manifest(self, local_dir: str) -> Dict[str, Dict[str, Any]]:
+        """로컬 디렉토리 매니페스트 계산 (이벤트 루프를 막지 않도록 스레드에서 실행)"""
+        path = Path(local_dir)
+        if not path.is_dir():
+            raise ValueError(f"로컬 디렉토리를 찾을 수 없습니다: {local_dir}")
+        return await asyncio.get_running_loop().run_in_executor(None, self._build_manifest, path)
+
+    async def read_device_manifest(self, device_ip: str, remote_dir: str) -> Dict[str, Dict[str, Any]]:
+        """디바이스에 저장된 매니페스트 읽기 (없거나 손상된 경우 빈 매니페스트, 안전하지 않은 경로는 제외)"""
+        remote_manifest = posixpath.join(remote_dir, MANIFEST_NAME)
+        success, output = await self.adb_ctrl.run_adb_command(
+            ["shell", "cat", shlex.quote(remote_manifest), "2>/dev/null"], device_ip
+        )
+        if not success:
+            return {}
+        try:
+            manifest = json.loads(output)
+        except json.JSONDecodeError:
+            return {}
+        if not isinstance(manifest, dict):
+            return {}
+
+        unsafe = [rel_path for rel_path in manifest if not is_safe_rel_path(rel_path)]
+        if unsafe:
+            self.logger.warning(f"{device_ip} 매니페스트의 잘못된 경로 {len(unsafe)}개 무시: {unsafe[0]}")
+        return {rel_path: entry for rel_path, entry in manifest.items()
+                if rel_path not in unsafe and isinstance(entry, dict)}
+
+    async def _write_device_manifest(self, device_ip: str, remote_dir: str,
+                                     manifest: Dict[str, Dict[str, Any]]) -> bool:
+        """매니페스트를 임시 파일로 저장한 뒤 디바이스로 전송"""
+        fd, tmp_path = tempfile.mkstemp(suffix=".json")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f)
+            success, _ = await self.adb_ctrl.run_adb_command(
+                ["push", tmp_path, posixpath.join(remote_dir, MANIFEST_NAME)], device_ip
+            )
+            return success
+        finally:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    async def _sync_device(self, device_ip: str, local_dir: Path, remote_dir: str,
+                           local_manifest: Dict[str, Dict[str, Any]], delete: bool) -> Dict[str, Any]:
+        """한 디바이스 동기화"""
+        start = time.perf_counter()
+        device_manifest = await self.read_device_manifest(device_ip, remote_dir)
+
+        changed = [
+            rel_path for rel_path, entry in local_manifest.items()
+            if device_manifest.get(rel_path, {}).get("sha256") != entry["sha256"]
+        ]
+        removed = [rel_path for rel_path in device_manifest if rel_path not in local_manifest]
+
+        new_manifest = {
+            rel_path: entry for rel_path, entry in device_manifest.items()
+            if rel_path in local_manifest
+        }
+        pushed_bytes = 0
+        failed: List[str] = []
+
+        for rel_path in changed:
+            success, _ = await self.adb_ctrl.run_adb_command(
+                ["push", str(local_dir / rel_path), posixpath.join(remote_dir, rel_path)], device_ip
+            )
+            if success:
+                new_manifest[rel_path] = local_manifest[rel_path]
+                pushed_bytes += local_manifest[rel_path]["size"]
+            else:
+                new_manifest.pop(rel_path, None)
+                failed.append(rel_path)
+
+        if delete:
+            for rel_path in removed:
+                if not is_safe_rel_path(rel_path):
+                    continue  # 동기화 디렉토리 밖의 파일은 삭제하지 않음
+                await self.adb_ctrl.run_adb_command(
+                    ["shell", "rm", "-f", shlex.quote(posixpath.join(remote_dir, rel_path))], device_ip
+                )
+        else:
+            # 삭제하지 않은 파일은 다음 동기화 때도 비교 대상이 되도록 유지
+            for rel_path in removed:
+                new_manifest[rel_path] = device_manifest[rel_path]
+
+        manifest_saved = await self._write_device_manifest(device_ip, remote_dir, new_manifest)
+
+        return {
+            "success": not failed and manifest_saved,
+            "pushed": len(changed) - len(failed),
+            "unchanged": len(local_manifest) - len(changed),
+            "deleted": len(removed) if delete else 0,
+            "failed": failed,
+            "bytes": pushed_bytes,
+            "duration": round(time.perf_counter() - start, 3),
+        }
+
+    async def sync(self, local_dir: str, remote_dir: str, devices: Union[str, List[str]] = "all",
+                   max_devices: int = 4, delete: bool = False) -> Dict[str, Any]:
+        """로컬 디렉토리를 디바이스에 동기화 (변경된 파일만 전송)"""
+        target_devices = self.adb_ctrl.resolve_devices(devices)
+        if not target_devices:
+            self.logger.warning("대상 디바이스가 없습니다")
+            return {"success": False, "devices": {}}
+
+        self.logger.info(f"파일 동기화 준비 중: {local_dir} -> {remote_dir}")
+        local_manifest = await self.compute_manifest(local_dir)
+        total_bytes = sum(entry["size"] for entry in local_manifest.values())
+        self.logger.info(f"매니페스트 계산 완료: {len(local_manifest)}개 파일 ({total_bytes / 1024 / 1024:.1f}MB)")
+
+        limit = asyncio.Semaphore(max(1, int(max_devices)))
+
+        async def run(device_ip: str) -> Dict[str, Any]:
+            async with limit:
+                return await self._sync_device(device_ip, Path(local_dir), remote_dir, local_manifest, delete)
+
+        reports = await asyncio.gather(*(run(ip) for ip in target_devices), return_exceptions=True)
+
+        device_results: Dict[str, Any] = {}
+        for device_ip, report in zip(target_devices, reports):
+            if isinstance(report, Exception):
+                device_results[device_ip] = {"success": False, "error": str(report)}
+            else:
+                device_results[device_ip] = report
+
+        success_count = sum(1 for r in device_results.values() if r["success"])
+        self.logger.info(f"파일 동기화 완료: {success_count}/{len(target_devices)} 디바이스 성공")
+
+        return {
+            "success": success_count > 0,
+            "files": len(local_manifest),
+            "devices": device_results,
+        }
@@ -0,0 +1,322 @@
+"""
+시뮬레이터 텔레메트리 컨트롤러
+모션 플랫폼이 보내는 위치/속도/상태 프레임(UDP, 수백 Hz)을 받아 미리 할당한 NumPy 링 버퍼에 기록
+
+- 데이터그램 하나에 프레임 여러 개가 이어질 수 있으며, np.frombuffer로 한 번에 변환 (샘플별 파이썬 객체 없음)
+- 대시보드에는 구간별 최소/최대로 줄인 값만 telemetry 토픽으로 전송 (구독자가 없으면 생략)
+- 체험(PLAY~STOP)마다 전체 샘플을 저장하고, 시뮬레이터 명령(FALL 등) 이후 반응 시간/최고 속도/이동 거리 계산
+
+프레임 형식 (리틀 엔디언 20바이트)
+    seq(u32) 프레임 번호, time_ms(u32) 플랫폼 시각, position(f32) 높이 m, velocity(f32) m/s, status(u32) 상태 비트
+"""
+import asyncio
+import json
+import math
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from utils.logger import Logger
+from utils.session_id import new_session_id
+from utils.pubsub import PubSubHub
+from utils.ring_buffer import RingBuffer, ChunkedRecorder
+from controllers.simulator_controller import SimulatorController
+from controllers.experience_controller import ExperienceController
+from config import TEST_MODE
+
+FRAME_DTYPE = np.dtype([
+    ("seq", "<u4"),
+    ("time_ms", "<u4"),
+    ("position", "<f4"),
+    ("velocity", "<f4"),
+    ("status", "<u4"),
+])
+# 링 버퍼/기록 행: 프레임 + 수신 시각 (서버 시각, 초)
+SAMPLE_DTYPE = np.dtype(FRAME_DTYPE.descr + [("recv", "<f8")])
+
+RING_SECONDS = 60             # 링 버퍼에 유지하는 시간 (최대 수신율 기준)
+MAX_RATE = 1000               # 예상 최대 수신율 (Hz)
+PUSH_INTERVAL = 0.1           # 대시보드 전송 주기 (초)
+VIEW_RATE = 100               # 대시보드로 보내는 초당 구간 수 (구간마다 최소/최대)
+MOTION_THRESHOLD = 0.05       # 명령 후 움직임 시작으로 보는 속도 (m/s)
+SAFE_NAME = re.compile(r'[^\w.-]')
+
+
+class TelemetryProtocol(asyncio.DatagramProtocol):
+    def __init__(self, controller: "TelemetryController"):
+        self.controller = controller
+
+    def datagram_received(self, data: bytes, addr):
+        self.controller.ingest(data, time.time())
+
+
+class TelemetryController:
+    def __init__(self, logger: Logger, simulator_ctrl: SimulatorController,
+                 experience_ctrl: ExperienceController, hub: PubSubHub, storage_dir: Path):
+        self.logger = logger
+        self.simulator_ctrl = simulator_ctrl
+        self.experience_ctrl = experience_ctrl
+        self.hub = hub
+        self.storage_dir = storage_dir
+        self.ring = RingBuffer(SAMPLE_DTYPE, RING_SECONDS * MAX_RATE)
+        self.recorder: Optional[ChunkedRecorder] = None
+        self.session_id: Optional[str] = None
+        self.session_started = 0.0
+        self.port: Optional[int] = None
+        self.offset: Optional[float] = None  # 서버 시각 - 플랫폼 시각 (지연이 가장 작은 프레임 기준)
+        self.stats = {"frames": 0, "datagrams": 0, "gaps": 0, "malformed": 0}
+        self._last_seq: Optional[int] = None
+        self._transport: Optional[asyncio.DatagramTransport] = None
+        self._tasks: List[asyncio.Task] = []
+        self._save_tasks: set = set()
+        self._listener = None
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    # ---------- 수신 ----------
+
+    def ingest(self, data: bytes, received_at: float):
+        """데이터그램 하나 처리 (프레임 크기의 배수가 아닌 나머지는 버림)"""
+        count = len(data) // FRAME_DTYPE.itemsize
+        if count == 0:
+            self.stats["malformed"] += 1
+            return
+        frames = np.frombuffer(data, dtype=FRAME_DTYPE, count=count)
+
+        rows = np.empty(count, dtype=SAMPLE_DTYPE)
+        for name in FRAME_DTYPE.names:
+            rows[name] = frames[name]
+        rows["recv"] = received_at
+
+        # 빠진 프레임 수 (이전 데이터그램의 마지막 프레임 번호부터 연속인지)
+        seq = frames["seq"].astype(np.int64)
+        if self._last_seq is not None:
+            seq = np.concatenate(([self._last_seq], seq))
+        steps = np.diff(seq)
+        self.stats["gaps"] += int(steps[steps > 1].sum() - np.count_nonzero(steps > 1))
+        self._last_seq = int(frames["seq"][-1])
+
+        offset = float(np.min(received_at - frames["time_ms"] / 1000.0))
+        if self.offset is None or offset < self.offset:
+            self.offset = offset
+
+        self.stats["frames"] += count
+        self.stats["datagrams"] += 1
+        self.ring.extend(rows)
+        if self.recorder is not None:
+            self.recorder.extend(rows)
+
+    def aligned_time(self, rows: np.ndarray) -> np.ndarray:
+        """플랫폼 시각을 서버 시각(체험 타임라인, 시뮬레이터 명령과 같은 기준)으로 변환"""
+        if self.offset is None:
+            return rows["recv"]
+        return rows["time_ms"] / 1000.0 + self.offset
+
+    # ---------- 시작 / 중지 ----------
+
+    async def start(self, port: int) -> int:
+        """수신 시작 (테스트 모드에서는 가상 텔레메트리 생성)"""
+        if self.running:
+            return self.port
+        self.port = port
+        self._last_seq = None
+        self.offset = None
+        if TEST_MODE:
+            self._tasks.append(asyncio.create_task(self._fake_source()))
+        else:
+            loop = asyncio.get_running_loop()
+            self._transport, _ = await loop.create_datagram_endpoint(
+                lambda: TelemetryProtocol(self), local_addr=("0.0.0.0", port)
+            )
+        self._tasks.append(asyncio.create_task(self._push_loop()))
+        self._listener = self.experience_ctrl.subscribe(self._on_timeline)
+        self.logger.info(f"시뮬레이터 텔레메트리 수신 시작 (UDP {port})")
+        return port
+
+    async def stop(self):
+        """수신 중지 (기록 중인 세션은 저장)"""
+        if not self.running:
+            return
+        if self._listener is not None:
+            self.experience_ctrl.unsubscribe(self._listener)
+            self._listener = None
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self.recorder is not None:
+            await self._finish_session()
+        await asyncio.gather(*self._save_tasks, return_exceptions=True)
+        self.logger.info("시뮬레이터 텔레메트리 수신 중지")
+
+    # ---------- 대시보드 전송 ----------
+
+    async def _push_loop(self):
+        """새 샘플을 구간별 최소/최대로 줄여 전송"""
+        position = self.ring.total
+        while True:
+            await asyncio.sleep(PUSH_INTERVAL)
+            if self.hub.subscriber_count("telemetry") == 0:
+                position = self.ring.total
+                continue
+            rows, position = self.ring.since(position)
+            if len(rows):
+                await self.hub.publish(self.decimate(rows), "telemetry")
+
+    def decimate(self, rows: np.ndarray) -> Dict[str, Any]:
+        """구간(VIEW_RATE 기준)별 최소/최대 위치와 속도"""
+        times = self.aligned_time(rows)
+        span = float(times[-1] - times[0]) if len(rows) > 1 else 0.0
+        buckets = max(1, min(len(rows), math.ceil(span * VIEW_RATE)))
+        starts = np.linspace(0, len(rows), buckets, endpoint=False).astype(np.intp)
+
+        def reduce(values: np.ndarray, op) -> List[float]:
+            return np.round(op.reduceat(values, starts).astype(np.float64), 4).tolist()
+
+        return {
+            "type": "telemetry",
+            "time": np.round(times[starts], 3).tolist(),
+            "position_min": reduce(rows["position"], np.minimum),
+            "position_max": reduce(rows["position"], np.maximum),
+            "velocity_min": reduce(rows["velocity"], np.minimum),
+            "velocity_max": reduce(rows["velocity"], np.maximum),
+            "status": int(rows["status"][-1]),
+        }
+
+    def recent(self, seconds: float = 10.0) -> Dict[str, Any]:
+        """최근 구간의 축소 값 (대시보드 첫 화면용)"""
+        rows = self.ring.latest(int(seconds * self.rate()) + 1)
+        if len(rows) == 0:
+            return {"type": "telemetry", "time": [], "position_min": [], "position_max": [],
+                    "velocity_min": [], "velocity_max": [], "status": 0}
+        return self.decimate(rows)
+
+    def rate(self) -> float:
+        """최근 1초 수신율 (Hz)"""
+        rows = self.ring.latest(MAX_RATE)
+        if len(rows) < 2:
+            return 0.0
+        recent = rows[rows["recv"] >= rows["recv"][-1] - 1.0]
+        return float(len(recent))
+
+    # ---------- 체험별 기록 ----------
+
+    def _on_timeline(self, at: float, event: str):
+        if event == "PLAY":
+            if self.recorder is not None:
+                self._spawn_save(self._take_session(at))
+            self.session_id = new_session_id(self.storage_dir)
+            self.session_started = at
+            self.recorder = ChunkedRecorder(SAMPLE_DTYPE)
+        elif event == "STOP" and self.recorder is not None:
+            self._spawn_save(self._take_session(at))
+
+    def _take_session(self, ended_at: float) -> Tuple[str, float, float, ChunkedRecorder]:
+        session = (self.session_id, self.session_started, ended_at, self.recorder)
+        self.recorder = None
+        self.session_id = None
+        return session
+
+    def _spawn_save(self, session: Tuple[str, float, float, ChunkedRecorder]):
+        task = asyncio.ensure_future(self._save_session(*session))
+        self._save_tasks.add(task)
+        task.add_done_callback(self._save_tasks.discard)
+
+    async def _finish_session(self):
+        await self._save_session(*self._take_session(time.time()))
+
+    async def _save_session(self, session_id: str, started_at: float, ended_at: float,
+                            recorder: ChunkedRecorder):
+        rows = recorder.to_array()
+        cues = [(t, command) for t, command in self.simulator_ctrl.cues if started_at <= t <= ended_at]
+        summary = {
+            "session_id": session_id,
+            "started_at": started_at,
+            "ended_at": ended_at,
+            "frames": len(rows),
+            "rate": round(len(rows) / (ended_at - started_at), 1) if ended_at > started_at else 0.0,
+            "cues": summarize_cues(self.aligned_time(rows), rows, cues, ended_at),
+        }
+        await asyncio.get_running_loop().run_in_executor(None, self._write, summary, rows)
+        self.logger.info(f"텔레메트리 저장: {session_id} ({len(rows)}개 샘플)")
+
+    def _write(self, summary: Dict[str, Any], rows: np.ndarray):
+        """세션 요약(JSON)과 전체 샘플(NPZ) 저장"""
+        self.storage_dir.mkdir(parents=True, exist_ok=True)
+        base = self.storage_dir / summary["session_id"]
+        np.savez_compressed(base.with_suffix(".npz"), samples=rows, time=self.aligned_time(rows))
+        base.with_suffix(".json").write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding='utf-8')
+
+    def list_sessions(self) -> List[str]:
+        """저장된 세션 ID (최신순)"""
+        if not self.storage_dir.exists():
+            return []
+        return sorted((p.stem for p in self.storage_dir.glob("*.json")), reverse=True)
+
+    def load_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """저장된 세션 요약"""
+        path = self.storage_dir / f"{SAFE_NAME.sub('_', session_id)}.json"
+        if not path.exists():
+            return None
+        return json.loads(path.read_text(encoding='utf-8'))
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "port": self.port if self.running else None,
+            "rate": self.rate(),
+            "buffered": len(self.ring),
+            "recording": self.session_id,
+            **self.stats,
+        }
+
+    # ---------- 테스트 모드 ----------
+
+    async def _fake_source(self, rate: int = 500, batch: int = 10):
+        """테스트 모드용 가상 플랫폼 (최근 시뮬레이터 명령에 따라 상승/추락/복귀)"""
+        frames = np.zeros(batch, dtype=FRAME_DTYPE)
+        seq = 0
+        position = velocity = 0.0
+        started = time.time()
+        dt = 1.0 / rate
+        while True:
+            for i in range(batch):
+                command = self.simulator_ctrl.cues[-1][1] if self.simulator_ctrl.cues else "RESET"
+                target = {"ELEVATOR_UP": 1.0, "ELEVATOR_STOP": position, "FALL": 0.3}.get(command, 0.0)
+                if command == "FALL" and position > target:
+                    velocity = max(velocity - 9.8 * dt, -3.0)
+                else:
+                    velocity = max(-0.5, min(0.5, (target - position) * 2.0))
+                position = max(target if command == "FALL" else 0.0, position + velocity * dt)
+                frames[i] = (seq, int((time.time() - started) * 1000), position, velocity, 1)
+                seq += 1
+            self.ingest(frames.tobytes(), time.time())
+            await asyncio.sleep(batch * dt)
+
+
+def summarize_cues(times: np.ndarray, rows: np.ndarray, cues: List[Tuple[float, str]],
+                   ended_at: float) -> List[Dict[str, Any]]:
+    """명령별 플랫폼 반응 (다음 명령 전까지: 움직임 시작까지 걸린 시간, 최고 속도, 이동 거리)"""
+    results = []
+    for index, (cue_time, command) in enumerate(cues):
+        until = cues[index + 1][0] if index + 1 < len(cues) else ended_at
+        begin, end = np.searchsorted(times, [cue_time, until])
+        segment = rows[begin:end]
+        entry: Dict[str, Any] = {"time": cue_time, "command": command, "frames": int(end - begin)}
+        if len(segment):
+            velocity = segment["velocity"]
+            moving = np.flatnonzero(np.abs(velocity) >= MOTION_THRESHOLD)
+            peak = int(np.argmax(np.abs(velocity)))
+            entry.update({
+                "onset_ms": round(float(times[begin + moving[0]] - cue_time) * 1000, 1) if len(moving) else None,
+                "peak_velocity": round(float(velocity[peak]), 3),
+                "travel": round(float(segment["position"][-1] - segment["position"][0]), 3),
+            })
+        results.append(entry)
+    return results
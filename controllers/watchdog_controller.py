@@ -0,0 +1,284 @@
+"""
+헤드셋 앱 감시 컨트롤러
+헤드셋 앱이 종료(크래시)되면 그 헤드셋만 찾아 앱을 다시 실행하고, 디바이스별 복구 시간(MTTR) 기록
+
+- 하트비트: 헤드셋 명령 채널(unity_server_port)에 주기적으로 TCP 연결 (앱이 종료되면 연결이 바로 거부됨)
+- 하트비트가 실패하면 pidof로 앱 프로세스 확인 (채널만 잠시 응답하지 않은 경우는 복구하지 않음)
+- 앱이 실행 중인 것을 확인한 헤드셋만 감시하며, 운영자가 앱을 종료/설치/재부팅한 헤드셋은 다시 실행될 때까지 제외
+- 복구는 헤드셋마다 별도 작업으로 동시에 실행 (다른 헤드셋 감시는 계속)
+"""
+import asyncio
+import shlex
+import statistics
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+from utils.logger import Logger
+from controllers.adb_controller import ADBController
+from controllers.experience_controller import ExperienceController
+from config import settings, TEST_MODE
+
+HEARTBEAT_INTERVAL = 1.0      # 하트비트 주기 (초)
+HEARTBEAT_TIMEOUT = 1.0       # 명령 채널 연결 대기 (초)
+RECOVERY_ATTEMPTS = 3         # 앱 재실행 시도 횟수 (모두 실패하면 운영자 확인 필요로 표시)
+RECOVERY_TIMEOUT = 20.0       # 재실행 후 명령 채널이 열릴 때까지 대기 (초)
+RETRY_DELAY = 2.0             # 재시도 간격 (시도 횟수만큼 늘어남, 초)
+HISTORY_SIZE = 200
+
+# idle: 앱 실행 전 또는 의도적으로 종료됨, alive: 실행 중, recovering: 재실행 중,
+# unreachable: 헤드셋에 연결할 수 없음 (네트워크/절전), failed: 재실행 실패 (운영자 확인 필요)
+STATES = ("idle", "alive", "recovering", "unreachable", "failed")
+
+
+class DeviceWatch:
+    """헤드셋 하나의 감시 상태와 복구 기록"""
+
+    def __init__(self, device_ip: str):
+        self.ip = device_ip
+        self.state = "idle"
+        self.last_alive: Optional[float] = None
+        self.detected_at: Optional[float] = None
+        self.crashes = 0
+        self.failures = 0
+        self.recoveries: Deque[Dict[str, Any]] = deque(maxlen=HISTORY_SIZE)
+
+    def record_recovery(self, attempts: int, manual: bool = False) -> Dict[str, Any]:
+        """복구 기록 (detect_s: 마지막 정상 확인 -> 감지, mttr_s: 감지 -> 복구)"""
+        now = time.time()
+        entry = {
+            "detected": self.detected_at,
+            "recovered": now,
+            "detect_s": round(self.detected_at - self.last_alive, 2) if self.last_alive else None,
+            "mttr_s": round(now - self.detected_at, 2),
+            "attempts": attempts,
+            "manual": manual,
+        }
+        self.recoveries.append(entry)
+        self.detected_at = None
+        return entry
+
+    def to_dict(self) -> Dict[str, Any]:
+        mttr = [r["mttr_s"] for r in self.recoveries]
+        return {
+            "state": self.state,
+            "last_alive": self.last_alive,
+            "crashes": self.crashes,
+            "recovered": len(self.recoveries),
+            "failures": self.failures,
+            "mttr_mean": round(statistics.fmean(mttr), 2) if mttr else None,
+            "mttr_max": max(mttr) if mttr else None,
+            "last_recovery": self.recoveries[-1] if self.recoveries else None,
+        }
+
+
+class WatchdogController:
+    def __init__(self, logger: Logger, adb_ctrl: ADBController, experience_ctrl: ExperienceController,
+                 notify: Callable[[Dict[str, Any]], Awaitable[None]]):
+        self.logger = logger
+        self.adb_ctrl = adb_ctrl
+        self.experience_ctrl = experience_ctrl
+        self.notify = notify
+        self.devices: Optional[List[str]] = None  # 감시할 헤드셋 (None이면 기본 피코 IP 전체)
+        self.interval = HEARTBEAT_INTERVAL
+        self.watches: Dict[str, DeviceWatch] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._busy: Dict[str, asyncio.Task] = {}  # 디바이스 -> 진행 중인 확인/복구 작업
+        self._tasks: set = set()                   # 상태 전송 (완료 전 가비지 컬렉션 방지)
+        self._test_crashed: set = set()            # 테스트 모드에서 종료된 것으로 가정한 헤드셋
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    # ---------- 시작 / 중지 ----------
+
+    def start(self, devices: Optional[List[str]] = None, interval: Optional[float] = None):
+        """감시 시작 (devices를 지정하지 않으면 기본 피코 IP 전체)"""
+        self.devices = devices
+        if interval:
+            self.interval = max(0.2, interval)
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+            self.logger.info(f"헤드셋 앱 감시 시작 ({self.interval:.1f}초 주기)")
+        self._changed()
+
+    async def stop(self):
+        """감시 중지 (진행 중인 복구도 취소)"""
+        tasks = list(self._busy.values()) + ([self._task] if self._task is not None else [])
+        if not tasks:
+            return
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._busy.clear()
+        self.logger.info("헤드셋 앱 감시 중지")
+        self._changed()
+
+    def simulate_crash(self, device_ip: str):
+        """테스트 모드에서 헤드셋 앱 종료 가정"""
+        if not TEST_MODE:
+            raise ValueError("테스트 모드에서만 사용할 수 있습니다")
+        self._test_crashed.add(device_ip)
+
+    def _targets(self) -> List[str]:
+        return list(self.experience_ctrl.devices if self.devices is None else self.devices)
+
+    async def _run(self):
+        """주기마다 확인/복구 중이 아닌 헤드셋 확인 (느린 헤드셋이 다른 헤드셋 확인을 늦추지 않도록 디바이스별 작업)"""
+        while True:
+            for device_ip in self._targets():
+                if device_ip not in self._busy:
+                    watch = self.watches.setdefault(device_ip, DeviceWatch(device_ip))
+                    self._track(device_ip, self._check(watch))
+            await asyncio.sleep(self.interval)
+
+    def _track(self, device_ip: str, coroutine: Awaitable):
+        task = self._busy[device_ip] = asyncio.create_task(coroutine)
+        task.add_done_callback(lambda _: self._busy.pop(device_ip, None) if self._busy.get(device_ip) is task else None)
+
+    # ---------- 확인 ----------
+
+    def _expected_down(self, watch: DeviceWatch) -> bool:
+        """운영자가 앱을 종료/설치/재부팅한 헤드셋이면 감시 보류 (다시 실행되면 감시 재개)"""
+        if watch.ip not in self.adb_ctrl.expected_down:
+            return False
+        self._set_state(watch, "idle")
+        return True
+
+    async def _check(self, watch: DeviceWatch):
+        if self._expected_down(watch):
+            return
+
+        if await self._heartbeat(watch.ip):
+            self._alive(watch)
+            return
+        if watch.state in ("idle", "failed"):
+            # 아직 실행하지 않았거나 운영자 확인을 기다리는 헤드셋 (하트비트가 돌아오면 다시 감시)
+            return
+
+        running = await self._app_running(watch.ip)
+        if running:
+            self._alive(watch)
+        elif running is None:
+            if watch.state != "unreachable":
+                self.logger.warning(f"{watch.ip} 헤드셋에 연결할 수 없음 (앱 감시 보류)")
+            self._set_state(watch, "unreachable")
+        elif not self._expected_down(watch):
+            # 확인하는 동안 운영자가 앱을 종료했을 수 있으므로 복구 직전에 다시 확인
+            await self._recover(watch)
+
+    async def _heartbeat(self, device_ip: str) -> bool:
+        """명령 채널 연결 확인 (이벤트 루프에서 비동기 연결, 헤드셋 전송 레인을 사용하지 않음)"""
+        if TEST_MODE:
+            return device_ip not in self._test_crashed
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(device_ip, settings.current.unity_server_port), HEARTBEAT_TIMEOUT
+            )
+        except (OSError, asyncio.TimeoutError):
+            return False
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+        return True
+
+    async def _app_running(self, device_ip: str) -> Optional[bool]:
+        """앱 프로세스 실행 여부 (pidof, 헤드셋에 연결할 수 없으면 None)"""
+        if TEST_MODE:
+            return device_ip not in self._test_crashed
+        package = shlex.quote(settings.current.package_name)
+        success, output = await self.adb_ctrl.run_shell(device_ip, f"pidof {package} || true")
+        if not success:
+            return None
+        return any(token.isdigit() for token in output.split())
+
+    def _alive(self, watch: DeviceWatch):
+        watch.last_alive = time.time()
+        if watch.state == "failed" and watch.detected_at is not None:
+            # 자동 복구에 실패한 뒤 운영자가 직접 앱을 실행한 경우
+            entry = watch.record_recovery(0, manual=True)
+            self.logger.success(f"{watch.ip} 앱 실행 확인 (수동 복구, {entry['mttr_s']:.1f}초)")
+        self._set_state(watch, "alive")
+
+    # ---------- 복구 ----------
+
+    async def _recover(self, watch: DeviceWatch):
+        """앱 다시 실행 후 명령 채널이 열릴 때까지 대기 (실패하면 간격을 늘려 재시도)"""
+        watch.detected_at = time.time()
+        watch.crashes += 1
+        self._set_state(watch, "recovering")
+        self.logger.warning(f"{watch.ip} 앱 종료 감지 - 앱 다시 실행")
+
+        package = settings.current.package_name
+        for attempt in range(1, RECOVERY_ATTEMPTS + 1):
+            if self._expected_down(watch):
+                # 복구 도중 운영자가 앱을 종료/설치/재부팅하면 재실행하지 않음
+                watch.detected_at = None
+                self.logger.info(f"{watch.ip} 운영자 조작으로 앱 복구 중단")
+                return
+            timings = await self.adb_ctrl.launch_app_timed(package, [watch.ip])
+            if timings.get(watch.ip) is not None:
+                self._test_crashed.discard(watch.ip)
+                if await self._wait_alive(watch.ip):
+                    entry = watch.record_recovery(attempt)
+                    watch.last_alive = time.time()
+                    self.logger.success(f"{watch.ip} 앱 복구 완료 ({entry['mttr_s']:.1f}초, {attempt}회 시도)")
+                    if self.experience_ctrl.running and watch.ip in self._experience_devices():
+                        # 재실행된 앱은 첫 장면에서 시작하므로 체험을 이어갈지는 운영자가 판단
+                        self.logger.warning(f"{watch.ip} 체험 도중 앱이 다시 시작됨 - 교육생 확인 필요")
+                    self._set_state(watch, "alive")
+                    return
+            if attempt < RECOVERY_ATTEMPTS:
+                await asyncio.sleep(RETRY_DELAY * attempt)
+
+        watch.failures += 1
+        self.logger.error(f"{watch.ip} 앱 복구 실패 ({RECOVERY_ATTEMPTS}회 시도) - 헤드셋 확인 필요")
+        self._set_state(watch, "failed")
+
+    async def _wait_alive(self, device_ip: str) -> bool:
+        """재실행한 앱의 명령 채널이 열릴 때까지 대기 (열리지 않으면 프로세스 실행 여부로 판단)"""
+        deadline = time.monotonic() + RECOVERY_TIMEOUT
+        while time.monotonic() < deadline:
+            if await self._heartbeat(device_ip):
+                return True
+            await asyncio.sleep(0.5)
+        return bool(await self._app_running(device_ip))
+
+    def _experience_devices(self) -> List[str]:
+        active = self.experience_ctrl.active_devices
+        return self.experience_ctrl.devices if active is None else active
+
+    # ---------- 상태 ----------
+
+    def _set_state(self, watch: DeviceWatch, state: str):
+        if watch.state != state:
+            watch.state = state
+            self._changed()
+
+    def _changed(self):
+        """대시보드에 상태 전송"""
+        task = asyncio.create_task(self.notify({"type": "watchdog", "watchdog": self.status()}))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def status(self) -> Dict[str, Any]:
+        """디바이스별 상태와 복구 기록 요약"""
+        recoveries = [r["mttr_s"] for watch in self.watches.values() for r in watch.recoveries]
+        detects = [r["detect_s"] for watch in self.watches.values() for r in watch.recoveries
+                   if r["detect_s"] is not None]
+        return {
+            "active": self.running,
+            "interval": self.interval,
+            "devices": {ip: watch.to_dict() for ip, watch in self.watches.items()},
+            "summary": {
+                "crashes": sum(watch.crashes for watch in self.watches.values()),
+                "recovered": len(recoveries),
+                "failures": sum(watch.failures for watch in self.watches.values()),
+                "mttr_mean": round(statistics.fmean(recoveries), 2) if recoveries else None,
+                "mttr_max": max(recoveries) if recoveries else None,
+                "detect_mean": round(statistics.fmean(detects), 2) if detects else None,
+            },
+        }
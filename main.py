@@ -5,6 +5,10 @@ VR 추락 시뮬레이터 컨트롤러 웹 앱
 # UTF-8 인코딩 설정 (한글 에러 메시지 처리를 위해)
 import sys
 import os
+import time
+
+# 시작 시간 측정 기준 시각 (다른 모든 import보다 먼저)
+STARTUP_ORIGIN = time.perf_counter()
 
 # 환경 변수를 가장 먼저 설정 (uvicorn 로깅에도 적용되도록)
 if sys.platform == 'win32':
@@ -18,26 +22,42 @@ if sys.platform == 'win32':
     if sys.stderr is not None and hasattr(sys.stderr, 'buffer'):
         sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, JSONResponse
-from typing import List, Optional
+# 빌드된 exe가 ADB 작업 프로세스로 실행된 경우 (서버 모듈을 불러오기 전에 분기)
+from controllers import adb_worker
+if adb_worker.WORKER_FLAG in sys.argv:
+    sys.exit(adb_worker.main())
+
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Body, Request
+from fastapi.responses import JSONResponse, Response
+from typing import Callable, Optional, Union
 import asyncio
-import uvicorn
 import json
-import webbrowser
 import threading
-import time
+import functools
+from contextlib import asynccontextmanager
 from pathlib import Path
 import signal
 import atexit
-import subprocess
 
 from config import *
 from controllers.simulator_controller import SimulatorController
 from controllers.experience_controller import ExperienceController
 from controllers.adb_controller import ADBController
 from utils.logger import Logger
+from utils.single_flight import SingleFlight
+from utils.startup_timer import StartupTimer, is_profile_startup
+from utils.port_guard import PortGuard, PortInUseError
+from utils.shutdown import CommandGate, ShutdownSequence, ShuttingDownError
+from utils.command_dispatcher import CommandDispatcher
+from utils.pubsub import PubSubHub, Subscription
+from utils.state_sync import StateSync
+from utils.loop_monitor import LoopMonitor
+from utils.command_lanes import command_lanes
+from utils.static_assets import StaticAssets, Asset
+from utils.launch_timing import launch_timings
+
+startup_timer = StartupTimer(STARTUP_ORIGIN)
+startup_timer.mark("imports")
 
 
 def safe_print(*args, **kwargs):
@@ -57,49 +77,38 @@ def safe_print(*args, **kwargs):
             pass
 
 
-def cleanup_port(port=8000):
-    """프로그램 종료 시 포트를 사용 중인 프로세스 종료"""
-    try:
-        # Windows에서 포트를 사용하는 프로세스 찾기
-        result = subprocess.run(
-            f'netstat -ano | findstr :{port}',
-            shell=True,
-            capture_output=True,
-            text=True
-        )
-        
-        if result.stdout:
-            # PID 추출 및 프로세스 종료
-            lines = result.stdout.strip().split('\n')
-            pids = set()
-            for line in lines:
-                parts = line.split()
-                if len(parts) >= 5:
-                    pid = parts[-1]
-                    if pid.isdigit():
-                        pids.add(pid)
-            
-            # 각 PID 종료
-            for pid in pids:
-                try:
-                    subprocess.run(f'taskkill /F /PID {pid}', shell=True, capture_output=True)
-                    safe_print(f"Port {port} process (PID: {pid}) terminated")
-                except:
-                    pass
-    except Exception as e:
-        safe_print(f"Port cleanup error: {e}")
+# 서버 포트 소유권 (잠금 파일 + 직접 바인드, 외부 도구 실행 없음)
+port_guard = PortGuard(SERVER_HOST, SERVER_PORT, EXE_DIR / "vrfall_controller.lock")
+
+# 실행 중인 uvicorn 서버 (이전 인스턴스 종료 요청 처리용)
+server = None
+
+
+# 종료 단계별 제한 시간 (초)
+DRAIN_TIMEOUT = 5.0       # 진행 중인 헤드셋/시뮬레이터 명령 완료 대기
+FINAL_RESET_TIMEOUT = 2.0  # 시뮬레이터 최종 RESET 전송
+CLOSE_TIMEOUT = 2.0        # 연결 및 adb 스트림 정리
+SAVE_TIMEOUT = 30.0        # 수집 중이던 성능/텔레메트리 데이터 저장 (긴 세션은 압축에 수 초 이상 걸림)
+WORKER_CLOSE_TIMEOUT = 5.0  # adb 작업 프로세스 종료 (셸 세션 정리, 응답 없으면 강제 종료)
+
+# 진행 중인 명령 추적 (종료 시 새 명령 차단 후 완료 대기)
+command_gate = CommandGate()
 
 
 def signal_handler(signum, frame):
-    """시그널 핸들러 - 프로세스 완전 종료"""
-    safe_print("\nShutting down...")
-    cleanup_port(SERVER_PORT)
-    # 프로세스 강제 종료 (확실한 종료 보장)
+    """시그널 핸들러 - 서버 실행 중이면 정상 종료 요청, 그 외에는 즉시 종료"""
+    if server is not None and not server.should_exit:
+        safe_print("\nShutting down...")
+        server.should_exit = True
+        return
+    
+    # 서버 시작 전이거나 이미 종료 순서가 진행/완료된 경우
+    port_guard.release()
     os._exit(0)
 
 
-# 프로그램 종료 시 자동으로 포트 정리
-atexit.register(cleanup_port, SERVER_PORT)
+# 프로그램 종료 시 자동으로 잠금 파일 정리
+atexit.register(port_guard.release)
 signal.signal(signal.SIGINT, signal_handler)  # Ctrl+C
 signal.signal(signal.SIGTERM, signal_handler)  # 종료 시그널
 
@@ -141,26 +150,265 @@ setup_console_for_frozen()
 BASE_PATH = get_base_path()
 STATIC_PATH = BASE_PATH / "static"
 
+
+async def shutdown_controllers() -> dict:
+    """정상 종료 순서: 새 명령 차단 -> 스케줄러/감시 중지 -> 진행 중 명령 완료 대기 -> 시뮬레이터 RESET -> 연결/세션 정리"""
+    sequence = ShutdownSequence(logger)
+    command_gate.close()
+    
+    async def stop_automation():
+        # 명령 게이트를 거치지 않고 체험 시작/앱 재실행을 하므로 완료 대기 전에 먼저 중지
+        if _watchdog is not None:
+            await _watchdog.stop()
+        if _scheduler is not None:
+            await _scheduler.stop()
+    
+    async def drain_commands():
+        remaining = await command_gate.drain(DRAIN_TIMEOUT)
+        if remaining:
+            raise RuntimeError(f"{remaining}개 명령이 완료되지 않음")
+    
+    async def final_reset():
+        # 체험 도중 종료되더라도 시뮬레이터를 안전한 상태로 되돌림
+        if simulator_ctrl.connected:
+            await simulator_ctrl.send_reset()
+    
+    async def save_captures():
+        # 수집 중이던 성능/텔레메트리 데이터는 저장 후 종료
+        if _perf_ctrl is not None and _perf_ctrl.running:
+            await _perf_ctrl.stop()
+        if _telemetry_ctrl is not None:
+            await _telemetry_ctrl.stop()
+    
+    async def close_streams():
+        if _mirror_ctrl is not None:
+            await _mirror_ctrl.stop()
+        if _logcat_ctrl is not None:
+            await _logcat_ctrl.stop()
+    
+    async def close_connections():
+        simulator_ctrl.disconnect()
+        if legacy_ws_server is not None:
+            legacy_ws_server.close()
+        await hub.close_all()
+        if legacy_ws_server is not None:
+            await legacy_ws_server.wait_closed()
+    
+    await sequence.phase("stop automation", stop_automation, CLOSE_TIMEOUT)
+    await sequence.phase("drain commands", drain_commands, DRAIN_TIMEOUT + 1.0)
+    await sequence.phase("final reset", final_reset, FINAL_RESET_TIMEOUT)
+    await sequence.phase("close connections", close_connections, CLOSE_TIMEOUT)
+    await sequence.phase("save captures", save_captures, SAVE_TIMEOUT)
+    await sequence.phase("close streams", close_streams, CLOSE_TIMEOUT)
+    await sequence.phase("close adb worker", adb_ctrl.close, WORKER_CLOSE_TIMEOUT)
+    await sequence.phase("save settings", settings.flush, CLOSE_TIMEOUT)
+    
+    report = sequence.report()
+    logger.info(f"종료 완료 ({report['total_ms']:.0f}ms)")
+    return report
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """앱 수명 주기 (설정 파일 감시, 종료 시 정상 종료 순서 실행)"""
+    global legacy_ws_server
+    loop_monitor.start()
+    # 정적 파일 압축을 미리 시작 (첫 접속 전에 brotli까지 준비)
+    asyncio.get_running_loop().run_in_executor(None, static_assets.refresh)
+    settings_watcher = asyncio.create_task(settings.watch())
+    legacy_ws_server = await start_legacy_ws_server()
+    # 첫 접속 클라이언트도 스냅샷으로 현재 설정과 시뮬레이터 상태를 받도록 초기 상태 기록
+    state_sync.record({"type": "config", **config_payload()})
+    state_sync.record({"type": "simulator_status", "status": "connected" if simulator_ctrl.connected else "disconnected"})
+    # 이전 실행에서 연결된 디바이스를 바로 표시하고 백그라운드에서 재연결
+    restore_task = None
+    if adb_ctrl.cache.entries:
+        state_sync.record({"type": "devices", "devices": adb_ctrl.devices})
+        restore_task = asyncio.create_task(restore_cached_devices())
+    yield
+    settings_watcher.cancel()
+    if restore_task is not None:
+        restore_task.cancel()
+    await shutdown_controllers()
+    loop_monitor.stop()
+    command_lanes.shutdown()
+
+
 # FastAPI 앱 초기화
-app = FastAPI(title="VR Fall Simulator Controller")
+app = FastAPI(title="VR Fall Simulator Controller", lifespan=lifespan)
+
 
-# 정적 파일 서빙
-app.mount("/static", StaticFiles(directory=str(STATIC_PATH)), name="static")
+@app.middleware("http")
+async def track_commands(request, call_next):
+    """명령(POST) 요청을 추적하고 종료 중에는 새 명령 거부"""
+    if request.method != "POST" or request.url.path == "/api/instance/shutdown":
+        return await call_next(request)
+    
+    try:
+        async with command_gate.track():
+            return await call_next(request)
+    except ShuttingDownError as e:
+        return JSONResponse({"success": False, "error": str(e)}, status_code=503)
+
+# 정적 파일 서빙 (미리 압축, 해시 주소, ETag/304)
+static_assets = StaticAssets(STATIC_PATH)
 
 # 컨트롤러 초기화
 logger = Logger()
 simulator_ctrl = SimulatorController(logger)
 experience_ctrl = ExperienceController(logger, simulator_ctrl)
 adb_ctrl = ADBController(logger)
-
-# WebSocket 연결 관리
-active_connections: List[WebSocket] = []
+loop_monitor = LoopMonitor(logger)  # 이벤트 루프 지연 / 느린 콜백 / 실행기 대기열
+startup_timer.mark("controllers")
+
+# 자주 쓰지 않는 컨트롤러는 처음 사용할 때 import (시작 시간 단축)
+_batch_ctrl = None
+_sync_ctrl = None
+_logcat_ctrl = None
+_perf_ctrl = None
+_mirror_ctrl = None
+_scheduler = None
+_launch_ctrl = None
+_telemetry_ctrl = None
+_watchdog = None
+
+
+def get_batch_ctrl():
+    """배치 작업 컨트롤러 (처음 사용할 때 생성)"""
+    global _batch_ctrl
+    if _batch_ctrl is None:
+        from controllers.batch_controller import BatchController
+        _batch_ctrl = BatchController(logger, adb_ctrl)
+    return _batch_ctrl
+
+
+def get_sync_ctrl():
+    """파일 동기화 컨트롤러 (처음 사용할 때 생성)"""
+    global _sync_ctrl
+    if _sync_ctrl is None:
+        from controllers.sync_controller import SyncController
+        _sync_ctrl = SyncController(logger, adb_ctrl)
+    return _sync_ctrl
+
+
+def get_logcat_ctrl():
+    """로그캣 컨트롤러 (처음 사용할 때 생성)"""
+    global _logcat_ctrl
+    if _logcat_ctrl is None:
+        from controllers.logcat_controller import LogcatController
+        _logcat_ctrl = LogcatController(logger, adb_ctrl, hub)
+    return _logcat_ctrl
+
+
+def get_perf_ctrl():
+    """렌더링 성능 수집 컨트롤러 (처음 사용할 때 생성, NumPy import 포함)"""
+    global _perf_ctrl
+    if _perf_ctrl is None:
+        from controllers.perf_controller import PerfController
+        _perf_ctrl = PerfController(logger, adb_ctrl, experience_ctrl, EXE_DIR / "perf_sessions")
+    return _perf_ctrl
+
+
+def get_mirror_ctrl():
+    """화면 미러링 컨트롤러 (처음 사용할 때 생성)"""
+    global _mirror_ctrl
+    if _mirror_ctrl is None:
+        from controllers.mirror_controller import MirrorController
+        _mirror_ctrl = MirrorController(logger, adb_ctrl, hub)
+    return _mirror_ctrl
+
+
+def get_telemetry_ctrl():
+    """시뮬레이터 텔레메트리 컨트롤러 (처음 사용할 때 생성, NumPy import 포함)"""
+    global _telemetry_ctrl
+    if _telemetry_ctrl is None:
+        from controllers.telemetry_controller import TelemetryController
+        _telemetry_ctrl = TelemetryController(logger, simulator_ctrl, experience_ctrl, hub, EXE_DIR / "telemetry_sessions")
+    return _telemetry_ctrl
+
+
+def get_launch_ctrl():
+    """앱 대기(cold/warm) 컨트롤러 (처음 사용할 때 생성)"""
+    global _launch_ctrl
+    if _launch_ctrl is None:
+        from controllers.launch_controller import LaunchController
+        _launch_ctrl = LaunchController(logger, adb_ctrl, experience_ctrl, broadcast)
+    return _launch_ctrl
+
+
+def get_scheduler():
+    """교육 세션 스케줄러 (처음 사용할 때 생성)"""
+    global _scheduler
+    if _scheduler is None:
+        from controllers.session_scheduler import SessionScheduler
+        _scheduler = SessionScheduler(logger, adb_ctrl, experience_ctrl, get_launch_ctrl(), broadcast)
+    return _scheduler
+
+
+def get_watchdog():
+    """헤드셋 앱 감시 컨트롤러 (처음 사용할 때 생성)"""
+    global _watchdog
+    if _watchdog is None:
+        from controllers.watchdog_controller import WatchdogController
+        _watchdog = WatchdogController(logger, adb_ctrl, experience_ctrl, broadcast)
+    return _watchdog
+
+# 실시간 전송 (/ws와 레거시 WebSocket 포트가 같은 허브를 공유, 토픽별로 구독한 클라이언트에만 전송)
+hub = PubSubHub()
+legacy_ws_server = None
+
+# 상태 메시지(디바이스, 시뮬레이터, 설정, 로그)의 버전 관리 (재접속 시 놓친 변경분만 전송)
+state_sync = StateSync()
+ws_command_tasks: set = set()  # 실행 중인 WebSocket 명령 (완료 전 가비지 컬렉션 방지)
+
+# 대시보드 명령 (HTTP POST /api/<명령>, WebSocket 명령 채널, 배치 실행이 모두 같은 디스패처 사용)
+dispatcher = CommandDispatcher(logger)
+
+# 동일 요청 병합 (여러 태블릿의 동시 스캔, 버튼 더블클릭 등)
+request_coalescer = SingleFlight()
+
+
+def single_flight(name: str, ttl: Union[float, Callable[[], float]] = 0.0):
+    """동시에 들어온 같은 요청(이름 + 요청 데이터)은 한 번만 실행하고 결과를 공유
+
+    ttl이 0보다 크면 결과를 그 시간 동안 캐시 (request_coalescer.invalidate(name)으로 무효화)
+    ttl에 함수를 넘기면 요청마다 호출하여 현재 설정 값을 사용
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = name + ":" + json.dumps([args, kwargs], sort_keys=True, default=str)
+            cache_ttl = ttl() if callable(ttl) else ttl
+            return await request_coalescer.run(key, lambda: func(*args, **kwargs), cache_ttl)
+        return wrapper
+    return decorator
+
+
+def asset_response(request: Request, asset: Asset, immutable: bool) -> Response:
+    """정적 파일 응답 (Accept-Encoding에 맞는 압축본, If-None-Match가 일치하면 304)"""
+    status, body, headers = static_assets.respond(
+        asset, immutable,
+        request.headers.get("accept-encoding", ""),
+        request.headers.get("if-none-match", "")
+    )
+    return Response(body, status_code=status, headers=headers)
 
 
 @app.get("/")
-async def root():
-    """메인 페이지 제공"""
-    return FileResponse(str(STATIC_PATH / "index.html"))
+async def root(request: Request):
+    """메인 페이지 제공 (정적 파일 주소는 해시 주소로 바뀌어 있음, 매번 재검증)"""
+    static_assets.refresh()
+    return asset_response(request, static_assets.index_asset, immutable=False)
+
+
+@app.get("/static/{path:path}")
+async def get_static(path: str, request: Request):
+    """정적 파일 제공 (해시 주소는 1년 캐시, 해시 없는 주소는 매번 재검증)"""
+    static_assets.refresh()
+    asset, immutable = static_assets.lookup(path)
+    if asset is None:
+        return JSONResponse({"detail": "Not Found"}, status_code=404)
+    return asset_response(request, asset, immutable)
 
 
 @app.get("/api/test_mode")
@@ -169,27 +417,125 @@ async def get_test_mode():
     return {"enabled": TEST_MODE}
 
 
+def config_payload() -> dict:
+    """대시보드에 전달하는 설정 값"""
+    current = settings.current
+    return {
+        "package_name": current.package_name,
+        "simulator_host": current.simulator_host,
+        "simulator_port": current.simulator_port,
+        "server_port": current.server_port,
+        "standby_mode": current.standby_mode
+    }
+
+
 @app.get("/api/config")
 async def get_config():
     """설정 값 가져오기"""
-    return {
-        "package_name": DEFAULT_PACKAGE_NAME,
-        "simulator_host": SIMULATOR_HOST,
-        "simulator_port": SIMULATOR_PORT,
-        "server_port": SERVER_PORT
-    }
+    return config_payload()
+
+
+# 대시보드에서 변경할 수 있는 설정
+EDITABLE_SETTINGS = {"simulator_host", "simulator_port", "package_name", "pico_ips", "scan_cache_ttl", "standby_mode"}
+
+
+@dispatcher.command("config")
+async def update_config(data: dict):
+    """설정 값 변경 (즉시 반영, 파일 저장은 백그라운드에서)"""
+    try:
+        changes = {key: value for key, value in data.items() if key in EDITABLE_SETTINGS}
+        if not changes:
+            return {"success": False, "error": "변경할 설정이 없습니다"}
+        
+        if "pico_ips" in changes and not TEST_MODE:
+            # 일반 모드에서는 스캔된 디바이스만 사용하므로 저장하지 않음
+            del changes["pico_ips"]
+        
+        settings.update(**changes)
+        await broadcast_log("info", f"설정 변경: {', '.join(changes)}")
+        return {"success": True, **config_payload()}
+    except ValueError as e:
+        return {"success": False, "error": str(e)}
+
+
+def on_settings_changed(old, new):
+    """설정이 바뀌면 (API 또는 config.ini 직접 수정) 모든 대시보드에 알림"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    asyncio.ensure_future(broadcast({"type": "config", **config_payload()}))
+
+
+settings.subscribe(on_settings_changed)
+
+
+@app.get("/api/instance")
+async def get_instance():
+    """실행 중인 컨트롤러 인스턴스 정보 (재시작 시 이전 인스턴스 식별용)
+
+    종료 토큰은 잠금 파일에만 기록하고 응답에는 포함하지 않음
+    """
+    return {"pid": os.getpid()}
+
+
+LOOPBACK_HOSTS = {"127.0.0.1", "::1", "localhost"}
+
+
+@app.post("/api/instance/shutdown")
+async def shutdown_instance(request: Request, data: dict):
+    """새로 시작한 인스턴스의 종료 요청 처리 (같은 PC에서 토큰이 일치할 때만)"""
+    client_host = request.client.host if request.client else None
+    if client_host not in LOOPBACK_HOSTS or data.get("token") != port_guard.token or server is None:
+        return JSONResponse({"success": False, "error": "잘못된 종료 요청"}, status_code=403)
+    
+    safe_print("Shutdown requested by new instance")
+    server.should_exit = True
+    return {"success": True}
+
+
+@app.get("/api/diagnostics/startup")
+async def get_startup_profile():
+    """시작 단계별 소요 시간"""
+    return startup_timer.report()
+
+
+@app.get("/api/diagnostics/loop")
+async def get_loop_stats():
+    """이벤트 루프 지연, 느린 콜백(스택 포함), 실행기 대기열"""
+    return loop_monitor.report()
+
+
+@app.get("/api/diagnostics/lanes")
+async def get_lane_stats():
+    """명령 레인별 대기/지연 시간 (priority: 시뮬레이터 안전 명령)"""
+    return command_lanes.report()
+
+
+@app.get("/api/diagnostics/adb_worker")
+async def get_adb_worker_status():
+    """ADB 작업 프로세스 상태 (PID, 가동 시간, 재시작/처리/실패 수, 대기 중인 요청 수)"""
+    return adb_ctrl.worker.status()
+
+
+@dispatcher.command("diagnostics/restart_adb_worker")
+async def restart_adb_worker(data: dict):
+    """ADB 작업 프로세스 재시작 (진행 중인 ADB 작업만 실패하고 시뮬레이터 연결은 유지)"""
+    await adb_ctrl.worker.restart()
+    return {"success": True, **adb_ctrl.worker.status()}
 
 
 # ==================== 시뮬레이터 API ====================
 
-@app.post("/api/simulator/connect")
+@dispatcher.command("simulator/connect")
 async def connect_simulator(data: dict):
     """시뮬레이터 연결"""
     try:
-        ip = data.get("ip", SIMULATOR_HOST)
-        port = data.get("port", SIMULATOR_PORT)
+        ip = data.get("ip", settings.current.simulator_host)
+        port = data.get("port", settings.current.simulator_port)
         
         success = await simulator_ctrl.connect(ip, port)
+        request_coalescer.invalidate("simulator/scan")
         
         if success:
             await broadcast({
@@ -206,11 +552,12 @@ async def connect_simulator(data: dict):
         return {"success": False, "error": str(e)}
 
 
-@app.post("/api/simulator/disconnect")
-async def disconnect_simulator():
+@dispatcher.command("simulator/disconnect")
+async def disconnect_simulator(data: dict):
     """시뮬레이터 연결 해제"""
     try:
         simulator_ctrl.disconnect()
+        request_coalescer.invalidate("simulator/scan")
         await broadcast({
             "type": "simulator_status",
             "status": "disconnected"
@@ -221,8 +568,9 @@ async def disconnect_simulator():
         return {"success": False, "error": str(e)}
 
 
-@app.post("/api/simulator/scan")
-async def scan_simulator():
+@dispatcher.command("simulator/scan")
+@single_flight("simulator/scan", ttl=lambda: settings.current.scan_cache_ttl)
+async def scan_simulator(data: dict):
     """시뮬레이터 스캔"""
     try:
         await broadcast_log("info", "시뮬레이터 스캔 중...")
@@ -238,32 +586,45 @@ async def scan_simulator():
         return {"success": False, "error": str(e)}
 
 
-@app.post("/api/simulator/elevator_up")
+@dispatcher.command("simulator/elevator_up")
 async def elevator_up(data: dict):
     """엘리베이터 상승 신호"""
     try:
         duration = data.get("duration", 5)
+        experience_ctrl.mark("ELEVATOR_UP")
         success = await simulator_ctrl.send_elevator_up(duration)
         return {"success": success}
     except Exception as e:
         return {"success": False, "error": str(e)}
 
 
-@app.post("/api/simulator/fall")
+@dispatcher.command("simulator/fall")
 async def fall(data: dict):
     """추락 신호"""
     try:
         duration = data.get("duration", 3)
+        experience_ctrl.mark("FALL")
         success = await simulator_ctrl.send_fall(duration)
         return {"success": success}
     except Exception as e:
         return {"success": False, "error": str(e)}
 
 
+@dispatcher.command("simulator/reset")
+async def reset_simulator(data: dict):
+    """시뮬레이터 리셋 신호"""
+    try:
+        success = await simulator_ctrl.send_reset()
+        return {"success": success}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
 # ==================== 체험 제어 API ====================
 
-@app.post("/api/experience/start")
-async def start_experience():
+@dispatcher.command("experience/start")
+@single_flight("experience/start")
+async def start_experience(data: dict):
     """체험 시작"""
     try:
         success = await experience_ctrl.start()
@@ -275,8 +636,9 @@ async def start_experience():
         return {"success": False, "error": str(e)}
 
 
-@app.post("/api/experience/pause")
-async def pause_experience():
+@dispatcher.command("experience/pause")
+@single_flight("experience/pause")
+async def pause_experience(data: dict):
     """체험 일시정지"""
     try:
         success = await experience_ctrl.pause()
@@ -285,8 +647,9 @@ async def pause_experience():
         return {"success": False, "error": str(e)}
 
 
-@app.post("/api/experience/resume")
-async def resume_experience():
+@dispatcher.command("experience/resume")
+@single_flight("experience/resume")
+async def resume_experience(data: dict):
     """체험 재개"""
     try:
         success = await experience_ctrl.resume()
@@ -295,8 +658,9 @@ async def resume_experience():
         return {"success": False, "error": str(e)}
 
 
-@app.post("/api/experience/stop")
-async def stop_experience():
+@dispatcher.command("experience/stop")
+@single_flight("experience/stop")
+async def stop_experience(data: dict):
     """체험 종료"""
     try:
         success = await experience_ctrl.stop()
@@ -307,7 +671,7 @@ async def stop_experience():
         return {"success": False, "error": str(e)}
 
 
-@app.post("/api/experience/mode")
+@dispatcher.command("experience/mode")
 async def set_experience_mode(data: dict):
     """제어 모드 설정 (auto/manual)"""
     try:
@@ -320,8 +684,9 @@ async def set_experience_mode(data: dict):
 
 # ==================== ADB 디바이스 API ====================
 
-@app.post("/api/devices/scan")
-async def scan_devices():
+@dispatcher.command("devices/scan")
+@single_flight("devices/scan", ttl=lambda: settings.current.scan_cache_ttl)
+async def scan_devices(data: dict):
     """피코 디바이스 스캔"""
     try:
         devices = await adb_ctrl.scan_devices()
@@ -335,7 +700,21 @@ async def scan_devices():
         return {"success": False, "error": str(e), "devices": []}
 
 
-@app.post("/api/devices/install")
+async def restore_cached_devices():
+    """캐시된 디바이스 재연결 후 목록 갱신"""
+    try:
+        devices = await adb_ctrl.reconnect_cached()
+        request_coalescer.invalidate("devices/scan")
+        await broadcast({
+            "type": "devices",
+            "devices": devices
+        })
+    except Exception as e:
+        await broadcast_log("error", f"디바이스 재연결 오류: {str(e)}")
+
+
+@dispatcher.command("devices/install")
+@single_flight("devices/install")
 async def install_apk(data: dict):
     """APK 설치"""
     try:
@@ -349,7 +728,8 @@ async def install_apk(data: dict):
         return {"success": False, "error": str(e)}
 
 
-@app.post("/api/devices/uninstall")
+@dispatcher.command("devices/uninstall")
+@single_flight("devices/uninstall")
 async def uninstall_apk(data: dict):
     """APK 삭제"""
     try:
@@ -362,20 +742,43 @@ async def uninstall_apk(data: dict):
         return {"success": False, "error": str(e)}
 
 
-@app.post("/api/devices/launch")
+@dispatcher.command("devices/launch")
+@single_flight("devices/launch")
 async def launch_app(data: dict):
     """앱 실행"""
     try:
         package_name = data.get("package_name")
         devices = data.get("devices", "all")
         
-        success = await adb_ctrl.launch_app(package_name, devices)
-        return {"success": success}
+        timings = await adb_ctrl.launch_app_timed(package_name, devices)
+        await get_launch_ctrl().notify_timings()
+        return {"success": any(t is not None for t in timings.values()), "timings": timings}
     except Exception as e:
         return {"success": False, "error": str(e)}
 
 
-@app.post("/api/devices/stop")
+@dispatcher.command("devices/prepare")
+@single_flight("devices/prepare")
+async def prepare_app(data: dict):
+    """다음 체험을 위한 앱 준비 (mode: cold - 강제 종료 후 재실행 / warm - 장면만 초기화, 생략하면 설정 값)"""
+    try:
+        devices = adb_ctrl.resolve_devices(data.get("devices", "all"))
+        if not devices:
+            return {"success": False, "error": "대상 디바이스가 없습니다"}
+        results = await get_launch_ctrl().prepare(devices, data.get("mode"), data.get("package_name"))
+        return {"success": all(r["success"] for r in results.values()), "devices": results}
+    except ValueError as e:
+        return {"success": False, "error": str(e)}
+
+
+@app.get("/api/launch/timings")
+async def get_launch_timings():
+    """콜드 시작(am start -W TotalTime) / 웜 리셋(장면 초기화 응답) 시간 요약과 디바이스별 마지막 기록"""
+    return launch_timings.report()
+
+
+@dispatcher.command("devices/stop")
+@single_flight("devices/stop")
 async def stop_app(data: dict):
     """앱 종료"""
     try:
@@ -388,25 +791,384 @@ async def stop_app(data: dict):
         return {"success": False, "error": str(e)}
 
 
-@app.post("/api/devices/reboot")
+@dispatcher.command("devices/push")
+async def push_file(data: dict):
+    """파일 전송 (OBB, 에셋 등)"""
+    try:
+        local_path = data.get("local_path")
+        remote_path = data.get("remote_path")
+        devices = data.get("devices", "all")
+        
+        success = await adb_ctrl.push_file(local_path, remote_path, devices)
+        return {"success": success}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
+@dispatcher.command("devices/batch")
+async def run_batch(data: dict):
+    """배치 작업 실행 (설치/전송/삭제/실행/종료 단계를 디바이스별 파이프라인으로 실행)"""
+    try:
+        steps = data.get("steps", [])
+        devices = data.get("devices", "all")
+        max_transfers = data.get("max_transfers", 4)
+        
+        await broadcast_log("info", f"배치 작업 시작: {len(steps)}단계")
+        result = await get_batch_ctrl().run(steps, devices, max_transfers)
+        
+        level = "success" if result["success"] else "error"
+        await broadcast_log(level, f"배치 작업 완료 (총 소요 시간 {result['makespan']:.1f}초)")
+        return result
+    except Exception as e:
+        await broadcast_log("error", f"배치 작업 오류: {str(e)}")
+        return {"success": False, "error": str(e)}
+
+
+@dispatcher.command("devices/sync")
+async def sync_files(data: dict):
+    """로컬 디렉토리를 디바이스에 동기화 (변경된 파일만 전송)"""
+    try:
+        local_dir = data.get("local_dir")
+        remote_dir = data.get("remote_dir")
+        devices = data.get("devices", "all")
+        max_devices = data.get("max_devices", 4)
+        delete = data.get("delete", False)
+        
+        await broadcast_log("info", f"파일 동기화 시작: {local_dir} -> {remote_dir}")
+        result = await get_sync_ctrl().sync(local_dir, remote_dir, devices, max_devices, delete)
+        
+        pushed = sum(r.get("pushed", 0) for r in result["devices"].values())
+        level = "success" if result["success"] else "error"
+        await broadcast_log(level, f"파일 동기화 완료: {pushed}개 파일 전송")
+        return result
+    except Exception as e:
+        await broadcast_log("error", f"파일 동기화 오류: {str(e)}")
+        return {"success": False, "error": str(e)}
+
+
+@dispatcher.command("devices/reboot")
+@single_flight("devices/reboot")
 async def reboot_devices(data: dict):
     """디바이스 재부팅"""
     try:
         devices = data.get("devices", "all")
         
         success = await adb_ctrl.reboot_devices(devices)
+        # 재부팅된 디바이스는 목록에서 사라지므로 스캔 캐시 무효화
+        request_coalescer.invalidate("devices/scan")
         return {"success": success}
     except Exception as e:
         return {"success": False, "error": str(e)}
 
 
+# ==================== 로그캣 API ====================
+
+@dispatcher.command("logcat/start")
+async def start_logcat(data: dict):
+    """디바이스 로그캣 스트림 시작 (filters: ["Unity:W", ...], priority: V/D/I/W/E/F)"""
+    try:
+        devices = adb_ctrl.resolve_devices(data.get("devices", "all"))
+        started = get_logcat_ctrl().start(devices, data.get("filters"), data.get("priority", "I"))
+        return {"success": bool(started), "devices": started}
+    except ValueError as e:
+        return {"success": False, "error": str(e)}
+
+
+@dispatcher.command("logcat/stop")
+async def stop_logcat(data: dict):
+    """디바이스 로그캣 스트림 중지"""
+    stopped = await get_logcat_ctrl().stop(data.get("devices", "all"))
+    return {"success": True, "devices": stopped}
+
+
+@app.get("/api/logcat")
+async def get_logcat_status():
+    """실행 중인 로그캣 스트림"""
+    return {"streams": get_logcat_ctrl().status()}
+
+
+@app.get("/api/logcat/recent")
+async def get_logcat_recent(device: str, limit: int = 200):
+    """디바이스 링 버퍼의 최근 로그"""
+    return {"device": device, "lines": get_logcat_ctrl().recent(device, limit)}
+
+
+# ==================== 화면 미러링 API ====================
+
+@dispatcher.command("mirror/start")
+async def start_mirror(data: dict):
+    """헤드셋 화면 썸네일 전송 시작 (interval: 디바이스별 캡처 주기 초, mirror 토픽 구독자에게만 전송)"""
+    devices = adb_ctrl.resolve_devices(data.get("devices", "all"))
+    started = get_mirror_ctrl().start(devices, float(data.get("interval", 2.0)))
+    return {"success": bool(devices), "devices": started}
+
+
+@dispatcher.command("mirror/stop")
+async def stop_mirror(data: dict):
+    """헤드셋 화면 썸네일 전송 중지"""
+    stopped = await get_mirror_ctrl().stop(data.get("devices", "all"))
+    return {"success": True, "devices": stopped}
+
+
+@app.get("/api/mirror")
+async def get_mirror_status():
+    """미러링 중인 디바이스별 전송/생략/오류 수"""
+    return get_mirror_ctrl().status()
+
+
+# ==================== 시뮬레이터 텔레메트리 API ====================
+
+@dispatcher.command("telemetry/start")
+async def start_telemetry(data: dict):
+    """모션 플랫폼 텔레메트리 수신 시작 (port: UDP 포트, 생략하면 설정 값)"""
+    try:
+        port = await get_telemetry_ctrl().start(int(data.get("port") or settings.current.telemetry_port))
+        return {"success": True, "port": port}
+    except (OSError, ValueError) as e:
+        return {"success": False, "error": str(e)}
+
+
+@dispatcher.command("telemetry/stop")
+async def stop_telemetry(data: dict):
+    """텔레메트리 수신 중지 (기록 중인 체험은 저장)"""
+    await get_telemetry_ctrl().stop()
+    return {"success": True}
+
+
+@app.get("/api/telemetry")
+async def get_telemetry_status():
+    """수신 상태 (수신율, 버퍼 크기, 빠진 프레임 수, 기록 중인 세션)"""
+    return get_telemetry_ctrl().status()
+
+
+@app.get("/api/telemetry/recent")
+async def get_telemetry_recent(seconds: float = 10.0):
+    """최근 구간의 최소/최대 축소 값"""
+    return get_telemetry_ctrl().recent(min(seconds, 60.0))
+
+
+@app.get("/api/telemetry/sessions")
+async def list_telemetry_sessions():
+    """저장된 체험별 텔레메트리 목록"""
+    return {"sessions": get_telemetry_ctrl().list_sessions()}
+
+
+@app.get("/api/telemetry/sessions/{session_id}")
+async def get_telemetry_session(session_id: str):
+    """체험별 요약 (명령별 반응 시간, 최고 속도, 이동 거리)"""
+    summary = get_telemetry_ctrl().load_session(session_id)
+    if summary is None:
+        return JSONResponse({"success": False, "error": "세션을 찾을 수 없습니다"}, status_code=404)
+    return summary
+
+
+# ==================== 세션 스케줄러 API ====================
+
+@dispatcher.command("scheduler/enqueue")
+async def enqueue_trainee(data: dict):
+    """교육생 대기열 추가"""
+    name = str(data.get("name", "")).strip()
+    if not name:
+        return {"success": False, "error": "교육생 이름이 필요합니다"}
+    return {"success": True, "trainee": get_scheduler().enqueue(name)}
+
+
+@dispatcher.command("scheduler/remove")
+async def remove_trainee(data: dict):
+    """교육생 대기열에서 제거"""
+    return {"success": get_scheduler().remove(int(data.get("id", 0)))}
+
+
+@dispatcher.command("scheduler/sets")
+async def set_headset_sets(data: dict):
+    """헤드셋 세트 지정 (sets: 세트 이름 -> 디바이스 IP 목록, 비우면 기본 피코 IP 전체를 세트 하나로 사용)"""
+    try:
+        get_scheduler().set_headset_sets(data.get("sets") or {})
+        return {"success": True}
+    except ValueError as e:
+        return {"success": False, "error": str(e)}
+
+
+@dispatcher.command("scheduler/start")
+async def start_scheduler(data: dict):
+    """세션 스케줄링 시작 (auto_start, max_duration: 체험 최대 초, turnover: 체험 후 정리 초)"""
+    max_duration = data.get("max_duration")
+    turnover = data.get("turnover")
+    get_scheduler().start(
+        bool(data.get("auto_start", False)),
+        float(max_duration) if max_duration else None,
+        float(turnover) if turnover is not None else None
+    )
+    return {"success": True}
+
+
+@dispatcher.command("scheduler/stop")
+async def stop_scheduler(data: dict):
+    """세션 스케줄링 중지 (진행 중인 체험은 계속)"""
+    await get_scheduler().stop()
+    return {"success": True}
+
+
+@dispatcher.command("scheduler/begin")
+async def begin_session(data: dict):
+    """탑승 확인 - 다음 세션을 장비가 비는 즉시 시작"""
+    success = get_scheduler().begin()
+    return {"success": success} if success else {"success": False, "error": "준비 중인 세션이 없습니다"}
+
+
+@dispatcher.command("scheduler/finish")
+async def finish_session(data: dict):
+    """진행 중인 세션의 체험 종료"""
+    return {"success": await get_scheduler().finish()}
+
+
+@app.get("/api/scheduler")
+async def get_scheduler_status():
+    """대기열, 진행 중인 세션, 헤드셋 세트"""
+    return get_scheduler().status()
+
+
+@app.get("/api/scheduler/report")
+async def get_scheduler_report():
+    """처리량 보고 (시간당 세션 수, 단계별 소요 시간, 세션 사이 장비 유휴 시간)"""
+    return get_scheduler().report()
+
+
+# ==================== 앱 감시 API ====================
+
+@dispatcher.command("watchdog/start")
+async def start_watchdog(data: dict):
+    """헤드셋 앱 감시 시작 (devices: 감시할 헤드셋, "all"이면 기본 피코 IP 전체, interval: 하트비트 주기 초)"""
+    devices = data.get("devices", "all")
+    interval = data.get("interval")
+    get_watchdog().start(
+        None if devices == "all" else adb_ctrl.resolve_devices(devices),
+        float(interval) if interval else None
+    )
+    return {"success": True}
+
+
+@dispatcher.command("watchdog/stop")
+async def stop_watchdog(data: dict):
+    """헤드셋 앱 감시 중지"""
+    await get_watchdog().stop()
+    return {"success": True}
+
+
+@dispatcher.command("watchdog/simulate_crash")
+async def simulate_app_crash(data: dict):
+    """테스트 모드에서 헤드셋 앱 종료 가정 (감지/복구 확인용)"""
+    device = data.get("device")
+    if not device:
+        return {"success": False, "error": "대상 디바이스가 없습니다"}
+    try:
+        get_watchdog().simulate_crash(device)
+        return {"success": True}
+    except ValueError as e:
+        return {"success": False, "error": str(e)}
+
+
+@app.get("/api/watchdog")
+async def get_watchdog_status():
+    """헤드셋별 앱 상태, 크래시/복구 횟수, 평균 복구 시간(MTTR)"""
+    return get_watchdog().status()
+
+
+# ==================== 성능 수집 API ====================
+
+@dispatcher.command("perf/start")
+async def start_perf_capture(data: dict):
+    """헤드셋 렌더링 성능 수집 시작 (interval: CPU/GPU 샘플 주기 초)"""
+    try:
+        devices = adb_ctrl.resolve_devices(data.get("devices", "all"))
+        session_id = get_perf_ctrl().start(devices, float(data.get("interval", 1.0)))
+        await broadcast_log("info", f"성능 수집 시작: {session_id}")
+        return {"success": True, "session_id": session_id}
+    except (RuntimeError, ValueError) as e:
+        return {"success": False, "error": str(e)}
+
+
+@dispatcher.command("perf/stop")
+async def stop_perf_capture(data: dict):
+    """성능 수집 종료 후 세션 요약 반환"""
+    try:
+        summary = await get_perf_ctrl().stop()
+        await broadcast_log("success", f"성능 수집 저장: {summary['session_id']}")
+        return {"success": True, "summary": summary}
+    except RuntimeError as e:
+        return {"success": False, "error": str(e)}
+
+
+@app.get("/api/perf/sessions")
+async def list_perf_sessions():
+    """저장된 성능 수집 세션 목록"""
+    perf_ctrl = get_perf_ctrl()
+    return {"running": perf_ctrl.session_id, "sessions": perf_ctrl.list_sessions()}
+
+
+@app.get("/api/perf/sessions/{session_id}")
+async def get_perf_session(session_id: str):
+    """성능 수집 세션 요약 (헤드셋별 드롭 프레임, 백분위, 구간별 통계)"""
+    summary = get_perf_ctrl().load_session(session_id)
+    if summary is None:
+        return JSONResponse({"success": False, "error": "세션을 찾을 수 없습니다"}, status_code=404)
+    return summary
+
+
+# ==================== 배치 ====================
+
+@dispatcher.command("batch")
+async def run_batch_commands(data: dict):
+    """여러 명령을 한 번의 요청으로 실행 (리스트로 묶은 명령은 동시에 실행)"""
+    try:
+        operations = data.get("operations", [])
+        stop_on_error = data.get("stop_on_error", False)
+        
+        if not operations:
+            return {"success": False, "error": "실행할 명령이 없습니다", "results": []}
+        
+        return await dispatcher.run_batch(operations, stop_on_error)
+    except Exception as e:
+        await broadcast_log("error", f"배치 실행 오류: {str(e)}")
+        return {"success": False, "error": str(e), "results": []}
+
+
+def make_command_endpoint(name: str):
+    """명령을 실행하는 HTTP 엔드포인트 생성"""
+    async def endpoint(data: Optional[dict] = Body(default=None)):
+        return await dispatcher.dispatch(name, data)
+    endpoint.__name__ = "command_" + name.replace("/", "_")
+    endpoint.__doc__ = dispatcher.handlers[name].__doc__
+    return endpoint
+
+
+def add_command_routes():
+    """등록된 명령마다 POST /api/<명령> 엔드포인트 추가 (WebSocket 명령과 같은 디스패처 사용)"""
+    for name in dispatcher.handlers:
+        app.add_api_route(f"/api/{name}", make_command_endpoint(name), methods=["POST"])
+
+
+add_command_routes()
+
+
 # ==================== WebSocket ====================
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
-    """WebSocket 연결 처리"""
+    """WebSocket 연결 처리
+
+    서버 -> 클라이언트: 구독한 토픽(logs, devices, simulator, telemetry, system)의 상태/로그
+                      (연결 직후에는 모든 토픽 구독)
+    클라이언트 -> 서버: {"type": "sync", "epoch": ..., "version": ...}
+                      -> 스냅샷 {"type": "snapshot", ...} 또는 놓친 변경분 {"type": "replay", "messages": [...]}
+                      (상태 메시지에는 "version"이 붙으며, 처음 접속할 때는 epoch 없이 전송)
+                      {"type": "subscribe" | "unsubscribe", "topics": ["logs", ...]}
+                      (mirror 토픽은 "rates": {"mirror": 2}로 초당 최대 썸네일 수 지정)
+                      {"type": "command", "id": ..., "op": "experience/start", "data": {...}}
+                      -> {"type": "response", "id": ..., "op": ..., "result": {...}}
+    """
     await websocket.accept()
-    active_connections.append(websocket)
+    subscription = hub.add(websocket.send_text, websocket.close)
     
     try:
         # 초기 상태 전송
@@ -418,20 +1180,86 @@ async def websocket_endpoint(websocket: WebSocket):
         # 메시지 수신 대기
         while True:
             data = await websocket.receive_text()
-            # 필요시 클라이언트로부터의 메시지 처리
+            await handle_client_message(subscription, data)
             
     except WebSocketDisconnect:
-        active_connections.remove(websocket)
-
+        pass
+    finally:
+        hub.remove(subscription)
 
 
-async def broadcast(message: dict):
-    """모든 WebSocket 클라이언트에 메시지 브로드캐스트"""
-    for connection in active_connections:
+async def handle_client_message(subscription: Subscription, data: str):
+    """클라이언트 메시지 처리 (/ws와 레거시 WebSocket 포트 공통)"""
+    try:
+        message = json.loads(data)
+    except json.JSONDecodeError:
+        return
+    if not isinstance(message, dict):
+        return
+    
+    message_type = message.get("type")
+    topics = message.get("topics") or []
+    
+    if message_type == "sync":
         try:
-            await connection.send_json(message)
-        except:
+            version = int(message.get("version") or 0)
+        except (TypeError, ValueError):
+            version = 0
+        try:
+            await subscription.send(json.dumps(state_sync.sync(message.get("epoch"), version), ensure_ascii=False))
+        except Exception:
             pass
+    elif message_type == "subscribe":
+        rates = message.get("rates")
+        hub.subscribe(subscription, topics, rates if isinstance(rates, dict) else None)
+    elif message_type == "unsubscribe":
+        hub.unsubscribe(subscription, topics)
+    elif message_type == "command":
+        # 오래 걸리는 명령이 다음 메시지 수신을 막지 않도록 별도 태스크로 실행
+        task = asyncio.create_task(handle_ws_command(subscription, message))
+        ws_command_tasks.add(task)
+        task.add_done_callback(ws_command_tasks.discard)
+
+
+async def handle_ws_command(subscription: Subscription, message: dict):
+    """WebSocket 명령 실행 후 같은 id로 응답"""
+    name = message.get("op", "")
+    
+    try:
+        async with command_gate.track():
+            result = await dispatcher.dispatch(name, message.get("data"))
+    except ShuttingDownError as e:
+        result = {"success": False, "error": str(e)}
+    
+    try:
+        await subscription.send(json.dumps({
+            "type": "response",
+            "id": message.get("id"),
+            "op": name,
+            "result": result
+        }, ensure_ascii=False))
+    except Exception:
+        # 응답 전에 연결이 끊어진 경우
+        pass
+
+
+async def start_legacy_ws_server():
+    """레거시 WebSocket 포트(WEBSOCKET_PORT) 열기 (0이면 사용 안 함, 실패해도 메인 서버는 계속 실행)"""
+    port = settings.current.websocket_port
+    if port <= 0:
+        return None
+    
+    try:
+        import websocket_server
+        return await websocket_server.serve(hub, settings.current.server_host, port, handle_client_message)
+    except Exception as e:
+        logger.warning(f"WebSocket 포트 {port}을(를) 열 수 없습니다: {str(e)}")
+        return None
+
+
+async def broadcast(message: dict, topic: str = None):
+    """토픽 구독 클라이언트에 메시지 브로드캐스트 (토픽 생략 시 메시지 type으로 결정)"""
+    await hub.publish(state_sync.record(message), topic)
 
 
 async def broadcast_log(level: str, message: str):
@@ -441,21 +1269,68 @@ async def broadcast_log(level: str, message: str):
         "type": "log",
         "level": level,
         "message": message
-    })
+    }, "logs")
 
 
 # ==================== 서버 시작 ====================
 
 def open_browser():
-    """서버 시작 후 브라우저 자동 실행"""
-    time.sleep(1.5)  # 서버 시작 대기
+    """브라우저 자동 실행 (서버가 요청을 받을 수 있게 된 직후 호출)"""
+    import webbrowser
     webbrowser.open(f'http://localhost:{SERVER_PORT}')
 
+
+def create_server():
+    """uvicorn 서버 생성 (시작 완료 시점에 브라우저 실행 및 시작 시간 기록)"""
+    import uvicorn
+
+    class ControllerServer(uvicorn.Server):
+        async def shutdown(self, sockets=None):
+            # 연결 종료를 기다리기 전에 새 명령부터 차단
+            command_gate.close()
+            await super().shutdown(sockets=sockets)
+        
+        async def startup(self, sockets=None):
+            await super().startup(sockets=sockets)
+            if not self.started:
+                return
+            startup_timer.mark("server ready")
+            if is_profile_startup():
+                safe_print(startup_timer.format_report())
+            if '--no-browser' not in sys.argv:
+                # 브라우저 실행이 이벤트 루프를 막지 않도록 별도 스레드에서 실행
+                threading.Thread(target=open_browser, daemon=True).start()
+
+    config = uvicorn.Config(
+        app,
+        host=SERVER_HOST,
+        port=SERVER_PORT,
+        log_level="info",
+        access_log=False,  # 한글 에러 방지를 위해 액세스 로그 비활성화
+        timeout_graceful_shutdown=int(DRAIN_TIMEOUT)  # 응답하지 않는 연결은 제한 시간 후 정리
+    )
+    return ControllerServer(config)
+
+
+def report_startup_error(message: str):
+    """시작 실패 알림 (빌드된 exe는 콘솔이 없으므로 로그 파일에 기록하고 메시지 창 표시)"""
+    safe_print(f"Server start error: {message}")
+    logger.error(f"서버 시작 실패: {message}")
+    if sys.platform == 'win32' and getattr(sys, 'frozen', False):
+        import ctypes
+        MB_ICONERROR = 0x10
+        ctypes.windll.user32.MessageBoxW(None, f"서버를 시작할 수 없습니다.\n\n{message}",
+                                         "VR Fall Simulator Controller", MB_ICONERROR)
+
+
 if __name__ == "__main__":
-    # 시작 전 포트 정리 (이전 실행이 비정상 종료된 경우 대비)
-    safe_print("Cleaning up port...")
-    cleanup_port(SERVER_PORT)
-    time.sleep(0.5)  # 포트 해제 대기
+    # 서버 포트 확보 (이전 실행이 비정상 종료된 경우 그 인스턴스만 정리)
+    try:
+        server_socket = port_guard.acquire()
+    except PortInUseError as e:
+        report_startup_error(str(e))
+        os._exit(1)
+    startup_timer.mark("port acquire")
     
     # 시작 배너 출력 (콘솔이 있는 경우만)
     try:
@@ -470,9 +1345,6 @@ if __name__ == "__main__":
         # PyInstaller 윈도우 모드에서는 콘솔 출력 무시
         pass
     
-    # 브라우저 자동 실행 (별도 스레드)
-    threading.Thread(target=open_browser, daemon=True).start()
-    
     # uvicorn 로깅 설정 (UTF-8 지원)
     import logging
     logging.basicConfig(
@@ -485,22 +1357,16 @@ if __name__ == "__main__":
     
     # WebSocket 서버 실행
     try:
-        uvicorn.run(
-            app,
-            host=SERVER_HOST,
-            port=SERVER_PORT,
-            log_level="info",
-            access_log=False  # 한글 에러 방지를 위해 액세스 로그 비활성화
-        )
+        server = create_server()
+        server.run(sockets=[server_socket])
     except KeyboardInterrupt:
         # Ctrl+C로 종료
         safe_print("\nServer stopped by user")
     except Exception as e:
         safe_print(f"Server start error: {e}")
     finally:
-        # 종료 시 포트 정리 및 프로세스 완전 종료
+        # 정상 종료 순서(lifespan)가 끝난 뒤 잠금 파일 정리 및 프로세스 종료
+        # (남아 있는 실행기 스레드가 종료를 막지 않도록 os._exit 사용)
         safe_print("Cleaning up and exiting...")
-        cleanup_port(SERVER_PORT)
-        # 프로세스 강제 종료
+        port_guard.release()
         os._exit(0)
-
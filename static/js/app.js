@@ -3,11 +3,40 @@ let ws = null;
 let controlMode = 'auto';
 let selectedDevices = new Set();
 
+// WebSocket 명령 채널 (응답 대기 중인 명령: id -> {resolve})
+let nextCommandId = 1;
+const pendingCommands = new Map();
+
+// 상태 동기화 (서버 epoch와 마지막으로 반영한 상태 버전, 동기화 응답 전에 도착한 상태 메시지는 보류)
+let stateEpoch = null;
+let stateVersion = 0;
+let stateSyncing = false;
+let heldMessages = [];
+
+// 헤드셋 로그캣 (보는 중일 때만 logcat 토픽 구독)
+let logcatViewing = false;
+const LOGCAT_MAX_LINES = 500;
+
+// 헤드셋 화면 썸네일 (보는 중일 때만 mirror 토픽 구독, 초당 최대 수신 개수 지정)
+let mirrorViewing = false;
+const MIRROR_RATE = 4;
+
+// 플랫폼 텔레메트리 (보는 중일 때만 telemetry 토픽 구독, 최근 TELEMETRY_WINDOW초의 최소/최대 구간 표시)
+let telemetryViewing = false;
+let telemetryPoints = [];
+const TELEMETRY_WINDOW = 10;
+
+// 세션 스케줄러 / 앱 감시 실행 여부 (서버 상태 메시지로 갱신)
+let schedulerActive = false;
+let watchdogActive = false;
+
 // 페이지 로드 시 초기화
 document.addEventListener('DOMContentLoaded', () => {
     connectWebSocket();
     checkTestMode();
     loadConfig();  // 설정 로드 추가
+    loadLaunchTimings();
+    setInterval(refreshLoopStats, 2000);  // 서버 상태 갱신
     log('info', '웹 인터페이스 초기화 완료');
 });
 
@@ -20,6 +49,19 @@ function connectWebSocket() {
 
     ws.onopen = () => {
         log('success', 'WebSocket 연결됨');
+        // 연결 직후에는 모든 토픽을 받으므로, 화면에 표시하지 않는 토픽은 구독 해제
+        const hidden = [];
+        if (!telemetryViewing) hidden.push('telemetry');
+        if (!logcatViewing) hidden.push('logcat');
+        if (!mirrorViewing) hidden.push('mirror');
+        ws.send(JSON.stringify({ type: 'unsubscribe', topics: hidden }));
+        if (mirrorViewing) {
+            ws.send(JSON.stringify({ type: 'subscribe', topics: ['mirror'], rates: { mirror: MIRROR_RATE } }));
+        }
+        // 마지막으로 받은 버전을 알려 놓친 변경분(또는 스냅샷)을 받음
+        stateSyncing = true;
+        heldMessages = [];
+        ws.send(JSON.stringify({ type: 'sync', epoch: stateEpoch, version: stateVersion }));
     };
 
     ws.onmessage = (event) => {
@@ -32,6 +74,10 @@ function connectWebSocket() {
     };
 
     ws.onclose = () => {
+        // 응답을 받지 못한 명령은 실패 처리 (중복 실행을 피하기 위해 재전송하지 않음)
+        pendingCommands.forEach(({ resolve }) => resolve(null));
+        pendingCommands.clear();
+
         log('warning', 'WebSocket 연결 끊김. 5초 후 재연결 시도...');
         setTimeout(connectWebSocket, 5000);
     };
@@ -39,6 +85,18 @@ function connectWebSocket() {
 
 // WebSocket 메시지 처리
 function handleWebSocketMessage(data) {
+    // 스냅샷/변경분 응답은 동기화 자체이므로 버전 확인 없이 바로 반영
+    const isSyncReply = data.type === 'snapshot' || data.type === 'replay';
+    if (data.version !== undefined && !isSyncReply) {
+        if (stateSyncing) {
+            heldMessages.push(data);
+            return;
+        }
+        // 이미 반영한 변경분은 무시
+        if (data.version <= stateVersion) return;
+        stateVersion = data.version;
+    }
+
     switch (data.type) {
         case 'log':
             log(data.level, data.message);
@@ -52,11 +110,96 @@ function handleWebSocketMessage(data) {
         case 'test_mode':
             updateTestMode(data.enabled);
             break;
+        case 'config':
+            applyConfig(data);
+            break;
+        case 'response':
+            resolveCommand(data);
+            break;
+        case 'logcat':
+            appendLogcat(data);
+            break;
+        case 'mirror':
+            updateMirror(data);
+            break;
+        case 'scheduler':
+            updateScheduler(data.scheduler);
+            break;
+        case 'watchdog':
+            updateWatchdog(data.watchdog);
+            break;
+        case 'telemetry':
+            appendTelemetry(data);
+            break;
+        case 'launch_timings':
+            updateLaunchTimings(data.summary);
+            break;
+        case 'snapshot':
+            applySnapshot(data);
+            break;
+        case 'replay':
+            applyReplay(data);
+            break;
     }
 }
 
-// API 요청 함수
+// 스냅샷 적용 (첫 접속 또는 서버 재시작/오래된 버전으로 재접속한 경우)
+function applySnapshot(data) {
+    const state = data.state;
+    if (state.config) applyConfig(state.config);
+    if (state.simulator_status) updateSimulatorStatus(state.simulator_status);
+    if (state.devices) updateDeviceList(state.devices);
+    if (state.scheduler) updateScheduler(state.scheduler);
+    if (state.watchdog) updateWatchdog(state.watchdog);
+    (state.logs || []).forEach(entry => log(entry.level, entry.message));
+    stateVersion = data.version;
+    finishSync(data);
+}
+
+// 놓친 변경분 적용
+function applyReplay(data) {
+    stateSyncing = false;
+    data.messages.forEach(message => handleWebSocketMessage(message));
+    finishSync(data);
+}
+
+// 동기화 완료 후 보류했던 메시지 중 새 버전만 반영
+function finishSync(data) {
+    stateEpoch = data.epoch;
+    stateVersion = Math.max(stateVersion, data.version);
+    stateSyncing = false;
+    const held = heldMessages;
+    heldMessages = [];
+    held.forEach(message => handleWebSocketMessage(message));
+}
+
+// WebSocket으로 명령 전송 (응답은 같은 id로 도착)
+function sendCommand(op, data) {
+    return new Promise((resolve) => {
+        const id = nextCommandId++;
+        pendingCommands.set(id, { resolve });
+        ws.send(JSON.stringify({ type: 'command', id, op, data: data || {} }));
+    });
+}
+
+function resolveCommand(message) {
+    const pending = pendingCommands.get(message.id);
+    if (pending) {
+        pendingCommands.delete(message.id);
+        pending.resolve(message.result);
+    }
+}
+
+// API 요청 함수 (명령은 열려 있는 WebSocket으로, 그 외에는 HTTP로 전송)
 async function apiRequest(endpoint, method = 'GET', data = null) {
+    if (method === 'POST' && ws && ws.readyState === WebSocket.OPEN) {
+        const result = await sendCommand(endpoint, data);
+        if (result === null) {
+            log('error', `명령 응답 없음 (연결 끊김): ${endpoint}`);
+        }
+        return result;
+    }
+
     try {
         const options = {
             method,
@@ -224,7 +367,7 @@ function updateDeviceList(devices) {
             <input type="checkbox" class="device-checkbox" ${selectedDevices.has(device.ip) ? 'checked' : ''} onchange="event.stopPropagation(); toggleDevice('${device.ip}')">
             <div class="device-info">
                 <div class="device-ip">${device.ip}</div>
-                <div class="device-status">${device.status}</div>
+                <div class="device-status">${device.model ? device.model + ' · ' : ''}${device.app_version ? 'v' + device.app_version + ' · ' : ''}${device.status === 'cached' ? '재연결 중' : device.status}</div>
             </div>
         </div>
     `).join('');
@@ -363,6 +506,38 @@ async function stopApp() {
     }
 }
 
+// 여러 명령을 한 번의 요청으로 실행 (배열로 묶은 명령은 서버에서 동시에 실행)
+async function runBatch(operations, stopOnError = true) {
+    return await apiRequest('batch', 'POST', { operations, stop_on_error: stopOnError });
+}
+
+// 세션 리셋: 앱 준비 + 시뮬레이터 리셋 → 제어 모드 재설정
+async function resetSession() {
+    const packageName = document.getElementById('packageName').value;
+    if (!packageName) {
+        log('error', '패키지 이름을 입력하세요');
+        return;
+    }
+
+    const devices = getTargetDevices();
+    log('info', '세션 리셋 중...');
+
+    // 앱 준비(콜드 재실행 또는 웜 장면 초기화)와 시뮬레이터 리셋을 동시에
+    const result = await runBatch([
+        [
+            { op: 'devices/prepare', data: { package_name: packageName, devices } },
+            { op: 'simulator/reset' }
+        ],
+        { op: 'experience/mode', data: { mode: controlMode } }
+    ]);
+
+    if (result && result.success) {
+        log('success', `세션 리셋 완료 (${result.duration.toFixed(1)}초)`);
+    } else if (result) {
+        log('error', '세션 리셋 실패');
+    }
+}
+
 async function rebootDevices() {
     if (!confirm('선택된 디바이스를 재부팅하시겠습니까?')) {
         return;
@@ -398,6 +573,287 @@ function log(level, message) {
     }
 }
 
+// 헤드셋 로그캣 시작 (필터는 디바이스에서 적용)
+async function startLogcat() {
+    const filters = document.getElementById('logcatFilters').value.split(/[\s,]+/).filter(f => f);
+    const devices = getTargetDevices();
+
+    logcatViewing = true;
+    if (ws && ws.readyState === WebSocket.OPEN) {
+        ws.send(JSON.stringify({ type: 'subscribe', topics: ['logcat'] }));
+    }
+
+    const result = await apiRequest('logcat/start', 'POST', { devices, filters });
+    if (result && result.success) {
+        log('success', `로그캣 시작: ${result.devices.length}개 디바이스`);
+    } else if (result) {
+        log('error', result.error || '로그캣을 시작할 수 없습니다');
+    }
+}
+
+async function stopLogcat() {
+    logcatViewing = false;
+    if (ws && ws.readyState === WebSocket.OPEN) {
+        ws.send(JSON.stringify({ type: 'unsubscribe', topics: ['logcat'] }));
+    }
+    await apiRequest('logcat/stop', 'POST', { devices: 'all' });
+}
+
+// 로그캣 줄 추가 (화면에는 최근 LOGCAT_MAX_LINES줄만 유지)
+function appendLogcat(data) {
+    const logcatWindow = document.getElementById('logcatWindow');
+    const levels = { E: 'error', F: 'error', W: 'warning', I: 'info', D: 'info', V: 'info' };
+    const fragment = document.createDocumentFragment();
+
+    data.lines.forEach(line => {
+        const entry = document.createElement('div');
+        entry.className = 'log-entry';
+        entry.innerHTML = `
+            <span class="log-time">${line.time.split(' ')[1]}</span>
+            <span class="logcat-device">${data.device}</span>
+            <span class="log-message log-${levels[line.level]}"></span>
+        `;
+        entry.lastElementChild.textContent = `${line.level}/${line.tag}: ${line.message}`;
+        fragment.appendChild(entry);
+    });
+
+    if (data.dropped) {
+        const entry = document.createElement('div');
+        entry.className = 'log-entry';
+        entry.innerHTML = `<span class="log-message log-warning">${data.device}: ${data.dropped}줄 생략 (GET /api/logcat/recent)</span>`;
+        fragment.appendChild(entry);
+    }
+
+    logcatWindow.appendChild(fragment);
+    while (logcatWindow.childElementCount > LOGCAT_MAX_LINES) {
+        logcatWindow.removeChild(logcatWindow.firstElementChild);
+    }
+    logcatWindow.scrollTop = logcatWindow.scrollHeight;
+}
+
+// 헤드셋 화면 미러링 시작 (변경된 화면만 썸네일로 수신)
+async function startMirror() {
+    const devices = getTargetDevices();
+
+    mirrorViewing = true;
+    if (ws && ws.readyState === WebSocket.OPEN) {
+        ws.send(JSON.stringify({ type: 'subscribe', topics: ['mirror'], rates: { mirror: MIRROR_RATE } }));
+    }
+
+    const result = await apiRequest('mirror/start', 'POST', { devices, interval: 2 });
+    if (result && result.success) {
+        log('success', `화면 미러링 시작: ${result.devices.length}개 디바이스`);
+    } else if (result) {
+        log('error', result.error || '화면 미러링을 시작할 수 없습니다');
+    }
+}
+
+async function stopMirror() {
+    mirrorViewing = false;
+    if (ws && ws.readyState === WebSocket.OPEN) {
+        ws.send(JSON.stringify({ type: 'unsubscribe', topics: ['mirror'] }));
+    }
+    await apiRequest('mirror/stop', 'POST', { devices: 'all' });
+    document.getElementById('mirrorGrid').innerHTML = '';
+}
+
+// 디바이스별 썸네일 갱신 (디바이스마다 img 하나를 재사용)
+function updateMirror(data) {
+    const grid = document.getElementById('mirrorGrid');
+    let item = grid.querySelector(`[data-device="${data.device}"]`);
+    if (!item) {
+        item = document.createElement('div');
+        item.className = 'mirror-item';
+        item.dataset.device = data.device;
+        item.innerHTML = '<img class="mirror-image" alt=""><div class="mirror-label"></div>';
+        item.lastElementChild.textContent = data.device;
+        grid.appendChild(item);
+    }
+    const image = item.firstElementChild;
+    image.src = data.image;
+    image.width = data.width;
+    image.height = data.height;
+    item.title = `${data.device} (${new Date(data.time * 1000).toLocaleTimeString()})`;
+}
+
+// 플랫폼 텔레메트리 수신 시작 (최근 구간을 먼저 받아 그린 뒤 실시간 갱신)
+async function startTelemetry() {
+    const result = await apiRequest('telemetry/start', 'POST', {});
+    if (!result || !result.success) {
+        log('error', (result && result.error) || '텔레메트리를 시작할 수 없습니다');
+        return;
+    }
+    log('success', `텔레메트리 수신 시작 (UDP ${result.port})`);
+
+    telemetryViewing = true;
+    telemetryPoints = [];
+    const recent = await apiRequest(`telemetry/recent?seconds=${TELEMETRY_WINDOW}`);
+    if (recent) appendTelemetry(recent);
+    if (ws && ws.readyState === WebSocket.OPEN) {
+        ws.send(JSON.stringify({ type: 'subscribe', topics: ['telemetry'] }));
+    }
+}
+
+async function stopTelemetry() {
+    telemetryViewing = false;
+    if (ws && ws.readyState === WebSocket.OPEN) {
+        ws.send(JSON.stringify({ type: 'unsubscribe', topics: ['telemetry'] }));
+    }
+    await apiRequest('telemetry/stop', 'POST', {});
+}
+
+function appendTelemetry(data) {
+    for (let i = 0; i < data.time.length; i++) {
+        telemetryPoints.push([data.time[i], data.position_min[i], data.position_max[i]]);
+    }
+    const cutoff = (telemetryPoints.length ? telemetryPoints[telemetryPoints.length - 1][0] : 0) - TELEMETRY_WINDOW;
+    const firstKept = telemetryPoints.findIndex(point => point[0] >= cutoff);
+    if (firstKept > 0) telemetryPoints.splice(0, firstKept);
+    drawTelemetry();
+}
+
+// 위치(높이)의 구간별 최소~최대를 세로선으로 표시
+function drawTelemetry() {
+    const canvas = document.getElementById('telemetryChart');
+    const context = canvas.getContext('2d');
+    context.clearRect(0, 0, canvas.width, canvas.height);
+    if (telemetryPoints.length < 2) return;
+
+    const end = telemetryPoints[telemetryPoints.length - 1][0];
+    let low = Infinity, high = -Infinity;
+    telemetryPoints.forEach(([, min, max]) => { low = Math.min(low, min); high = Math.max(high, max); });
+    const range = Math.max(high - low, 0.1);
+    const x = (time) => (1 - (end - time) / TELEMETRY_WINDOW) * canvas.width;
+    const y = (value) => canvas.height - 8 - ((value - low) / range) * (canvas.height - 16);
+
+    context.strokeStyle = '#3B82F6';
+    context.lineWidth = 2;
+    context.beginPath();
+    telemetryPoints.forEach(([time, min, max]) => {
+        context.moveTo(x(time), y(min));
+        context.lineTo(x(time), y(max) - 1);
+    });
+    context.stroke();
+
+    document.getElementById('telemetryRate').textContent = `높이 ${low.toFixed(2)} ~ ${high.toFixed(2)}m`;
+}
+
+// 교육생 대기열 추가
+async function enqueueTrainee() {
+    const input = document.getElementById('traineeName');
+    const name = input.value.trim();
+    if (!name) return;
+
+    const result = await apiRequest('scheduler/enqueue', 'POST', { name });
+    if (result && result.success) {
+        input.value = '';
+    } else if (result) {
+        log('error', result.error || '대기열에 추가할 수 없습니다');
+    }
+}
+
+async function removeTrainee(id) {
+    await apiRequest('scheduler/remove', 'POST', { id });
+}
+
+// 세션 스케줄 시작/중지 (대시보드에서는 안전을 위해 항상 탑승 확인 후 시작)
+async function toggleScheduler() {
+    if (schedulerActive) {
+        await apiRequest('scheduler/stop', 'POST', {});
+    } else {
+        await apiRequest('scheduler/start', 'POST', { auto_start: false });
+    }
+}
+
+async function beginSession() {
+    const result = await apiRequest('scheduler/begin', 'POST', {});
+    if (result && !result.success) {
+        log('warning', result.error || '준비 중인 세션이 없습니다');
+    }
+}
+
+const SESSION_STATUS_LABELS = {
+    prep: '헤드셋 준비 중',
+    ready: '탑승 대기',
+    running: '체험 중',
+    turnover: '장비 정리 중',
+};
+
+// 대기열/세션/처리량 표시
+function updateScheduler(scheduler) {
+    schedulerActive = scheduler.active;
+    document.getElementById('schedulerToggle').textContent = scheduler.active ? '⏹️ 스케줄 중지' : '▶️ 스케줄 시작';
+    document.getElementById('sessionsPerHour').textContent = scheduler.sessions_per_hour.toFixed(1);
+    document.getElementById('sessionsCompleted').textContent = scheduler.completed;
+    document.getElementById('rigIdle').textContent = `${scheduler.rig_idle_mean.toFixed(1)}초`;
+
+    const list = document.getElementById('sessionList');
+    const fragment = document.createDocumentFragment();
+    const addItem = (name, status, onRemove) => {
+        const item = document.createElement('div');
+        item.className = 'session-item';
+        item.innerHTML = '<span></span><span class="session-status"></span>';
+        item.firstElementChild.textContent = name;
+        item.lastElementChild.textContent = status;
+        if (onRemove) {
+            item.lastElementChild.style.cursor = 'pointer';
+            item.lastElementChild.title = '대기열에서 제거';
+            item.lastElementChild.onclick = onRemove;
+        }
+        fragment.appendChild(item);
+    };
+
+    scheduler.sessions.forEach(session => {
+        let status = `${SESSION_STATUS_LABELS[session.status] || session.status} (${session.headset_set})`;
+        if (session.status === 'ready' && session.begin_requested) status += ' - 탑승 확인됨';
+        if (session.not_ready.length) status += ` - 미준비 ${session.not_ready.length}대`;
+        addItem(session.trainee, status);
+    });
+    scheduler.queue.forEach((trainee, index) => {
+        addItem(trainee.name, `대기 ${index + 1}번 ✕`, () => removeTrainee(trainee.id));
+    });
+    list.replaceChildren(fragment);
+}
+
+async function toggleWatchdog() {
+    if (watchdogActive) {
+        await apiRequest('watchdog/stop', 'POST', {});
+    } else {
+        await apiRequest('watchdog/start', 'POST', { devices: 'all' });
+    }
+}
+
+const WATCHDOG_STATE_LABELS = {
+    idle: '앱 실행 전',
+    alive: '정상',
+    recovering: '앱 다시 실행 중',
+    unreachable: '연결 끊김',
+    failed: '복구 실패 - 확인 필요',
+};
+
+// 헤드셋별 앱 상태와 복구 시간 표시
+function updateWatchdog(watchdog) {
+    watchdogActive = watchdog.active;
+    document.getElementById('watchdogToggle').textContent = watchdog.active ? '⏹️ 감시 중지' : '▶️ 감시 시작';
+    const summary = watchdog.summary;
+    document.getElementById('watchdogCrashes').textContent = summary.crashes;
+    document.getElementById('watchdogRecovered').textContent = `${summary.recovered} / 실패 ${summary.failures}`;
+    document.getElementById('watchdogMttr').textContent = summary.mttr_mean === null ? '-' : `${summary.mttr_mean.toFixed(1)}초`;
+
+    const fragment = document.createDocumentFragment();
+    Object.entries(watchdog.devices).forEach(([ip, device]) => {
+        const item = document.createElement('div');
+        item.className = 'session-item';
+        item.innerHTML = '<span></span><span class="session-status"></span>';
+        item.firstElementChild.textContent = ip;
+        let status = WATCHDOG_STATE_LABELS[device.state] || device.state;
+        if (device.crashes) status += ` (종료 ${device.crashes}회, MTTR ${device.mttr_mean === null ? '-' : device.mttr_mean.toFixed(1) + '초'})`;
+        item.lastElementChild.textContent = status;
+        fragment.appendChild(item);
+    });
+    document.getElementById('watchdogList').replaceChildren(fragment);
+}
+
 function clearLogs() {
     const logWindow = document.getElementById('logWindow');
     logWindow.innerHTML = '';
@@ -416,21 +872,76 @@ async function checkTestMode() {
 async function loadConfig() {
     const result = await apiRequest('config');
     if (result) {
-        // 패키지 이름 설정
-        if (result.package_name) {
-            document.getElementById('packageName').value = result.package_name;
-        }
+        applyConfig(result);
+        log('success', '설정 로드 완료');
+    }
+}
 
-        // 시뮬레이터 IP/포트 설정
-        if (result.simulator_host) {
-            document.getElementById('simulatorIp').value = result.simulator_host;
-        }
-        if (result.simulator_port) {
-            document.getElementById('simulatorPort').value = result.simulator_port;
-        }
+// 설정 값 반영 (초기 로드 및 서버의 설정 변경 알림)
+function applyConfig(config) {
+    // 패키지 이름 설정
+    if (config.package_name) {
+        document.getElementById('packageName').value = config.package_name;
+    }
 
-        log('success', '설정 로드 완료');
+    // 시뮬레이터 IP/포트 설정
+    if (config.simulator_host) {
+        document.getElementById('simulatorIp').value = config.simulator_host;
     }
+    if (config.simulator_port) {
+        document.getElementById('simulatorPort').value = config.simulator_port;
+    }
+    if (config.standby_mode) {
+        document.getElementById('standbyMode').value = config.standby_mode;
+    }
+}
+
+// 세션 리셋 방식 변경 (cold / warm)
+async function setStandbyMode(mode) {
+    const result = await apiRequest('config', 'POST', { standby_mode: mode });
+    if (result && !result.success) {
+        log('error', result.error || '세션 리셋 방식을 변경할 수 없습니다');
+    }
+}
+
+// 콜드 시작 / 웜 리셋 시간 표시
+async function loadLaunchTimings() {
+    const result = await apiRequest('launch/timings');
+    if (result) updateLaunchTimings(result.summary);
+}
+
+function updateLaunchTimings(summary) {
+    const format = (stats) => stats.count ? `${(stats.p50 / 1000).toFixed(2)}초 / ${(stats.max / 1000).toFixed(2)}초` : '-';
+    document.getElementById('coldStart').textContent = format(summary.cold);
+    document.getElementById('warmStart').textContent = format(summary.warm);
+}
+
+// 서버 상태 갱신 (서버에 연결할 수 없으면 조용히 건너뜀)
+async function refreshLoopStats() {
+    let stats;
+    try {
+        const response = await fetch('/api/diagnostics/loop');
+        stats = await response.json();
+    } catch (error) {
+        return;
+    }
+
+    const lag = stats.lag_ms;
+    const slow = stats.slow_callbacks;
+    const executor = stats.executor;
+
+    document.getElementById('loopLag').textContent = `${lag.avg}ms / ${lag.p99}ms`;
+    document.getElementById('loopLagMax').textContent = `${lag.max}ms`;
+
+    const slowEl = document.getElementById('slowCallbacks');
+    slowEl.textContent = `${slow.count}회 (>${slow.threshold_ms}ms)`;
+    slowEl.classList.toggle('stat-warning', slow.count > 0);
+    const latest = slow.recent[slow.recent.length - 1];
+    slowEl.title = latest && latest.stack ? latest.stack.join('\n') : '';
+
+    const executorEl = document.getElementById('executorQueue');
+    executorEl.textContent = `${executor.threads}/${executor.max_workers} · 대기 ${executor.queued}`;
+    executorEl.classList.toggle('stat-warning', executor.queued > 0);
 }
 
 function updateTestMode(enabled) {
@@ -0,0 +1,90 @@
+"""
+명령 디스패처
+이름으로 등록된 명령 실행 및 여러 명령을 한 번에 처리하는 배치 실행
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Union
+from utils.logger import Logger
+
+CommandHandler = Callable[[dict], Awaitable[Any]]
+
+# 배치 안에서 실행할 수 없는 명령 (배치 안의 배치는 중첩 깊이 제한 없이 재귀 실행됨)
+BATCH_EXCLUDED = {"batch"}
+
+
+class CommandDispatcher:
+    def __init__(self, logger: Logger):
+        self.logger = logger
+        self.handlers: Dict[str, CommandHandler] = {}
+
+    def register(self, name: str, handler: CommandHandler):
+        """명령 등록 (handler는 요청 데이터 dict를 받아 결과 dict를 반환)"""
+        self.handlers[name] = handler
+
+    def command(self, name: str):
+        """명령 등록 데코레이터"""
+        def decorator(handler: CommandHandler) -> CommandHandler:
+            self.register(name, handler)
+            return handler
+        return decorator
+
+    async def dispatch(self, name: str, data: dict = None) -> Any:
+        """명령 실행 (알 수 없는 명령이나 예외는 실패 결과로 반환)"""
+        handler = self.handlers.get(name)
+        if handler is None:
+            return {"success": False, "error": f"알 수 없는 명령: {name}"}
+
+        try:
+            return await handler(data or {})
+        except Exception as e:
+            self.logger.error(f"명령 실행 오류 ({name}): {str(e)}")
+            return {"success": False, "error": str(e)}
+
+    async def _run_operation(self, operation: Dict[str, Any]) -> Dict[str, Any]:
+        """배치 내 명령 하나 실행"""
+        name = operation.get("op", "")
+        start = time.perf_counter()
+        if name in BATCH_EXCLUDED:
+            result = {"success": False, "error": f"배치 안에서 실행할 수 없는 명령: {name}"}
+        else:
+            result = await self.dispatch(name, operation.get("data"))
+        return {
+            "op": name,
+            "result": result,
+            "duration": round(time.perf_counter() - start, 3),
+        }
+
+    async def run_batch(self, operations: List[Union[Dict[str, Any], List[Dict[str, Any]]]],
+                        stop_on_error: bool = False) -> Dict[str, Any]:
+        """여러 명령을 한 번에 실행
+
+        operations의 각 항목은 순서대로 실행되며, 항목이 리스트이면 그 안의 명령은 동시에 실행
+        예: [[{"op": "devices/stop"}, {"op": "simulator/reset"}], {"op": "devices/launch"}]
+        stop_on_error가 True이면 실패한 단계 이후의 명령은 건너뜀
+        """
+        start = time.perf_counter()
+        results: List[Any] = []
+        failed = False
+
+        for stage in operations:
+            group = stage if isinstance(stage, list) else [stage]
+
+            if failed and stop_on_error:
+                skipped = [{"op": op.get("op", ""), "result": {"success": False, "error": "skipped"}, "duration": 0.0}
+                           for op in group]
+                results.append(skipped if isinstance(stage, list) else skipped[0])
+                continue
+
+            stage_results = await asyncio.gather(*(self._run_operation(op) for op in group))
+
+            if any(isinstance(r["result"], dict) and r["result"].get("success") is False for r in stage_results):
+                failed = True
+
+            results.append(list(stage_results) if isinstance(stage, list) else stage_results[0])
+
+        return {
+            "success": not failed,
+            "results": results,
+            "duration": round(time.perf_counter() - start, 3),
+        }
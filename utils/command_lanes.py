@@ -0,0 +1,142 @@
+"""
+명령 실행 레인
+블로킹 소켓 작업을 용도별 전용 스레드 풀(레인)에서 실행하여
+시뮬레이터 안전 명령(FALL, ELEVATOR_STOP, RESET)이 헤드셋 대량 전송 뒤에 밀리지 않도록 함
+"""
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict
+
+# 레인별 스레드 수
+#   simulator: 시뮬레이터 소켓 전용 (명령 순서 유지를 위해 1개)
+#   devices: 헤드셋 대량 전송 (30대 동시 전송)
+LANES: Dict[str, int] = {
+    "simulator": 1,
+    "devices": 32,
+}
+
+# 우선 명령이 실행 중이면 새 작업 투입을 잠시 멈추는 레인
+BULK_LANES = ("devices",)
+
+
+class LaneStats:
+    """레인(또는 우선 명령)의 대기/실행 시간 기록"""
+
+    def __init__(self, history: int = 200):
+        self.count = 0
+        self.waits: Deque[float] = deque(maxlen=history)      # 호출 -> 스레드에서 실행 시작
+        self.latencies: Deque[float] = deque(maxlen=history)  # 호출 -> 완료
+
+    def record(self, wait: float, latency: float):
+        self.count += 1
+        self.waits.append(wait)
+        self.latencies.append(latency)
+
+    @staticmethod
+    def _summary(samples: Deque[float]) -> Dict[str, float]:
+        if not samples:
+            return {"p50": 0.0, "p99": 0.0, "max": 0.0}
+        ordered = sorted(samples)
+        return {
+            "p50": round(ordered[len(ordered) // 2] * 1000, 2),
+            "p99": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000, 2),
+            "max": round(ordered[-1] * 1000, 2),
+        }
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "wait_ms": self._summary(self.waits),
+            "latency_ms": self._summary(self.latencies),
+        }
+
+
+class CommandLanes:
+    def __init__(self, lanes: Dict[str, int] = None):
+        self.sizes = dict(lanes or LANES)
+        self.executors: Dict[str, ThreadPoolExecutor] = {}
+        self.stats: Dict[str, LaneStats] = {}
+        self._priority_active = 0
+        self._bulk_open = None  # asyncio.Event (이벤트 루프 안에서 처음 사용할 때 생성)
+
+    def _executor(self, lane: str) -> ThreadPoolExecutor:
+        """레인 스레드 풀 (처음 사용할 때 생성)"""
+        executor = self.executors.get(lane)
+        if executor is None:
+            if lane not in self.sizes:
+                raise ValueError(f"알 수 없는 레인: {lane}")
+            executor = ThreadPoolExecutor(max_workers=self.sizes[lane], thread_name_prefix=f"lane-{lane}")
+            self.executors[lane] = executor
+        return executor
+
+    def _gate(self) -> asyncio.Event:
+        if self._bulk_open is None:
+            self._bulk_open = asyncio.Event()
+            self._bulk_open.set()
+        return self._bulk_open
+
+    def _stats(self, name: str) -> LaneStats:
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = self.stats[name] = LaneStats()
+        return stats
+
+    async def run(self, lane: str, func: Callable, *args, priority: bool = False) -> Any:
+        """레인에서 블로킹 함수 실행
+
+        priority=True인 명령이 실행되는 동안 대량 전송 레인은 새 작업을 스레드 풀에 넣지 않고 대기
+        (이미 실행 중인 작업은 그대로 진행)
+        """
+        gate = self._gate()
+        called = time.perf_counter()
+        started = [0.0]
+
+        def timed_call():
+            started[0] = time.perf_counter()
+            return func(*args)
+
+        if priority:
+            self._priority_active += 1
+            gate.clear()
+        elif lane in BULK_LANES:
+            await gate.wait()
+
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor(lane), timed_call)
+        finally:
+            if priority:
+                self._priority_active -= 1
+                if self._priority_active == 0:
+                    gate.set()
+            if started[0]:
+                done = time.perf_counter()
+                self._stats("priority" if priority else lane).record(started[0] - called, done - called)
+
+    def report(self) -> Dict[str, Any]:
+        """레인별 대기/지연 시간과 현재 대기열"""
+        lanes = {}
+        for lane, size in self.sizes.items():
+            executor = self.executors.get(lane)
+            work_queue = getattr(executor, "_work_queue", None)
+            lanes[lane] = {
+                "workers": size,
+                "queued": work_queue.qsize() if work_queue is not None else 0,
+                **self._stats(lane).report(),
+            }
+        return {
+            "lanes": lanes,
+            "priority": self._stats("priority").report(),
+        }
+
+    def shutdown(self):
+        """레인 스레드 풀 종료 (실행 중인 작업은 기다리지 않음)"""
+        for executor in self.executors.values():
+            executor.shutdown(wait=False)
+        self.executors.clear()
+
+
+# 전역 레인 (SimulatorController, ExperienceController가 공유)
+command_lanes = CommandLanes()
@@ -0,0 +1,83 @@
+"""
+앱 시작 시간 기록
+헤드셋별 콜드 시작(am start -W의 TotalTime/WaitTime)과 웜 리셋(헤드셋 채널 장면 초기화 응답 시간)을 기록하고 비교
+"""
+import re
+import statistics
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+KINDS = ("cold", "warm")
+HISTORY_SIZE = 500
+
+# am start -W 출력 ("TotalTime: 3120", "WaitTime: 3185", "LaunchState: COLD")
+AM_START_FIELDS = re.compile(r"^\s*(Status|LaunchState|ThisTime|TotalTime|WaitTime):\s*(\S+)", re.MULTILINE)
+
+
+def parse_am_start(output: str) -> Optional[Dict[str, Any]]:
+    """am start -W 출력에서 시작 시간 추출
+
+    실행에 실패하면 None, 이미 실행 중이라 새로 시작하지 않았으면 total_ms가 None
+    """
+    if "Error" in output or "Status: timeout" in output:
+        return None
+    fields = dict(AM_START_FIELDS.findall(output))
+    if "Status" not in fields:
+        return None
+
+    def number(name: str) -> Optional[int]:
+        value = fields.get(name, "")
+        return int(value) if value.isdigit() else None
+
+    return {
+        "total_ms": number("TotalTime"),
+        "wait_ms": number("WaitTime"),
+        "launch_state": fields.get("LaunchState"),
+        "status": fields.get("Status"),
+    }
+
+
+class LaunchTimings:
+    def __init__(self, history: int = HISTORY_SIZE):
+        self.records: Deque[Dict[str, Any]] = deque(maxlen=history)
+
+    def record(self, device_ip: str, kind: str, total_ms: float, wait_ms: float = None,
+               launch_state: str = None) -> Dict[str, Any]:
+        """시작 시간 하나 기록 (kind: cold / warm)"""
+        entry = {
+            "device": device_ip,
+            "kind": kind,
+            "total_ms": round(total_ms, 1),
+            "wait_ms": None if wait_ms is None else round(wait_ms, 1),
+            "launch_state": launch_state,
+            "time": time.time(),
+        }
+        self.records.append(entry)
+        return entry
+
+    @staticmethod
+    def _summary(values: List[float]) -> Dict[str, float]:
+        if not values:
+            return {"count": 0, "mean": 0.0, "p50": 0.0, "max": 0.0}
+        return {
+            "count": len(values),
+            "mean": round(statistics.fmean(values), 1),
+            "p50": round(statistics.median(values), 1),
+            "max": round(max(values), 1),
+        }
+
+    def report(self) -> Dict[str, Any]:
+        """콜드/웜별 요약(ms)과 디바이스별 마지막 기록"""
+        latest: Dict[str, Dict[str, Any]] = {}
+        for entry in self.records:
+            latest.setdefault(entry["device"], {})[entry["kind"]] = entry
+        return {
+            "summary": {kind: self._summary([r["total_ms"] for r in self.records if r["kind"] == kind])
+                        for kind in KINDS},
+            "devices": latest,
+        }
+
+
+# 컨트롤러들이 공유하는 기록 (콜드 시작은 ADB 컨트롤러, 웜 리셋은 체험 컨트롤러에서 기록)
+launch_timings = LaunchTimings()
@@ -0,0 +1,351 @@
+"""
+운영 로그 분석
+vr_controller.log(로테이션된 이전 파일 포함)를 메모리 매핑으로 훑어 날짜별/체험별 통계 계산
+
+- 파일 전체를 읽어 들이지 않고, 미리 컴파일한 정규식 하나로 필요한 줄만 찾음 (나머지 줄은 정규식 엔진 안에서 건너뜀)
+- 찾은 이벤트는 array 열(시각, 종류, 디바이스, 값)에 모은 뒤 NumPy로 집계
+- 체험은 "체험 시작 신호" ~ "체험 종료 신호" 구간 (종료 신호 없이 다음 체험이 시작되거나 서버가 종료되면 거기까지)
+
+사용법:
+    python -m utils.log_analysis vr_controller.log
+    python -m utils.log_analysis vr_controller.log.1 vr_controller.log --sessions 20
+    python -m utils.log_analysis vr_controller.log --json > report.json
+"""
+import argparse
+import json
+import mmap
+import re
+import sys
+from array import array
+from itertools import chain
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+import numpy as np
+
+# 이벤트 종류 (array 열에 코드로 저장)
+EXPERIENCE_START = 0
+EXPERIENCE_STOP = 1
+CUE = 2                 # 시뮬레이터 명령 전송 (label: 명령)
+CUE_FAILED = 3          # 시뮬레이터 명령 전송 실패
+SIMULATOR_CONNECT = 4   # 시뮬레이터 연결 성공
+SIMULATOR_CONNECT_FAILED = 5
+DEVICE_OK = 6           # 디바이스별 ADB 작업 완료 (device)
+DEVICE_FAILED = 7       # 디바이스별 ADB 작업/앱 실행/셸 명령 실패 (device)
+DEVICE_UNREACHABLE = 8  # 헤드셋 채널 전송 실패, ADB 연결 실패/오프라인 (device)
+BATCH_RESULT = 9        # "3/5 디바이스에서 성공" 등 (ok, total)
+SERVER_STOP = 10        # 서버 종료 (종료 신호 없이 끝난 체험도 여기서 끝난 것으로 봄)
+
+# 로그 형식: "2026-10-19 13:11:20,189 - INFO - SUCCESS: 시뮬레이터 명령 전송: FALL"
+# 줄 시작을 ^(MULTILINE) 대신 앞 줄의 개행 문자로 찾음 (리터럴 접두사라 정규식 엔진이 개행 위치로 바로 이동)
+LINE_PATTERN = re.compile("".join((
+    r"\n(?P<date>\d{4}-\d\d-\d\d) (?P<h>\d\d):(?P<m>\d\d):(?P<s>\d\d),(?P<ms>\d{3}) - \w+ - (?:SUCCESS: )?(?:",
+    r"(?P<start>체험 시작 신호 전송 중)",
+    r"|(?P<stop>체험 종료 신호 전송 중)",
+    r"|(?P<cue>(?:\[테스트\] )?시뮬레이터 명령 전송: (?P<cue_name>\w+))",
+    r"|(?P<cue_failed>명령 전송 실패: )",
+    r"|(?P<sim_connect>(?:\[테스트\] )?시뮬레이터 연결: |시뮬레이터 연결 성공: )",
+    r"|(?P<sim_connect_failed>시뮬레이터 연결 실패: )",
+    r"|(?P<device_done>(?P<done_ip>[\w.:-]+) (?P<done>완료|실패) \(\d+/\d+\))",
+    r"|(?P<launch_failed>(?P<launch_ip>[\w.:-]+) 앱 실행 실패: )",
+    r"|(?P<shell_failed>셸 명령 실행 오류 \((?P<shell_ip>[\w.:-]+)\))",
+    r"|(?P<send_failed>디바이스 (?P<send_ip>[\w.:-]+) (?:전송 실패|장면 초기화 응답 없음))",
+    r"|(?P<adb_unreachable>ADB 명령 실패: .*?(?:connect to|device) '?(?P<adb_ip>\d+\.\d+\.\d+\.\d+(?::\d+)?)'?)",
+    r"|(?P<server_stop>종료 완료 \(\d+ms\))",
+    r"|(?P<batch>(?P<ok>\d+)/(?P<total>\d+) 디바이스(?:에서 성공|에 명령 전송 완료))",
+    r")",
+)).encode("utf-8"))
+
+PERCENTILES = (50, 90)
+
+
+class EventColumns:
+    """로그에서 찾은 이벤트 (열 단위 array, 이벤트마다 파이썬 객체를 남기지 않음)"""
+
+    def __init__(self):
+        self.time = array('d')      # 로그 시각 (날짜 서수 기준 초, 시간대 없음)
+        self.kind = array('b')
+        self.device = array('i')    # devices 목록 인덱스 (-1: 없음)
+        self.label = array('i')     # labels 목록 인덱스 (-1: 없음)
+        self.ok = array('i')
+        self.total = array('i')
+        self.devices: List[str] = []
+        self.labels: List[str] = []
+        self._device_index: Dict[bytes, int] = {}
+        self._label_index: Dict[bytes, int] = {}
+        self._day_seconds: Dict[bytes, int] = {}
+        self.lines_matched = 0
+        self.bytes_scanned = 0
+
+    def _index(self, value: bytes, index: Dict[bytes, int], names: List[str]) -> int:
+        position = index.get(value)
+        if position is None:
+            position = index[value] = len(names)
+            names.append(value.decode("utf-8", errors="replace"))
+        return position
+
+    def scan(self, buffer) -> None:
+        """버퍼(mmap 또는 bytes) 하나의 이벤트 추가"""
+        first_line = LINE_PATTERN.match(b"\n" + buffer[:buffer.find(b"\n") + 1 or len(buffer)])
+        for match in chain([first_line] if first_line else [], LINE_PATTERN.finditer(buffer)):
+            group = match.group
+            day = group("date")
+            base = self._day_seconds.get(day)
+            if base is None:
+                base = self._day_seconds[day] = date.fromisoformat(day.decode()).toordinal() * 86400
+            seconds = base + int(group("h")) * 3600 + int(group("m")) * 60 + int(group("s")) + int(group("ms")) / 1000
+
+            kind = match.lastgroup
+            device = label = -1
+            ok = total = 0
+            if kind == "start":
+                code = EXPERIENCE_START
+            elif kind == "stop":
+                code = EXPERIENCE_STOP
+            elif kind == "cue":
+                code = CUE
+                label = self._index(group("cue_name"), self._label_index, self.labels)
+            elif kind == "cue_failed":
+                code = CUE_FAILED
+            elif kind == "sim_connect":
+                code = SIMULATOR_CONNECT
+            elif kind == "sim_connect_failed":
+                code = SIMULATOR_CONNECT_FAILED
+            elif kind == "device_done":
+                code = DEVICE_OK if group("done") == "완료".encode() else DEVICE_FAILED
+                device = self._index(group("done_ip"), self._device_index, self.devices)
+            elif kind == "launch_failed":
+                code = DEVICE_FAILED
+                device = self._index(group("launch_ip"), self._device_index, self.devices)
+            elif kind == "shell_failed":
+                code = DEVICE_FAILED
+                device = self._index(group("shell_ip"), self._device_index, self.devices)
+            elif kind == "send_failed":
+                code = DEVICE_UNREACHABLE
+                device = self._index(group("send_ip"), self._device_index, self.devices)
+            elif kind == "server_stop":
+                code = SERVER_STOP
+            elif kind == "adb_unreachable":
+                code = DEVICE_UNREACHABLE
+                device = self._index(group("adb_ip"), self._device_index, self.devices)
+            else:  # batch
+                code = BATCH_RESULT
+                ok, total = int(group("ok")), int(group("total"))
+
+            self.time.append(seconds)
+            self.kind.append(code)
+            self.device.append(device)
+            self.label.append(label)
+            self.ok.append(ok)
+            self.total.append(total)
+        self.lines_matched = len(self.kind)
+        self.bytes_scanned += len(buffer)
+
+    def scan_file(self, path: Path) -> None:
+        """파일 하나를 메모리 매핑으로 검사 (빈 파일은 건너뜀)"""
+        with open(path, "rb") as f:
+            if f.seek(0, 2) == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                self.scan(mapped)
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return {
+            "time": np.frombuffer(self.time, dtype=np.float64),
+            "kind": np.frombuffer(self.kind, dtype=np.int8),
+            "device": np.frombuffer(self.device, dtype=np.int32),
+            "label": np.frombuffer(self.label, dtype=np.int32),
+            "ok": np.frombuffer(self.ok, dtype=np.int32),
+            "total": np.frombuffer(self.total, dtype=np.int32),
+        }
+
+
+def _stats(values: np.ndarray) -> Dict[str, Any]:
+    if len(values) == 0:
+        return {"count": 0}
+    result = {"count": int(len(values)), "mean": round(float(values.mean()), 2)}
+    for p, value in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+        result[f"p{p}"] = round(float(value), 2)
+    result["max"] = round(float(values.max()), 2)
+    return result
+
+
+def _rate(ok: int, total: int) -> Optional[float]:
+    return round(ok / total, 4) if total else None
+
+
+def _format_day(seconds: float) -> str:
+    return date.fromordinal(int(seconds // 86400)).isoformat()
+
+
+def _format_time(seconds: float) -> str:
+    rest = int(seconds % 86400)
+    return f"{_format_day(seconds)} {rest // 3600:02d}:{rest // 60 % 60:02d}:{rest % 60:02d}"
+
+
+def assign_sessions(kind: np.ndarray) -> np.ndarray:
+    """이벤트별 체험 번호 (체험 시작 ~ 종료 사이가 아니면 -1)"""
+    markers = (kind == EXPERIENCE_START) | (kind == EXPERIENCE_STOP) | (kind == SERVER_STOP)
+    last_marker = np.maximum.accumulate(np.where(markers, np.arange(len(kind)), -1))
+    inside = (last_marker >= 0) & (kind[np.maximum(last_marker, 0)] == EXPERIENCE_START)
+    numbers = np.cumsum(kind == EXPERIENCE_START) - 1
+    # 종료 신호 자체도 체험에 포함
+    stops = kind == EXPERIENCE_STOP
+    previous = np.concatenate(([False], inside[:-1])) if len(kind) else inside
+    return np.where(inside | (stops & previous), numbers, -1)
+
+
+def cue_gaps(columns: Dict[str, np.ndarray], session: np.ndarray):
+    """같은 체험 안에서 연속한 시뮬레이터 명령 사이 시간 (초)과 뒤 명령의 인덱스"""
+    cue = np.flatnonzero((columns["kind"] == CUE) & (session >= 0))
+    same = session[cue[1:]] == session[cue[:-1]]
+    gaps = np.diff(columns["time"][cue])[same]
+    return gaps, cue[1:][same]
+
+
+def analyze(paths: Iterable[Path], session_limit: int = 10) -> Dict[str, Any]:
+    """로그 파일들(오래된 순)을 분석하여 날짜별/디바이스별/체험별 통계 반환"""
+    events = EventColumns()
+    for path in paths:
+        events.scan_file(Path(path))
+    columns = events.arrays()
+    time, kind, device = columns["time"], columns["kind"], columns["device"]
+    session = assign_sessions(kind)
+    gaps, gap_index = cue_gaps(columns, session)
+    day = (time // 86400).astype(np.int64)
+
+    def count(mask: np.ndarray) -> int:
+        return int(np.count_nonzero(mask))
+
+    days = []
+    for value in np.unique(day):
+        in_day = day == value
+        batch = in_day & (kind == BATCH_RESULT)
+        device_ok = count(in_day & (kind == DEVICE_OK))
+        device_failed = count(in_day & (kind == DEVICE_FAILED))
+        days.append({
+            "date": date.fromordinal(int(value)).isoformat(),
+            "experiences": count(in_day & (kind == EXPERIENCE_START)),
+            "cues": count(in_day & (kind == CUE)),
+            "cue_failures": count(in_day & (kind == CUE_FAILED)),
+            "simulator_connect_failures": count(in_day & (kind == SIMULATOR_CONNECT_FAILED)),
+            "device_unreachable": count(in_day & (kind == DEVICE_UNREACHABLE)),
+            "device_ok": device_ok,
+            "device_failed": device_failed,
+            "device_success_rate": _rate(device_ok, device_ok + device_failed),
+            "command_success_rate": _rate(int(columns["ok"][batch].sum()), int(columns["total"][batch].sum())),
+            "cue_gap_s": _stats(gaps[day[gap_index] == value]),
+        })
+
+    devices = {}
+    if events.devices:
+        per_kind = {code: np.bincount(device[(kind == code) & (device >= 0)], minlength=len(events.devices))
+                    for code in (DEVICE_OK, DEVICE_FAILED, DEVICE_UNREACHABLE)}
+        for index, name in enumerate(events.devices):
+            ok, failed = int(per_kind[DEVICE_OK][index]), int(per_kind[DEVICE_FAILED][index])
+            devices[name] = {
+                "ok": ok,
+                "failed": failed,
+                "unreachable": int(per_kind[DEVICE_UNREACHABLE][index]),
+                "success_rate": _rate(ok, ok + failed),
+            }
+
+    labels = columns["label"][gap_index]
+    cues = {}
+    for index, name in enumerate(events.labels):
+        cues[name] = {
+            "count": count((kind == CUE) & (columns["label"] == index)),
+            "since_previous_s": _stats(gaps[labels == index]),
+        }
+
+    sessions = []
+    starts = np.flatnonzero(kind == EXPERIENCE_START)
+    for number in range(max(0, len(starts) - session_limit), len(starts)):
+        inside = session == number
+        members = np.flatnonzero(inside)
+        ended = kind[members[-1]] == EXPERIENCE_STOP
+        in_session_cues = inside & (kind == CUE)
+        sessions.append({
+            "number": number + 1,
+            "started": _format_time(time[starts[number]]),
+            "duration_s": round(float(time[members[-1]] - time[members[0]]), 1) if ended else None,
+            "cues": [events.labels[i] for i in columns["label"][in_session_cues]],
+            "cue_failures": count(inside & (kind == CUE_FAILED)),
+            "device_unreachable": count(inside & (kind == DEVICE_UNREACHABLE)),
+            "cue_gap_s": _stats(gaps[session[gap_index] == number]),
+        })
+
+    return {
+        "lines_matched": events.lines_matched,
+        "bytes_scanned": events.bytes_scanned,
+        "range": [_format_time(time[0]), _format_time(time[-1])] if len(time) else None,
+        "experiences": int(len(starts)),
+        "days": days,
+        "devices": devices,
+        "cues": cues,
+        "sessions": sessions,
+    }
+
+
+def _percent(rate: Optional[float]) -> str:
+    return "-" if rate is None else f"{rate * 100:.1f}%"
+
+
+def _gap(stats: Dict[str, Any]) -> str:
+    if not stats["count"]:
+        return "-"
+    return f"{stats['mean']}/{stats['p50']}/{stats['max']}"
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """표 형식으로 출력"""
+    print(f"{report['bytes_scanned'] / 1e6:.1f} MB, 이벤트 {report['lines_matched']:,}개, 체험 {report['experiences']}회")
+    if report["range"]:
+        print(f"기간: {report['range'][0]} ~ {report['range'][1]}")
+
+    print("\n[날짜별] 체험, 명령, 명령 실패, 시뮬레이터 연결 실패, 헤드셋 연결 실패, 디바이스 작업 성공률, 전송 성공률, 명령 간격(초) 평균/p50/최대")
+    for day in report["days"]:
+        print(f"{day['date']}  {day['experiences']:>5} {day['cues']:>6} {day['cue_failures']:>5}"
+              f" {day['simulator_connect_failures']:>5} {day['device_unreachable']:>5}"
+              f" {_percent(day['device_success_rate']):>7} {_percent(day['command_success_rate']):>7}"
+              f"  {_gap(day['cue_gap_s'])}")
+
+    if report["devices"]:
+        print("\n[디바이스별] 성공, 실패, 연결 실패, 성공률")
+        for name, stats in sorted(report["devices"].items()):
+            print(f"{name:<22} {stats['ok']:>6} {stats['failed']:>6} {stats['unreachable']:>6} {_percent(stats['success_rate']):>7}")
+
+    if report["cues"]:
+        print("\n[명령별] 횟수, 이전 명령 이후 시간(초) 평균/p50/최대")
+        for name, stats in sorted(report["cues"].items(), key=lambda item: -item[1]["count"]):
+            print(f"{name:<22} {stats['count']:>6}  {_gap(stats['since_previous_s'])}")
+
+    if report["sessions"]:
+        print(f"\n[최근 체험 {len(report['sessions'])}회] 시작, 시간(초), 명령 실패, 헤드셋 연결 실패, 명령")
+        for item in report["sessions"]:
+            duration = "종료 기록 없음" if item["duration_s"] is None else f"{item['duration_s']}"
+            print(f"#{item['number']:<5} {item['started']}  {duration:>7} {item['cue_failures']:>3}"
+                  f" {item['device_unreachable']:>3}  {' > '.join(item['cues'])}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="vr_controller.log 날짜별/체험별 통계")
+    parser.add_argument("paths", nargs="*", default=["vr_controller.log"], help="로그 파일 (오래된 순)")
+    parser.add_argument("--sessions", type=int, default=10, help="출력할 최근 체험 수")
+    parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+    args = parser.parse_args(argv)
+
+    missing = [path for path in args.paths if not Path(path).is_file()]
+    if missing:
+        parser.error(f"로그 파일을 찾을 수 없습니다: {', '.join(missing)}")
+
+    report = analyze([Path(path) for path in args.paths], args.sessions)
+    if args.json:
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
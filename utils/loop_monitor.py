@@ -0,0 +1,147 @@
+"""
+이벤트 루프 모니터
+이벤트 루프 지연 측정, 루프를 오래 막는 콜백의 스택 기록, run_in_executor 스레드 풀 대기열 추적
+"""
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Deque, Dict, List, Optional
+from utils.logger import Logger
+
+
+class LoopMonitor:
+    """주기적으로 짧게 sleep하는 태스크가 예정보다 늦게 깨어난 시간을 루프 지연으로 측정
+
+    루프가 막혀 있는 동안에는 감시 스레드가 루프 스레드의 현재 스택을 캡처하므로
+    어떤 코드가 루프를 막았는지 기록에 남음
+    """
+
+    def __init__(self, logger: Logger, interval: float = 0.05, slow_threshold: float = 0.1,
+                 history: int = 200, slow_history: int = 20):
+        self.logger = logger
+        self.interval = interval
+        self.slow_threshold = slow_threshold
+        self.samples: Deque[float] = deque(maxlen=history)  # 최근 루프 지연 (초)
+        self.max_lag = 0.0
+        self.slow_callbacks: Deque[Dict[str, Any]] = deque(maxlen=slow_history)
+        self.slow_count = 0
+        self.executor: Optional[ThreadPoolExecutor] = None
+
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat = time.perf_counter()
+        self._stall_stack: Optional[List[str]] = None
+        self._lock = threading.Lock()
+
+    def start(self, executor: Optional[ThreadPoolExecutor] = None):
+        """모니터 시작 (실행 중인 이벤트 루프 안에서 호출)
+
+        run_in_executor(None, ...)의 대기열을 확인할 수 있도록 기본 실행기를 직접 만든 스레드 풀로 교체
+        """
+        loop = asyncio.get_running_loop()
+        self.executor = executor or ThreadPoolExecutor(thread_name_prefix="vrfall-executor")
+        loop.set_default_executor(self.executor)
+
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.perf_counter()
+        self._stop.clear()
+        self._task = loop.create_task(self._probe())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-monitor", daemon=True)
+        self._watchdog.start()
+
+    def stop(self):
+        """모니터 중지"""
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _probe(self):
+        """루프 지연 측정"""
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+
+            self.samples.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+            with self._lock:
+                self._heartbeat = time.perf_counter()
+                stack = self._stall_stack
+                self._stall_stack = None
+
+            if lag >= self.slow_threshold:
+                self._record_slow(lag, stack)
+
+    def _watch(self):
+        """감시 스레드: 루프가 멈춰 있으면 루프 스레드의 스택 캡처 (멈춤 한 번당 한 번)"""
+        limit = self.interval + self.slow_threshold
+        captured_for = None
+        while not self._stop.wait(self.slow_threshold / 2):
+            with self._lock:
+                heartbeat = self._heartbeat
+            if time.perf_counter() - heartbeat < limit or captured_for == heartbeat:
+                continue
+
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            stack = traceback.format_stack(frame)
+            with self._lock:
+                if self._heartbeat == heartbeat:
+                    self._stall_stack = stack
+            captured_for = heartbeat
+
+    def _record_slow(self, lag: float, stack: Optional[List[str]]):
+        """루프를 오래 막은 콜백 기록"""
+        self.slow_count += 1
+        self.slow_callbacks.append({
+            "time": time.time(),
+            "duration_ms": round(lag * 1000, 1),
+            "stack": [line.rstrip() for line in stack[-12:]] if stack else None,
+        })
+        location = stack[-1].strip().splitlines()[0] if stack else "알 수 없음"
+        self.logger.warning(f"이벤트 루프가 {lag * 1000:.0f}ms 동안 멈춤 ({location})")
+
+    def executor_stats(self) -> Dict[str, int]:
+        """스레드 풀 상태 (대기 중인 작업 수는 CPython ThreadPoolExecutor 내부 큐 기준)"""
+        if self.executor is None:
+            return {"max_workers": 0, "threads": 0, "queued": 0}
+        work_queue = getattr(self.executor, "_work_queue", None)
+        return {
+            "max_workers": self.executor._max_workers,
+            "threads": len(getattr(self.executor, "_threads", ())),
+            "queued": work_queue.qsize() if work_queue is not None else 0,
+        }
+
+    def report(self) -> Dict[str, Any]:
+        """루프 지연 / 느린 콜백 / 스레드 풀 현황"""
+        samples = sorted(self.samples)
+        if samples:
+            current = self.samples[-1]
+            avg = sum(samples) / len(samples)
+            p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+        else:
+            current = avg = p99 = 0.0
+
+        return {
+            "lag_ms": {
+                "current": round(current * 1000, 1),
+                "avg": round(avg * 1000, 1),
+                "p99": round(p99 * 1000, 1),
+                "max": round(self.max_lag * 1000, 1),
+            },
+            "slow_callbacks": {
+                "threshold_ms": round(self.slow_threshold * 1000),
+                "count": self.slow_count,
+                "recent": list(self.slow_callbacks),
+            },
+            "executor": self.executor_stats(),
+        }
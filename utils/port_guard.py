@@ -0,0 +1,177 @@
+"""
+포트 소유권 관리
+PID/잠금 파일과 직접 바인드로 서버 포트를 확보하고,
+이전에 비정상 종료된 이 컨트롤러 인스턴스만 찾아서 정리
+"""
+import json
+import os
+import secrets
+import signal
+import socket
+import sys
+import time
+import urllib.request
+from pathlib import Path
+from typing import Optional
+
+
+class PortInUseError(Exception):
+    """다른 프로그램이 포트를 사용 중 (이 컨트롤러가 아니므로 종료하지 않음)"""
+
+
+class PortGuard:
+    def __init__(self, host: str, port: int, lock_path: Path):
+        self.host = host
+        self.port = port
+        self.lock_path = lock_path
+        self.token = secrets.token_hex(16)  # 종료 요청 토큰 (잠금 파일에만 기록)
+        self.socket: Optional[socket.socket] = None
+
+    def _create_socket(self) -> socket.socket:
+        """서버 소켓 생성 및 바인드"""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        if sys.platform == 'win32':
+            # Windows의 SO_REUSEADDR는 다른 프로세스의 중복 바인드를 허용하므로 배타적 바인드 사용
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_EXCLUSIVEADDRUSE, 1)
+        else:
+            # TIME_WAIT 상태의 이전 연결이 남아 있어도 즉시 재바인드
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            sock.bind((self.host, self.port))
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+    def _read_lock(self) -> Optional[dict]:
+        """잠금 파일 읽기 (없거나 손상된 경우 None)"""
+        try:
+            return json.loads(self.lock_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _pid_alive(pid: int) -> bool:
+        """프로세스 실행 여부 (Windows의 os.kill(pid, 0)은 Ctrl+C 이벤트를 보내므로 OpenProcess로 확인)"""
+        if sys.platform == 'win32':
+            import ctypes
+            PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+            STILL_ACTIVE = 259
+            kernel32 = ctypes.windll.kernel32
+            handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+            if not handle:
+                return False
+            try:
+                code = ctypes.c_ulong()
+                return bool(kernel32.GetExitCodeProcess(handle, ctypes.byref(code))) and code.value == STILL_ACTIVE
+            finally:
+                kernel32.CloseHandle(handle)
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+
+    def _query_instance(self) -> Optional[dict]:
+        """포트에서 실행 중인 서버의 인스턴스 정보 조회 (이 컨트롤러가 아니면 None)"""
+        try:
+            url = f"http://127.0.0.1:{self.port}/api/instance"
+            with urllib.request.urlopen(url, timeout=1.0) as response:
+                return json.loads(response.read().decode('utf-8'))
+        except (OSError, ValueError):
+            return None
+
+    def _request_shutdown(self, token: str) -> bool:
+        """이전 인스턴스에 정상 종료 요청"""
+        try:
+            request = urllib.request.Request(
+                f"http://127.0.0.1:{self.port}/api/instance/shutdown",
+                data=json.dumps({"token": token}).encode('utf-8'),
+                headers={"Content-Type": "application/json"},
+                method="POST"
+            )
+            with urllib.request.urlopen(request, timeout=1.0):
+                return True
+        except OSError:
+            return False
+
+    def _bind_with_retry(self, timeout: float) -> Optional[socket.socket]:
+        """포트가 해제될 때까지 바인드 재시도"""
+        deadline = time.perf_counter() + timeout
+        while True:
+            try:
+                return self._create_socket()
+            except OSError:
+                if time.perf_counter() >= deadline:
+                    return None
+            time.sleep(0.05)
+
+    def acquire(self, reclaim_timeout: float = 5.0) -> socket.socket:
+        """포트 확보 후 바인드된 소켓 반환
+
+        포트가 사용 중이면 잠금 파일(같은 포트, 실행 중인 PID)로 이전 컨트롤러 인스턴스인지 확인해 종료시키고,
+        그 외에는 PortInUseError 발생
+        - /api/instance가 응답하면 PID가 잠금 파일과 같을 때만 토큰으로 정상 종료 요청
+        - 응답하지 않으면 (멈춘 인스턴스) 정상 종료 요청 없이 프로세스 종료
+        """
+        try:
+            self.socket = self._create_socket()
+        except OSError:
+            lock = self._read_lock()
+            if not lock or not lock.get("token") or lock.get("port") != self.port \
+                    or not isinstance(lock.get("pid"), int) or not self._pid_alive(lock["pid"]):
+                raise PortInUseError(f"포트 {self.port}을(를) 다른 프로그램이 사용 중입니다")
+
+            instance = self._query_instance()
+            if instance is not None and instance.get("pid") != lock["pid"]:
+                raise PortInUseError(f"포트 {self.port}을(를) 다른 프로그램이 사용 중입니다")
+
+            # 1단계: 정상 종료 요청 (응답하는 경우만), 2단계: 시간 내에 해제되지 않으면 프로세스 종료
+            if instance is not None:
+                self._request_shutdown(lock["token"])
+                self.socket = self._bind_with_retry(reclaim_timeout)
+
+            # Windows의 SIGTERM은 강제 종료, 그 외에는 멈춘 프로세스가 SIGTERM을 처리하지 못하면 SIGKILL
+            for sig in (signal.SIGTERM, getattr(signal, 'SIGKILL', None)):
+                if self.socket is not None or sig is None:
+                    break
+                try:
+                    os.kill(lock["pid"], sig)
+                except OSError:
+                    pass
+                self.socket = self._bind_with_retry(reclaim_timeout)
+
+            if self.socket is None:
+                raise PortInUseError(f"이전 인스턴스(PID {lock['pid']})가 포트 {self.port}을(를) 해제하지 않습니다")
+
+        self._write_lock()
+        return self.socket
+
+    def _write_lock(self):
+        """잠금 파일 원자적 기록"""
+        tmp_path = self.lock_path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps({
+            "pid": os.getpid(),
+            "port": self.port,
+            "token": self.token,
+            "started_at": time.time(),
+        }), encoding='utf-8')
+        os.replace(tmp_path, self.lock_path)
+
+    def release(self):
+        """잠금 파일 삭제 및 소켓 닫기 (이 인스턴스가 기록한 잠금 파일만 삭제)"""
+        lock = self._read_lock()
+        if lock and lock.get("token") == self.token:
+            try:
+                self.lock_path.unlink()
+            except OSError:
+                pass
+
+        if self.socket is not None:
+            try:
+                self.socket.close()
+            except OSError:
+                pass
+            self.socket = None
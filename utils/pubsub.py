@@ -0,0 +1,141 @@
+"""
+발행/구독 허브
+모든 실시간 전송 경로(FastAPI /ws, 레거시 WebSocket 서버)가 공유하는 토픽 기반 브로드캐스트
+"""
+import asyncio
+import functools
+import json
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Set
+
+# 토픽 목록
+TOPICS = ("logs", "devices", "simulator", "telemetry", "logcat", "mirror", "system")
+
+# 클라이언트별 전송 한도가 있는 토픽 (초당 최대 메시지 수 기본값)
+# 한도를 넘는 메시지는 클라이언트별로 대기하며, 같은 키(device)의 대기 메시지는 최신 것으로 교체 (최신 데이터만 의미 있는 토픽)
+RATE_LIMITED_TOPICS: Dict[str, float] = {
+    "mirror": 4.0,
+}
+
+# 메시지 type -> 토픽 (publish에서 토픽을 지정하지 않은 경우)
+MESSAGE_TOPICS: Dict[str, str] = {
+    "log": "logs",
+    "devices": "devices",
+    "simulator_status": "simulator",
+    "config": "system",
+    "test_mode": "system",
+    "scheduler": "system",
+    "watchdog": "devices",
+    "logcat": "logcat",
+    "telemetry": "telemetry",
+}
+
+
+class Subscription:
+    """전송 경로 하나(클라이언트 연결 하나)의 구독 정보"""
+
+    def __init__(self, send: Callable[[str], Awaitable[None]],
+                 close: Optional[Callable[[], Awaitable[None]]] = None,
+                 topics: Iterable[str] = TOPICS):
+        self.send = send
+        self.close = close
+        self.topics: Set[str] = set(topics)
+        self.rates: Dict[str, float] = dict(RATE_LIMITED_TOPICS)  # 토픽 -> 초당 최대 메시지 수
+        self._queued: Dict[str, OrderedDict] = {}      # 토픽 -> 키 -> 대기 중인 메시지
+        self._senders: Dict[str, asyncio.Task] = {}
+
+    def offer(self, topic: str, key: str, text: str) -> Optional[asyncio.Task]:
+        """전송 한도가 있는 토픽 메시지 대기열에 추가 (전송 작업을 새로 시작했으면 반환)
+
+        같은 키의 대기 메시지는 내용만 바꾸고 순서는 유지하여, 자주 바뀌는 키가 다른 키를 밀어내지 않음
+        """
+        self._queued.setdefault(topic, OrderedDict())[key] = text
+        if topic in self._senders:
+            return None
+        task = self._senders[topic] = asyncio.ensure_future(self._drain(topic))
+        return task
+
+    async def _drain(self, topic: str):
+        """대기열을 오래된 순서로 한도에 맞춰 전송"""
+        queue = self._queued[topic]
+        try:
+            while queue:
+                _, text = queue.popitem(last=False)
+                await self.send(text)
+                await asyncio.sleep(1.0 / self.rates[topic])
+        finally:
+            self._senders.pop(topic, None)
+
+
+class PubSubHub:
+    def __init__(self):
+        self.subscriptions: Set[Subscription] = set()
+        self._pending: Set[asyncio.Future] = set()  # 기다리지 않는 전송 (완료 전 가비지 컬렉션 방지)
+
+    def _on_limited_sent(self, subscription: Subscription, task: asyncio.Future):
+        self._pending.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self.subscriptions.discard(subscription)
+
+    def add(self, send: Callable[[str], Awaitable[None]],
+            close: Optional[Callable[[], Awaitable[None]]] = None,
+            topics: Iterable[str] = TOPICS) -> Subscription:
+        """클라이언트 등록 (기본값: 모든 토픽 구독)"""
+        subscription = Subscription(send, close, topics)
+        self.subscriptions.add(subscription)
+        return subscription
+
+    def remove(self, subscription: Subscription):
+        """클라이언트 제거"""
+        self.subscriptions.discard(subscription)
+
+    def subscribe(self, subscription: Subscription, topics: Iterable[str], rates: Dict[str, float] = None):
+        """토픽 구독 추가 (알 수 없는 토픽은 무시, rates로 토픽별 초당 최대 메시지 수 변경)"""
+        subscription.topics.update(t for t in topics if t in TOPICS)
+        for topic, rate in (rates or {}).items():
+            if topic in RATE_LIMITED_TOPICS:
+                subscription.rates[topic] = max(0.1, min(float(rate), RATE_LIMITED_TOPICS[topic] * 2))
+
+    def unsubscribe(self, subscription: Subscription, topics: Iterable[str]):
+        """토픽 구독 해제"""
+        subscription.topics.difference_update(topics)
+
+    def subscriber_count(self, topic: str) -> int:
+        """토픽 구독자 수 (구독자가 없으면 메시지 생성 자체를 건너뛸 때 사용)"""
+        return sum(1 for s in self.subscriptions if topic in s.topics)
+
+    async def publish(self, message: dict, topic: str = None):
+        """토픽 구독자에게 메시지 전송 (직렬화는 발행당 한 번)"""
+        if topic is None:
+            topic = MESSAGE_TOPICS.get(message.get("type"), "system")
+
+        targets = [s for s in self.subscriptions if topic in s.topics]
+        if not targets:
+            return
+
+        text = json.dumps(message, ensure_ascii=False)
+        if topic in RATE_LIMITED_TOPICS:
+            # 느린 클라이언트가 발행자를 붙잡지 않도록 클라이언트별 대기열에 넣고 반환
+            key = str(message.get("device", ""))
+            for subscription in targets:
+                task = subscription.offer(topic, key, text)
+                if task is not None:
+                    self._pending.add(task)
+                    task.add_done_callback(functools.partial(self._on_limited_sent, subscription))
+            return
+
+        results = await asyncio.gather(*(s.send(text) for s in targets), return_exceptions=True)
+
+        # 전송에 실패한 연결은 끊어진 것으로 보고 제거
+        for subscription, result in zip(targets, results):
+            if isinstance(result, Exception):
+                self.subscriptions.discard(subscription)
+
+    async def close_all(self):
+        """모든 클라이언트 연결 종료"""
+        subscriptions = list(self.subscriptions)
+        self.subscriptions.clear()
+        await asyncio.gather(
+            *(s.close() for s in subscriptions if s.close is not None),
+            return_exceptions=True
+        )
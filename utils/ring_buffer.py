@@ -0,0 +1,81 @@
+"""
+고정 크기 링 버퍼 / 청크 기록 버퍼 (NumPy 구조체 배열)
+고속 샘플(시뮬레이터 텔레메트리 등)을 샘플별 파이썬 객체 없이 미리 할당한 배열에 복사
+"""
+from typing import List, Tuple
+import numpy as np
+
+
+class RingBuffer:
+    """최근 capacity개 행만 유지 (추가는 슬라이스 복사 최대 두 번)"""
+
+    def __init__(self, dtype: np.dtype, capacity: int):
+        self.data = np.zeros(capacity, dtype=dtype)
+        self.capacity = capacity
+        self.total = 0  # 지금까지 추가된 행 수 (읽는 쪽이 어디까지 읽었는지 기억하는 기준)
+
+    def __len__(self) -> int:
+        return min(self.total, self.capacity)
+
+    def extend(self, rows: np.ndarray):
+        """행 추가 (capacity보다 많으면 마지막 capacity개만 남음)"""
+        count = len(rows)
+        if count == 0:
+            return
+        if count >= self.capacity:
+            rows = rows[-self.capacity:]
+            self.total += count - self.capacity
+            count = self.capacity
+
+        start = self.total % self.capacity
+        first = min(count, self.capacity - start)
+        self.data[start:start + first] = rows[:first]
+        if first < count:
+            self.data[:count - first] = rows[first:]
+        self.total += count
+
+    def since(self, position: int) -> Tuple[np.ndarray, int]:
+        """position(total 기준) 이후 추가된 행 복사본과 다음 읽을 위치 (덮어써진 행은 건너뜀)"""
+        position = max(position, self.total - len(self))
+        return self._slice(position, self.total), self.total
+
+    def latest(self, count: int) -> np.ndarray:
+        """마지막 count개 행 복사본 (오래된 순)"""
+        return self._slice(max(self.total - min(count, len(self)), 0), self.total)
+
+    def _slice(self, begin: int, end: int) -> np.ndarray:
+        if begin >= end:
+            return self.data[:0].copy()
+        start, stop = begin % self.capacity, end % self.capacity
+        if start < stop:
+            return self.data[start:stop].copy()
+        return np.concatenate((self.data[start:], self.data[:stop]))
+
+
+class ChunkedRecorder:
+    """길이를 알 수 없는 기록용 버퍼 (고정 크기 청크를 채워 나가므로 추가할 때 기존 데이터를 다시 복사하지 않음)"""
+
+    def __init__(self, dtype: np.dtype, chunk_size: int = 65536):
+        self.dtype = dtype
+        self.chunk_size = chunk_size
+        self.chunks: List[np.ndarray] = []
+        self.fill = chunk_size  # 마지막 청크에 채운 행 수 (처음에는 청크 없음)
+        self.total = 0
+
+    def extend(self, rows: np.ndarray):
+        offset = 0
+        while offset < len(rows):
+            if self.fill == self.chunk_size:
+                self.chunks.append(np.empty(self.chunk_size, dtype=self.dtype))
+                self.fill = 0
+            count = min(len(rows) - offset, self.chunk_size - self.fill)
+            self.chunks[-1][self.fill:self.fill + count] = rows[offset:offset + count]
+            self.fill += count
+            offset += count
+        self.total += len(rows)
+
+    def to_array(self) -> np.ndarray:
+        """기록 전체 (연속 배열 한 개)"""
+        if not self.chunks:
+            return np.empty(0, dtype=self.dtype)
+        return np.concatenate(self.chunks[:-1] + [self.chunks[-1][:self.fill]])
@@ -0,0 +1,22 @@
+"""
+세션 ID
+성능/텔레메트리 기록 파일 이름으로 쓰는 시각 기반 ID (같은 초에 시작한 세션끼리 파일을 덮어쓰지 않도록 번호 추가)
+"""
+import time
+from pathlib import Path
+from typing import Set
+
+# 이번 실행에서 발급한 ID (저장이 끝나기 전이라 파일이 아직 없는 세션 포함)
+_issued: Set[str] = set()
+
+
+def new_session_id(storage_dir: Path) -> str:
+    """"%Y%m%d-%H%M%S" 형식 ID (이미 발급했거나 파일이 있으면 -2, -3 ... 추가)"""
+    base = time.strftime("%Y%m%d-%H%M%S")
+    session_id = base
+    number = 1
+    while f"{storage_dir}/{session_id}" in _issued or (storage_dir / f"{session_id}.json").exists():
+        number += 1
+        session_id = f"{base}-{number}"
+    _issued.add(f"{storage_dir}/{session_id}")
+    return session_id
@@ -0,0 +1,89 @@
+"""
+정상 종료 유틸리티
+진행 중인 명령 추적(CommandGate)과 단계별 종료 순서 실행(ShutdownSequence)
+"""
+import asyncio
+import contextlib
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+from utils.logger import Logger
+
+
+class ShuttingDownError(Exception):
+    """종료 중이라 새 명령을 받을 수 없음"""
+
+
+class CommandGate:
+    """진행 중인 명령 수를 추적하고, 종료 시 새 명령을 막은 뒤 남은 명령이 끝나길 대기"""
+
+    def __init__(self):
+        self.closed = False
+        self._in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @contextlib.asynccontextmanager
+    async def track(self):
+        """명령 실행 구간 (종료 중이면 ShuttingDownError)"""
+        if self.closed:
+            raise ShuttingDownError("서버 종료 중입니다")
+
+        self._in_flight += 1
+        self._idle.clear()
+        try:
+            yield
+        finally:
+            self._in_flight -= 1
+            if self._in_flight == 0:
+                self._idle.set()
+
+    def close(self):
+        """새 명령 받지 않음"""
+        self.closed = True
+
+    async def drain(self, timeout: float) -> int:
+        """진행 중인 명령이 끝날 때까지 대기 (시간 초과 시 남은 명령 수 반환)"""
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self._in_flight
+
+
+class ShutdownSequence:
+    """종료 단계를 순서대로 실행하고 단계별 소요 시간 기록
+
+    한 단계가 실패하거나 시간을 초과해도 다음 단계는 계속 실행
+    """
+
+    def __init__(self, logger: Logger):
+        self.logger = logger
+        self.phases: List[Dict[str, Any]] = []
+
+    async def phase(self, name: str, action: Callable[[], Awaitable[Any]], timeout: float):
+        """단계 실행"""
+        start = time.perf_counter()
+        status = "ok"
+        try:
+            await asyncio.wait_for(action(), timeout=timeout)
+        except asyncio.TimeoutError:
+            status = "timeout"
+        except Exception as e:
+            status = f"error: {str(e)}"
+
+        duration_ms = round((time.perf_counter() - start) * 1000, 1)
+        self.phases.append({"phase": name, "status": status, "duration_ms": duration_ms})
+
+        if status == "ok":
+            self.logger.info(f"종료 단계 완료: {name} ({duration_ms:.0f}ms)")
+        else:
+            self.logger.warning(f"종료 단계 {name}: {status} ({duration_ms:.0f}ms)")
+
+    def report(self) -> Dict[str, Any]:
+        """단계별 종료 소요 시간"""
+        total = round(sum(p["duration_ms"] for p in self.phases), 1)
+        return {"total_ms": total, "phases": self.phases}
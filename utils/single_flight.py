@@ -0,0 +1,55 @@
+"""
+요청 병합 (single-flight) 유틸리티
+동시에 들어온 동일한 요청은 하나의 실행을 공유하고, 필요시 결과를 짧게 캐시
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+
+class SingleFlight:
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._cache: Dict[str, Tuple[float, Any]] = {}
+        self._generation = 0  # invalidate 호출마다 증가 (무효화 이전에 시작된 결과는 캐시하지 않음)
+
+    async def run(self, key: str, func: Callable[[], Awaitable[Any]], ttl: float = 0.0) -> Any:
+        """key가 같은 요청이 실행 중이면 그 결과를 기다리고, 아니면 func 실행
+
+        ttl(초)이 0보다 크면 성공한 결과를 그 시간 동안 캐시
+        """
+        cached = self._cache.get(key)
+        if cached is not None:
+            expires_at, value = cached
+            if time.monotonic() < expires_at:
+                return value
+            del self._cache[key]
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            generation = self._generation
+            task.add_done_callback(lambda t: self._on_done(key, t, ttl, generation))
+
+        # 한 호출자가 취소되어도 공유 실행은 계속되도록 보호
+        return await asyncio.shield(task)
+
+    def _on_done(self, key: str, task: asyncio.Future, ttl: float, generation: int):
+        """실행 완료 시 진행 중 목록에서 제거하고 결과 캐시"""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+        if (ttl > 0 and generation == self._generation
+                and not task.cancelled() and task.exception() is None):
+            self._cache[key] = (time.monotonic() + ttl, task.result())
+
+    def invalidate(self, prefix: str = ""):
+        """prefix로 시작하는 캐시 항목 제거 (빈 문자열이면 전체)"""
+        self._generation += 1
+        for key in [k for k in self._cache if k.startswith(prefix)]:
+            del self._cache[key]
+
+    def in_flight(self) -> int:
+        """현재 실행 중인 요청 수"""
+        return len(self._inflight)
@@ -0,0 +1,49 @@
+"""
+시작 시간 측정 유틸리티
+프로그램 실행부터 첫 요청 처리 가능 시점까지 단계별 소요 시간 기록
+"""
+import sys
+import time
+from typing import List, Tuple
+
+
+class StartupTimer:
+    def __init__(self, origin: float = None):
+        # origin: 측정 기준 시각 (time.perf_counter 값, 기본값은 생성 시각)
+        self.origin = origin if origin is not None else time.perf_counter()
+        self.marks: List[Tuple[str, float]] = []
+
+    def mark(self, phase: str):
+        """단계 완료 시각 기록"""
+        self.marks.append((phase, time.perf_counter()))
+
+    def elapsed(self) -> float:
+        """기준 시각부터 현재까지 경과 시간 (초)"""
+        return time.perf_counter() - self.origin
+
+    def report(self) -> dict:
+        """단계별 소요 시간 (ms)"""
+        phases = []
+        previous = self.origin
+        for phase, timestamp in self.marks:
+            phases.append({
+                "phase": phase,
+                "duration_ms": round((timestamp - previous) * 1000, 1),
+                "elapsed_ms": round((timestamp - self.origin) * 1000, 1),
+            })
+            previous = timestamp
+        return {"total_ms": phases[-1]["elapsed_ms"] if phases else 0.0, "phases": phases}
+
+    def format_report(self) -> str:
+        """콘솔 출력용 단계별 소요 시간"""
+        report = self.report()
+        lines = ["Startup profile:"]
+        for phase in report["phases"]:
+            lines.append(f"  {phase['phase']:<24} {phase['duration_ms']:>8.1f} ms  (+{phase['elapsed_ms']:.1f} ms)")
+        lines.append(f"  {'total':<24} {report['total_ms']:>8.1f} ms")
+        return "\n".join(lines)
+
+
+def is_profile_startup() -> bool:
+    """시작 시간 프로파일 출력 여부 (커맨드 라인 인수)"""
+    return '--profile-startup' in sys.argv
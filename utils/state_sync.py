@@ -0,0 +1,80 @@
+"""
+대시보드 상태 동기화
+서버 상태(디바이스 목록, 시뮬레이터 상태, 설정, 세션 스케줄러, 앱 감시, 최근 로그)를 버전과 함께 관리하고
+접속한 클라이언트에는 스냅샷을, 재접속한 클라이언트에는 놓친 변경분만 전송
+"""
+import secrets
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+# 상태로 기록하는 메시지 type
+TRACKED_TYPES = ("devices", "simulator_status", "config", "scheduler", "watchdog", "log")
+
+
+class StateSync:
+    def __init__(self, replay_size: int = 500, log_limit: int = 50):
+        # 서버가 재시작되면 버전이 처음부터 다시 시작되므로, 클라이언트는 epoch가 다르면 스냅샷을 받음
+        self.epoch = secrets.token_hex(8)
+        self.version = 0
+        self.state: Dict[str, Any] = {}
+        self.logs: Deque[Dict[str, str]] = deque(maxlen=log_limit)
+        self.replay: Deque[Dict[str, Any]] = deque(maxlen=replay_size)
+
+    def record(self, message: dict) -> dict:
+        """상태 메시지에 버전을 붙이고 상태/재전송 버퍼에 반영 (추적하지 않는 메시지는 그대로 반환)"""
+        message_type = message.get("type")
+        if message_type not in TRACKED_TYPES:
+            return message
+
+        self.version += 1
+        message = {**message, "version": self.version}
+
+        if message_type == "devices":
+            self.state["devices"] = message["devices"]
+        elif message_type == "simulator_status":
+            self.state["simulator_status"] = message["status"]
+        elif message_type == "config":
+            self.state["config"] = {k: v for k, v in message.items() if k not in ("type", "version")}
+        elif message_type == "scheduler":
+            self.state["scheduler"] = message["scheduler"]
+        elif message_type == "watchdog":
+            self.state["watchdog"] = message["watchdog"]
+        elif message_type == "log":
+            self.logs.append({"level": message["level"], "message": message["message"]})
+
+        self.replay.append(message)
+        return message
+
+    def snapshot(self) -> Dict[str, Any]:
+        """현재 상태 전체"""
+        return {
+            "type": "snapshot",
+            "epoch": self.epoch,
+            "version": self.version,
+            "state": {**self.state, "logs": list(self.logs)},
+        }
+
+    def missed_since(self, version: int) -> Optional[List[Dict[str, Any]]]:
+        """version 이후의 변경분 (재전송 버퍼에 남아 있지 않으면 None)"""
+        if version > self.version:
+            return None
+        if version == self.version:
+            return []
+
+        oldest = self.replay[0]["version"] if self.replay else self.version + 1
+        if version < oldest - 1:
+            return None
+        return [m for m in self.replay if m["version"] > version]
+
+    def sync(self, epoch: Optional[str] = None, version: int = 0) -> Dict[str, Any]:
+        """클라이언트가 마지막으로 받은 버전에 맞는 동기화 메시지 (변경분 또는 스냅샷)"""
+        if epoch == self.epoch:
+            missed = self.missed_since(version)
+            if missed is not None:
+                return {
+                    "type": "replay",
+                    "epoch": self.epoch,
+                    "version": self.version,
+                    "messages": missed,
+                }
+        return self.snapshot()
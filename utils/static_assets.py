@@ -0,0 +1,211 @@
+"""
+정적 파일 제공
+static/ 파일을 미리 압축(gzip/brotli)해 메모리에 두고, 내용 해시가 붙은 주소로 제공
+
+- index.html 안의 /static/... 주소를 해시가 붙은 주소(app.3f2a9c1b0d.js)로 바꿔서 제공
+- 해시 주소는 내용이 바뀌면 주소도 바뀌므로 1년 캐시(immutable), index.html과 해시 없는 주소는 매번 재검증
+- 강한 ETag(내용 해시 + 인코딩)로 조건부 요청(If-None-Match)에 304 응답
+- 첫 요청에서는 gzip까지만 만들고(수 ms), 느린 brotli(최고 압축)는 백그라운드 스레드에서 추가
+- 파일이 수정되면(개발 중) 다음 요청 때 다시 만듦
+"""
+import gzip
+import hashlib
+import mimetypes
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # 없으면 gzip만 사용
+    brotli = None
+
+# Windows에서는 mimetypes가 레지스트리 설정을 따르므로(.js -> text/plain 등) 주요 형식은 직접 지정
+MEDIA_TYPES = {
+    ".html": "text/html",
+    ".css": "text/css",
+    ".js": "text/javascript",
+    ".json": "application/json",
+    ".svg": "image/svg+xml",
+    ".png": "image/png",
+    ".ico": "image/x-icon",
+}
+COMPRESSIBLE_TYPES = ("text/", "application/json", "image/svg+xml")
+MIN_COMPRESS_SIZE = 256          # 이보다 작은 파일은 압축하지 않음
+HASH_LENGTH = 10
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "no-cache"
+CHECK_INTERVAL = 1.0             # 파일 변경 확인 최소 간격 (초)
+
+# index.html 안의 정적 파일 주소 ("/static/css/style.css" 또는 '/static/js/app.js')
+STATIC_URL_PATTERN = re.compile(r'(["\'])/static/([^"\'?#]+)\1')
+
+
+class Asset:
+    """파일 하나의 인코딩별 내용과 ETag"""
+
+    def __init__(self, path: str, content: bytes, media_type: str):
+        self.path = path
+        self.media_type = media_type
+        self.digest = hashlib.blake2b(content, digest_size=16).hexdigest()[:HASH_LENGTH]
+        self.hashed_path = self._hashed(path, self.digest)
+        self.bodies: Dict[str, bytes] = {"identity": content}
+
+        self.compressible = media_type.startswith(COMPRESSIBLE_TYPES) and len(content) >= MIN_COMPRESS_SIZE
+        if self.compressible:
+            self._add("gzip", gzip.compress(content, compresslevel=9, mtime=0))
+
+    def _add(self, encoding: str, body: bytes):
+        # 압축해도 작아지지 않으면 원본만 사용 (요청 처리 중에 읽을 수 있으므로 딕셔너리를 통째로 교체)
+        if len(body) < len(self.bodies["identity"]):
+            self.bodies = {**self.bodies, encoding: body}
+
+    def add_brotli(self):
+        if self.compressible and brotli is not None and "br" not in self.bodies:
+            self._add("br", brotli.compress(self.bodies["identity"], quality=11))
+
+    @staticmethod
+    def _hashed(path: str, digest: str) -> str:
+        stem, dot, suffix = path.rpartition(".")
+        return f"{stem}.{digest}.{suffix}" if dot else f"{path}.{digest}"
+
+    def etag(self, encoding: str) -> str:
+        return f'"{self.digest}"' if encoding == "identity" else f'"{self.digest}-{encoding}"'
+
+    def negotiate(self, accept_encoding: str) -> str:
+        """Accept-Encoding에 맞는 인코딩 선택 (br > gzip > 원본)"""
+        accepted = parse_accept_encoding(accept_encoding)
+        for encoding in ("br", "gzip"):
+            if encoding in self.bodies and encoding in accepted:
+                return encoding
+        return "identity"
+
+    def matches(self, if_none_match: str) -> bool:
+        """If-None-Match가 이 파일의 ETag(어느 인코딩이든)와 일치하는지"""
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return any(self.etag(encoding) in tags for encoding in self.bodies)
+
+
+def parse_accept_encoding(header: str) -> set:
+    """q=0으로 거부한 인코딩을 제외한 인코딩 목록"""
+    accepted = set()
+    for item in (header or "").split(","):
+        name, _, params = item.strip().partition(";")
+        q = params.strip().removeprefix("q=")
+        if name and not (params and q.replace(".", "", 1).isdigit() and float(q) == 0):
+            accepted.add(name.strip().lower())
+    return accepted
+
+
+class StaticAssets:
+    def __init__(self, directory: Path, index: str = "index.html"):
+        self.directory = directory
+        self.index = index
+        self.assets: Dict[str, Asset] = {}    # 경로(해시 주소 포함) -> 파일
+        self.index_asset: Optional[Asset] = None
+        self._mtimes: Dict[Path, int] = {}
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+    def _files(self) -> Iterable[Path]:
+        return (p for p in self.directory.rglob("*") if p.is_file() and not p.name.startswith("."))
+
+    def build(self):
+        """모든 파일을 읽어 압축하고, index.html의 정적 파일 주소를 해시 주소로 변경"""
+        assets: Dict[str, Asset] = {}
+        mtimes: Dict[Path, int] = {}
+        index_source = None
+
+        for file in self._files():
+            mtimes[file] = file.stat().st_mtime_ns
+            relative = file.relative_to(self.directory).as_posix()
+            content = file.read_bytes()
+            if relative == self.index:
+                index_source = content
+                continue
+            media_type = MEDIA_TYPES.get(file.suffix.lower()) or mimetypes.guess_type(relative)[0] or "application/octet-stream"
+            asset = Asset(relative, content, media_type)
+            assets[relative] = asset
+            assets[asset.hashed_path] = asset
+
+        index_asset = None
+        if index_source is not None:
+            def to_hashed(match: re.Match) -> str:
+                asset = assets.get(match.group(2))
+                if asset is None:
+                    return match.group(0)
+                return f"{match.group(1)}/static/{asset.hashed_path}{match.group(1)}"
+
+            html = STATIC_URL_PATTERN.sub(to_hashed, index_source.decode("utf-8"))
+            index_asset = Asset(self.index, html.encode("utf-8"), "text/html")
+
+        self.assets, self.index_asset, self._mtimes = assets, index_asset, mtimes
+        self._checked = time.monotonic()
+        if brotli is not None:
+            threading.Thread(target=self.compress_brotli, name="static-brotli", daemon=True).start()
+
+    def _unique(self) -> Dict[str, Asset]:
+        unique = {asset.path: asset for asset in self.assets.values()}
+        if self.index_asset is not None:
+            unique[self.index] = self.index_asset
+        return unique
+
+    def compress_brotli(self):
+        """brotli 압축본 추가 (build 후 백그라운드에서 실행)"""
+        for asset in self._unique().values():
+            asset.add_brotli()
+
+    def _changed(self) -> bool:
+        try:
+            current = {file: file.stat().st_mtime_ns for file in self._files()}
+        except OSError:
+            return True
+        return current != self._mtimes
+
+    def refresh(self):
+        """처음 사용하거나 파일이 바뀌었으면 다시 만듦 (CHECK_INTERVAL마다 최대 한 번 확인)"""
+        if self._mtimes and time.monotonic() - self._checked < CHECK_INTERVAL:
+            return
+        with self._lock:
+            if self._mtimes and time.monotonic() - self._checked < CHECK_INTERVAL:
+                return
+            if not self._mtimes or self._changed():
+                self.build()
+            self._checked = time.monotonic()
+
+    def lookup(self, path: str) -> Tuple[Optional[Asset], bool]:
+        """경로에 해당하는 파일과 해시 주소 여부"""
+        asset = self.assets.get(path)
+        return asset, asset is not None and path == asset.hashed_path
+
+    def respond(self, asset: Asset, immutable: bool, accept_encoding: str,
+                if_none_match: str) -> Tuple[int, bytes, Dict[str, str]]:
+        """(상태 코드, 본문, 헤더) 반환 (조건부 요청이 일치하면 304)"""
+        encoding = asset.negotiate(accept_encoding)
+        headers = {
+            "ETag": asset.etag(encoding),
+            "Cache-Control": IMMUTABLE_CACHE if immutable else REVALIDATE_CACHE,
+        }
+        if len(asset.bodies) > 1:
+            headers["Vary"] = "Accept-Encoding"
+        if asset.matches(if_none_match):
+            return 304, b"", headers
+
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        headers["Content-Type"] = asset.media_type + ("; charset=utf-8" if asset.media_type.startswith("text/") else "")
+        return 200, asset.bodies[encoding], headers
+
+    def stats(self) -> List[Dict[str, object]]:
+        """파일별 원본/압축 크기"""
+        return [{
+            "path": asset.path,
+            "url": "/" if asset is self.index_asset else f"/static/{asset.hashed_path}",
+            "sizes": {encoding: len(body) for encoding, body in asset.bodies.items()},
+        } for asset in self._unique().values()]
@@ -0,0 +1,77 @@
+"""
+썸네일 유틸리티
+screencap 원본(RGBA) 축소와 PNG 인코딩 (NumPy/zlib만 사용)
+"""
+import base64
+import hashlib
+import struct
+import zlib
+from typing import Optional, Tuple
+import numpy as np
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def parse_screencap(raw: bytes) -> Optional[np.ndarray]:
+    """adb exec-out screencap 원본 출력을 (높이, 너비, 4) 배열 뷰로 변환 (복사 없음)
+
+    헤더: 너비, 높이, 픽셀 형식 (Android 9 이상은 색 공간 포함 16바이트)
+    """
+    if len(raw) < 12:
+        return None
+    width, height, _ = struct.unpack_from("<III", raw)
+    pixels = width * height * 4
+    for header_size in (16, 12):
+        if len(raw) - header_size == pixels:
+            return np.frombuffer(raw, dtype=np.uint8, count=pixels, offset=header_size).reshape(height, width, 4)
+    return None
+
+
+def downscale(frame: np.ndarray, width: int, left_eye_only: bool = True) -> np.ndarray:
+    """간격 샘플링으로 최대 width 너비로 축소 (RGB, 결과 크기만큼만 복사)
+
+    VR 헤드셋 화면은 양쪽 눈이 나란히 있으므로 기본적으로 왼쪽 눈만 사용
+    """
+    if left_eye_only:
+        frame = frame[:, :frame.shape[1] // 2]
+    step = max(1, -(-frame.shape[1] // width))  # 결과 너비가 width를 넘지 않도록 올림
+    return np.ascontiguousarray(frame[::step, ::step, :3])
+
+
+def frame_digest(pixels: np.ndarray) -> str:
+    """변경 확인용 해시"""
+    return hashlib.blake2b(pixels.data, digest_size=16).hexdigest()
+
+
+def shrink_screencap(raw: bytes, width: int) -> Optional[Tuple[np.ndarray, str]]:
+    """screencap 원본을 썸네일로 축소 (RGB 배열, 변경 확인용 해시, 형식을 알 수 없으면 None)"""
+    frame = parse_screencap(raw)
+    if frame is None:
+        return None
+    pixels = downscale(frame, width)
+    return pixels, frame_digest(pixels)
+
+
+def _png_chunk(tag: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xffffffff)
+
+
+def encode_png(pixels: np.ndarray, level: int = 6) -> bytes:
+    """(높이, 너비, 3) RGB 배열을 PNG로 인코딩"""
+    height, width, _ = pixels.shape
+    # 각 행 앞에 필터 종류(0: 없음) 바이트 추가
+    rows = np.empty((height, width * 3 + 1), dtype=np.uint8)
+    rows[:, 0] = 0
+    rows[:, 1:] = pixels.reshape(height, width * 3)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (PNG_SIGNATURE
+            + _png_chunk(b"IHDR", header)
+            + _png_chunk(b"IDAT", zlib.compress(rows.tobytes(), level))
+            + _png_chunk(b"IEND", b""))
+
+
+def encode_thumbnail(pixels: np.ndarray) -> Tuple[str, int, int]:
+    """인코딩 스레드 풀 작업: PNG 인코딩 후 data URL 반환 (data URL, 너비, 높이)"""
+    png = encode_png(pixels)
+    return "data:image/png;base64," + base64.b64encode(png).decode('ascii'), pixels.shape[1], pixels.shape[0]
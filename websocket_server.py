@@ -1,52 +1,34 @@
 """
-WebSocket 서버
-실시간 양방향 통신을 위한 서버
+WebSocket 서버 (레거시 포트)
+WEBSOCKET_PORT로 접속하는 클라이언트를 메인 서버의 발행/구독 허브에 연결
+메인 서버(main.py)의 이벤트 루프 안에서 실행되며, 메시지 프로토콜은 /ws와 동일
 """
-import asyncio
 import websockets
-import json
-from typing import Set
-from config import WEBSOCKET_PORT
+from typing import Awaitable, Callable, Optional
+from utils.pubsub import PubSubHub, Subscription
 
-# 연결된 클라이언트 관리
-connected_clients: Set[websockets.WebSocketServerProtocol] = set()
+# 클라이언트 메시지 처리 함수 (구독 정보, 수신 텍스트)
+MessageHandler = Callable[[Subscription, str], Awaitable[None]]
 
 
-async def handle_client(websocket, path):
+async def handle_client(websocket, hub: PubSubHub, on_message: Optional[MessageHandler] = None):
     """클라이언트 연결 처리"""
-    connected_clients.add(websocket)
-    print(f"✅ 클라이언트 연결됨 (총 {len(connected_clients)}개)")
-    
+    subscription = hub.add(websocket.send, websocket.close)
+
     try:
         async for message in websocket:
-            # 클라이언트로부터 메시지 수신 시 처리
-            data = json.loads(message)
-            print(f"📩 수신: {data}")
-            
+            if on_message is not None:
+                await on_message(subscription, message)
+
     except websockets.exceptions.ConnectionClosed:
         pass
     finally:
-        connected_clients.remove(websocket)
-        print(f"❌ 클라이언트 연결 해제 (총 {len(connected_clients)}개)")
-
-
-async def broadcast(message: dict):
-    """모든 연결된 클라이언트에 메시지 브로드캐스트"""
-    if connected_clients:
-        message_str = json.dumps(message)
-        await asyncio.gather(
-            *[client.send(message_str) for client in connected_clients],
-            return_exceptions=True
-        )
-
+        hub.remove(subscription)
 
-async def main():
-    """WebSocket 서버 시작"""
-    print(f"🚀 WebSocket 서버 시작: ws://localhost:{WEBSOCKET_PORT}")
-    
-    async with websockets.serve(handle_client, "0.0.0.0", WEBSOCKET_PORT):
-        await asyncio.Future()  # 무한 대기
 
+async def serve(hub: PubSubHub, host: str, port: int, on_message: Optional[MessageHandler] = None):
+    """WebSocket 서버 시작 (반환된 서버는 close() 후 wait_closed()로 종료)"""
+    async def handler(websocket, path=None):
+        await handle_client(websocket, hub, on_message)
 
-if __name__ == "__main__":
-    asyncio.run(main())
+    return await websockets.serve(handler, host, port)